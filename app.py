@@ -1,7 +1,9 @@
 import streamlit as st
 import requests
+import json
 from datetime import datetime
 import re
+import os
 
 # =============================
 # PAGE CONFIG
@@ -17,7 +19,12 @@ st.set_page_config(
 # CONFIG
 # =============================
 API_BASE_URL = "http://localhost:8000"
-ASK_ENDPOINT = f"{API_BASE_URL}/ask"
+SESSIONS_ENDPOINT = f"{API_BASE_URL}/sessions"
+# Every browser session calls the API from this server's IP; sending a key
+# listed in the API's RATE_LIMIT_API_KEYS gives the app its own rate-limit
+# budget instead of sharing the IP's
+CLIENT_KEY_HEADER = os.getenv("RATE_LIMIT_KEY_HEADER", "X-API-Key")
+CLIENT_API_KEY = os.getenv("STREAMLIT_API_KEY", "")
 
 # =============================
 # BEAUTIFUL CHAT UI CSS
@@ -391,15 +398,75 @@ def extract_video_id(url):
 def get_thumbnail_url(video_id):
     return f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"
 
-def call_api(video_id, question):
+def api_headers():
+    return {CLIENT_KEY_HEADER: CLIENT_API_KEY} if CLIENT_API_KEY else {}
+
+class SessionExpired(Exception):
+    """The server no longer knows the session (idle timeout or restart)."""
+
+def create_session(video_id):
+    """Start a server-side session; the video's index is loaded once, here."""
     try:
-        payload = {"video_url": video_id, "question": question}
-        response = requests.post(ASK_ENDPOINT, json=payload, timeout=120)
+        response = requests.post(SESSIONS_ENDPOINT, json={"video_url": video_id}, headers=api_headers(), timeout=120)
         response.raise_for_status()
-        return response.json()
+        return response.json()["session_id"]
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"API Error: {str(e)}")
+
+def end_session(session_id):
+    """Release the server-side session; it expires on its own if this fails."""
+    if not session_id:
+        return
+    try:
+        requests.delete(f"{SESSIONS_ENDPOINT}/{session_id}", headers=api_headers(), timeout=10)
+    except requests.exceptions.RequestException:
+        pass
+
+def stream_api(session_id, question):
+    """Yield answer tokens from the session's Server-Sent Events endpoint."""
+    url = f"{SESSIONS_ENDPOINT}/{session_id}/ask/stream"
+    try:
+        with requests.post(url, json={"question": question}, headers=api_headers(), stream=True, timeout=(10, 120)) as response:
+            if response.status_code == 404:
+                raise SessionExpired(session_id)
+            response.raise_for_status()
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data = json.loads(line[len("data:"):].strip())
+                    if event == "token":
+                        yield data["text"]
+                    elif event == "error":
+                        raise Exception(f"API Error: {data.get('detail')}")
+                    elif event == "done":
+                        return
     except requests.exceptions.RequestException as e:
         raise Exception(f"API Error: {str(e)}")
 
+def reset_session():
+    end_session(st.session_state.session_id)
+    st.session_state.session_id = None
+    st.session_state.session_video_id = None
+
+def ask_stream(video_id, question):
+    """Stream an answer within the video's session, starting one if needed."""
+    if st.session_state.session_video_id != video_id:
+        reset_session()
+    for attempt in range(2):
+        if st.session_state.session_id is None:
+            st.session_state.session_id = create_session(video_id)
+            st.session_state.session_video_id = video_id
+        try:
+            yield from stream_api(st.session_state.session_id, question)
+            return
+        except SessionExpired:
+            # The conversation history is gone with it; carry on in a new session
+            st.session_state.session_id = None
+            if attempt:
+                raise Exception("API Error: session expired")
+
 # =============================
 # SESSION STATE
 # =============================
@@ -407,6 +474,9 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 if "current_video_id" not in st.session_state:
     st.session_state.current_video_id = None
+if "session_id" not in st.session_state:
+    st.session_state.session_id = None
+    st.session_state.session_video_id = None
 
 # =============================
 # SIDEBAR
@@ -474,12 +544,14 @@ with st.sidebar:
     with col1:
         if st.button("🗑️ Clear", use_container_width=True):
             st.session_state.messages = []
+            reset_session()
             st.rerun()
     
     with col2:
         if st.button("🔄 Reset", use_container_width=True):
             st.session_state.messages = []
             st.session_state.current_video_id = None
+            reset_session()
             st.rerun()
 
 # =============================
@@ -521,22 +593,20 @@ if user_input:
         with st.chat_message("user", avatar="👤"):
             st.markdown(user_input)
         
-        # Call API and get response
+        # Call API and stream the response as it is generated
         with st.chat_message("assistant", avatar="🤖"):
-            with st.spinner("Thinking..."):
-                try:
-                    result = call_api(st.session_state.current_video_id, user_input)
-                    answer = result.get("answer", "Sorry, I couldn't generate an answer.")
-                    
-                    # Display assistant message
+            try:
+                answer = st.write_stream(ask_stream(st.session_state.current_video_id, user_input))
+                if not answer:
+                    answer = "Sorry, I couldn't generate an answer."
                     st.markdown(answer)
-                    print(f"Answer : {answer}")
-                    # Add to session state
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": answer
-                    })
-                    
-                except Exception as e:
-                    error_msg = f"❌ {str(e)}"
-                    st.error(error_msg)
\ No newline at end of file
+                print(f"Answer : {answer}")
+                # Add to session state
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": answer
+                })
+                
+            except Exception as e:
+                error_msg = f"❌ {str(e)}"
+                st.error(error_msg)
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+Dependency providers for the API's long-lived services.
+
+Services are built on first use instead of at import time, so importing
+the app is cheap and does not need credentials or the embedding model.
+The lifespan hook calls ``warm_up`` to build them ahead of the first
+request; routes receive them through ``Depends``, which also lets tests
+substitute fakes via ``app.dependency_overrides``.
+"""
+import functools
+import hmac
+import threading
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+from app.core.config import settings
+from app.core.executors import io_executor, run_cpu_bound, run_io_bound
+from app.core.logging_config import logger
+from app.services.admission import AdmissionController
+from app.services.answer_cache import SemanticAnswerCache
+from app.services.ingest_service import IngestService
+from app.services.llm_service import LLMService
+from app.services.rag_pipeline import RAGPipeline
+from app.services.session_service import SessionService
+from app.services.transcript_service import TranscriptService
+from app.services.vectorstore_service import VectorStoreService
+
+_instances: Dict[str, object] = {}
+_lock = threading.RLock()
+
+
+def _singleton(factory):
+    """Build the provider's service once, on first call, and reuse it."""
+    name = factory.__name__
+
+    @functools.wraps(factory)
+    def provider():
+        if name not in _instances:
+            with _lock:
+                if name not in _instances:
+                    _instances[name] = factory()
+        return _instances[name]
+
+    provider.peek = lambda: _instances.get(name)
+    # Install a pre-built instance, e.g. a local stand-in for load tests;
+    # unlike dependency_overrides this also applies to warm_up and shutdown
+    provider.set = lambda instance: _instances.__setitem__(name, instance)
+    return provider
+
+
+@_singleton
+def get_transcript_service() -> TranscriptService:
+    return TranscriptService()
+
+
+@_singleton
+def get_vectorstore_service() -> VectorStoreService:
+    return VectorStoreService()
+
+
+@_singleton
+def get_llm_service() -> LLMService:
+    try:
+        settings.validate()
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return LLMService()
+
+
+@_singleton
+def get_rag_pipeline() -> RAGPipeline:
+    return RAGPipeline(get_transcript_service(), get_vectorstore_service())
+
+
+@_singleton
+def get_ingest_service() -> IngestService:
+    return IngestService(get_rag_pipeline())
+
+
+@_singleton
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    return SemanticAnswerCache() if settings.ANSWER_CACHE_ENABLED else None
+
+
+@_singleton
+def get_session_service() -> SessionService:
+    return SessionService(get_rag_pipeline())
+
+
+@_singleton
+def get_admission_controller() -> AdmissionController:
+    return AdmissionController()
+
+
+def require_admin(request: Request) -> None:
+    """
+    Reject requests without one of the ADMIN_API_KEYS in ADMIN_KEY_HEADER.
+
+    With no admin keys configured, admin endpoints are disabled.
+    """
+    api_key = request.headers.get(settings.ADMIN_KEY_HEADER, "")
+    if not any(hmac.compare_digest(api_key, key) for key in settings.ADMIN_API_KEYS):
+        raise HTTPException(status_code=403, detail="Admin key required")
+
+
+class Readiness:
+    """Tracks which components finished warming up, and why others failed."""
+
+    COMPONENTS = ("transcripts", "embeddings", "llm", "pipeline")
+
+    def __init__(self):
+        self.status: Dict[str, str] = {name: "pending" for name in self.COMPONENTS}
+
+    @property
+    def ready(self) -> bool:
+        return all(state == "ready" for state in self.status.values())
+
+
+readiness = Readiness()
+
+
+async def warm_up() -> None:
+    """
+    Build every service and run one dummy embedding.
+
+    The first embedding call initializes the ONNX Runtime session, so doing
+    it here keeps that cost off the first real request. Each component is
+    warmed independently; a failure is recorded in ``readiness`` instead of
+    stopping the app, so /health stays up while /ready reports the problem.
+    """
+    async def _embed():
+        service = await run_cpu_bound(get_vectorstore_service)
+        await run_cpu_bound(service.embedding_model.embed_query, "warm up")
+
+    async def _transcripts():
+        service = await run_io_bound(get_transcript_service)
+        # The Selenium fallback is optional; its browsers warm in the background
+        io_executor.submit(service.browser_pool.start)
+
+    async def _pipeline():
+        await run_cpu_bound(get_rag_pipeline)
+        get_ingest_service()
+        get_answer_cache()
+
+    steps = (
+        ("transcripts", _transcripts),
+        ("embeddings", _embed),
+        ("llm", lambda: run_io_bound(get_llm_service)),
+        ("pipeline", _pipeline),
+    )
+    for name, step in steps:
+        try:
+            await step()
+            readiness.status[name] = "ready"
+            logger.info("Warm-up: %s ready", name)
+        except Exception as e:
+            readiness.status[name] = f"failed: {e}"
+            logger.error("Warm-up: %s failed: %s", name, e)
+
+
+async def shutdown_services() -> None:
+    """Release resources held by services that were actually built."""
+    llm_service = get_llm_service.peek()
+    if llm_service is not None:
+        await llm_service.aclose()
+    ingest_service = get_ingest_service.peek()
+    if ingest_service is not None:
+        ingest_service.shutdown()
+    transcript_service = get_transcript_service.peek()
+    if transcript_service is not None:
+        transcript_service.browser_pool.close()
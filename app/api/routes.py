@@ -1,20 +1,117 @@
 """
 API routes for the YouTube RAG chatbot.
 """
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import QueryRequest, QueryResponse, HealthResponse
+import asyncio
+import math
+from contextlib import contextmanager
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from app.models.schemas import (
+    QueryRequest, QueryResponse, HealthResponse, ReadinessResponse, CacheStatsResponse,
+    BatchQueryRequest, BatchQueryResponse, BatchAnswer,
+    IngestRequest, IngestResponse, JobStatusResponse, VideoIngestStatus,
+    SearchRequest, SearchResponse, SearchHit, VideoDeleteResponse,
+    SessionCreateRequest, SessionQueryRequest, SessionResponse, SessionTurn,
+)
 from app.services.transcript_service import TranscriptService
 from app.services.vectorstore_service import VectorStoreService
 from app.services.llm_service import LLMService
+from app.services.rag_pipeline import RAGPipeline
+from app.services.ingest_service import IngestService, COMPLETED, FAILED
+from app.services.admission import DELETE, INGEST, AdmissionController
+from app.services.answer_cache import SemanticAnswerCache
+from app.services.session_service import ChatSession, SessionService
+from app.api.deps import (
+    get_transcript_service, get_vectorstore_service, get_llm_service,
+    get_rag_pipeline, get_ingest_service, get_answer_cache, get_admission_controller, get_session_service,
+    readiness, require_admin,
+)
+from app.core.executors import run_cpu_bound, run_io_bound
+from app.core.config import settings
 from app.core.logging_config import logger
+from app.core.metrics import ANSWER_CACHE_LOOKUPS, record_error, render_metrics
+from app.utils.helpers import build_citations, extract_video_id_from_url, format_sse
+from app.utils.limiter import OverloadedError
+from app.utils.rate_limit import RateLimitedError
 
 # Create router
 router = APIRouter()
 
-# Initialize services (singleton pattern)
-transcript_service = TranscriptService()
-vectorstore_service = VectorStoreService()
-llm_service = LLMService()
+
+def _lookup_answer(answer_cache, video_id, version, question_vector):
+    """Look up a semantically cached answer, if caching applies."""
+    if answer_cache is None or not video_id or version is None:
+        return None
+    answer = answer_cache.lookup(video_id, version, question_vector)
+    ANSWER_CACHE_LOOKUPS.labels("miss" if answer is None else "hit").inc()
+    return answer
+
+
+def _retry_later(status_code: int, detail: str, retry_after: float) -> HTTPException:
+    """429/503 telling the client when to retry."""
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+@contextmanager
+def _request_errors(endpoint: str):
+    """
+    Turn failures inside the block into HTTP errors, counting each by status.
+
+    HTTPExceptions pass through; rate limiting becomes 429 and a full work
+    queue 503, both with Retry-After; anything else becomes 500.
+    """
+    try:
+        yield
+    except HTTPException as http_err:
+        logger.warning("HTTPException raised during %s request: %s", endpoint, http_err.detail)
+        record_error(endpoint, http_err.status_code)
+        raise
+    except RateLimitedError as e:
+        logger.warning("Rate limited %s request: %s", endpoint, e)
+        record_error(endpoint, 429)
+        raise _retry_later(429, f"Too many requests: {e}", e.retry_after)
+    except OverloadedError as e:
+        logger.warning("Rejected %s request: %s", endpoint, e)
+        record_error(endpoint, 503)
+        raise _retry_later(503, f"Service overloaded, please retry: {e}", e.retry_after)
+    except Exception as e:
+        logger.error("Unexpected error in %s endpoint: %s", endpoint, e, exc_info=True)
+        record_error(endpoint, 500)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+def _is_indexed(vectorstore_service: VectorStoreService, video_id: Optional[str]) -> bool:
+    """Whether a video can be answered without a transcript fetch and embedding pass."""
+    return bool(video_id) and vectorstore_service.index_version(video_id) is not None
+
+
+def _get_session(session_service: SessionService, session_id: str) -> ChatSession:
+    session = session_service.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found or expired")
+    return session
+
+
+def _session_response(session_service: SessionService, session: ChatSession) -> SessionResponse:
+    return SessionResponse(
+        session_id=session.session_id,
+        video_url=session.video_url,
+        idle_timeout=session_service.idle_timeout,
+        turns=[SessionTurn(question=turn.question, answer=turn.answer) for turn in session.turns],
+    )
+
+
+def _store_answer(answer_cache, video_id, version, question_vector, answer):
+    if answer_cache is not None and video_id and version is not None and answer:
+        answer_cache.store(video_id, version, question_vector, answer)
 
 
 @router.get("/", response_model=HealthResponse, tags=["Health"])
@@ -37,53 +134,503 @@ async def health_check():
     )
 
 
+@router.get("/ready", response_model=ReadinessResponse, tags=["Health"])
+async def readiness_check(response: Response):
+    """
+    Readiness check: 200 once every service is built and warmed up,
+    503 while warm-up is running or if a component failed.
+    """
+    if not readiness.ready:
+        response.status_code = 503
+    return ReadinessResponse(ready=readiness.ready, components=dict(readiness.status))
+
+
+@router.get("/metrics", tags=["Health"])
+async def metrics():
+    """Prometheus metrics: per-stage latency histograms, counters and in-flight gauges."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
+@router.get("/cache/stats", response_model=CacheStatsResponse, tags=["Health"])
+async def cache_stats(
+    transcript_service: TranscriptService = Depends(get_transcript_service),
+    vectorstore_service: VectorStoreService = Depends(get_vectorstore_service),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+):
+    """In-process cache statistics, for sizing the memory budgets."""
+    return CacheStatsResponse(
+        vectorstores=vectorstore_service.resident.stats(),
+        transcripts=transcript_service.cache.memory.stats() if transcript_service.cache else {},
+        answers=answer_cache.stats() if answer_cache else {},
+        corpus=vectorstore_service.corpus.stats() if vectorstore_service.corpus else {},
+    )
+
+
 @router.post("/ask", response_model=QueryResponse, tags=["Chat"])
-async def ask_question(payload: QueryRequest):
+async def ask_question(
+    payload: QueryRequest,
+    request: Request,
+    rag_pipeline: RAGPipeline = Depends(get_rag_pipeline),
+    vectorstore_service: VectorStoreService = Depends(get_vectorstore_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
     """
     Ask a question about a YouTube video.
     
     This endpoint:
     1. Extracts video ID from URL (or accepts direct video ID)
-    2. Fetches the transcript from YouTube
-    3. Creates a vector store from the transcript
-    4. Retrieves relevant context for the question
-    5. Generates an answer using LLM
+    2. Loads the cached vector store for the video, or fetches the
+       transcript from YouTube and builds (and caches) a new one;
+       concurrent requests for the same video share this work
+    3. Returns a cached answer to a near-identical earlier question, or
+       retrieves candidate chunks for the question
+    4. Merges overlapping chunks into a context that fits the token
+       budget and generates an answer using LLM
     """
-    try:
+    with _request_errors("/ask"):
         video_url = payload.video_url
-        logger.info(f"Received /ask request for video_url={video_url}, question='{payload.question}'")
+        logger.info("Received /ask request for video_url=%s (question_chars=%d)", video_url, len(payload.question))
 
-        # Step 1: Fetch transcript
-        transcript = transcript_service.fetch_transcript(video_url)
-        logger.info(f"Step 1 completed: Transcript fetched (length={len(transcript)} characters)")
+        video_id = extract_video_id_from_url(video_url)
+        async with admission.admit(request, indexed=_is_indexed(vectorstore_service, video_id)):
+            # Step 1 & 2: Resolve the video's vector store
+            vectorstore = await rag_pipeline.get_vectorstore(video_url)
 
-        # Step 2: Create vector store
-        vectorstore = vectorstore_service.create_vectorstore(transcript)
-        logger.info("Step 2 completed: Vector store created")
+            # Step 3: Check the answer cache, then retrieve relevant documents
+            version = vectorstore_service.index_version(video_id)
+            question_vector = await run_cpu_bound(vectorstore_service.embedding_model.embed_query, payload.question)
+            cached_answer = _lookup_answer(answer_cache, video_id, version, question_vector)
+            if cached_answer is not None:
+                logger.info("Steps 3-4 skipped: Answer served from semantic answer cache")
+                return QueryResponse(answer=cached_answer, video_url=video_url)
 
-        # Step 3: Retrieve relevant documents
-        retrieved_docs = vectorstore_service.retrieve_documents(
-            vectorstore,
-            payload.question
-        )
-        logger.info(f"Step 3 completed: Retrieved {len(retrieved_docs)} relevant documents")
+            retrieved_docs = await run_cpu_bound(
+                vectorstore_service.retrieve_documents,
+                vectorstore,
+                payload.question,
+                query_vector=question_vector
+            )
+        logger.info("Step 3 completed: Retrieved %s relevant documents", len(retrieved_docs))
 
-        # Step 4: Format context and generate answer
-        context = llm_service.format_documents(retrieved_docs)
-        answer = llm_service.generate_answer(context, payload.question)
+        # Step 4: Build context within the token budget and generate answer
+        context_docs = llm_service.build_context(retrieved_docs)
+        context = llm_service.format_documents(context_docs)
+        answer = await llm_service.agenerate_answer(context, payload.question)
         logger.info("Step 4 completed: Answer generated by LLM")
+        _store_answer(answer_cache, video_id, version, question_vector, answer)
 
         return QueryResponse(
             answer=answer,
-            video_url=video_url
+            video_url=video_url,
+            citations=build_citations(context_docs, video_id)
         )
-        
-    except HTTPException as http_err:
-        logger.warning(f"HTTPException raised during /ask request: {http_err.detail}")
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in /ask endpoint: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=500,
-            detail=f"Internal server error: {str(e)}"
+
+
+@router.post("/ask/stream", tags=["Chat"])
+async def ask_question_stream(
+    payload: QueryRequest,
+    request: Request,
+    rag_pipeline: RAGPipeline = Depends(get_rag_pipeline),
+    vectorstore_service: VectorStoreService = Depends(get_vectorstore_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """
+    Ask a question about a YouTube video and stream the answer.
+    
+    Resolves the vector store and retrieves context like `/ask`, then
+    responds with Server-Sent Events:
+    - `retrieval`: sent once retrieval finishes, with the context document count
+    - `token`: one per streamed piece of the answer
+    - `done`: the answer is complete
+    - `error`: generation failed after streaming started
+    """
+    with _request_errors("/ask/stream"):
+        video_url = payload.video_url
+        logger.info("Received /ask/stream request for video_url=%s (question_chars=%d)", video_url, len(payload.question))
+
+        video_id = extract_video_id_from_url(video_url)
+        async with admission.admit(request, indexed=_is_indexed(vectorstore_service, video_id)):
+            vectorstore = await rag_pipeline.get_vectorstore(video_url)
+            version = vectorstore_service.index_version(video_id)
+            question_vector = await run_cpu_bound(vectorstore_service.embedding_model.embed_query, payload.question)
+            cached_answer = _lookup_answer(answer_cache, video_id, version, question_vector)
+            context_docs, context = [], ""
+            if cached_answer is None:
+                retrieved_docs = await run_cpu_bound(
+                    vectorstore_service.retrieve_documents,
+                    vectorstore,
+                    payload.question,
+                    query_vector=question_vector
+                )
+                context_docs = llm_service.build_context(retrieved_docs)
+                context = llm_service.format_documents(context_docs)
+
+    async def event_stream():
+        yield format_sse("retrieval", {
+            "video_url": video_url,
+            "documents": len(context_docs),
+            "cached": cached_answer is not None,
+            "citations": build_citations(context_docs, video_id),
+        })
+        if cached_answer is not None:
+            yield format_sse("token", {"text": cached_answer})
+            yield format_sse("done", {"video_url": video_url})
+            return
+
+        tokens = []
+        try:
+            async for token in llm_service.astream_answer(context, payload.question):
+                tokens.append(token)
+                yield format_sse("token", {"text": token})
+        except OverloadedError as e:
+            logger.warning("Rejected /ask/stream generation: %s", e)
+            record_error("/ask/stream", 503)
+            yield format_sse("error", {"detail": f"Service overloaded, please retry: {e}", "retry_after": e.retry_after})
+            return
+        except Exception as e:
+            logger.error("Error while streaming answer: %s", e, exc_info=True)
+            record_error("/ask/stream", 500)
+            yield format_sse("error", {"detail": f"Internal server error: {str(e)}"})
+            return
+        _store_answer(answer_cache, video_id, version, question_vector, "".join(tokens))
+        yield format_sse("done", {"video_url": video_url})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/ask/batch", response_model=BatchQueryResponse, tags=["Chat"])
+async def ask_questions_batch(
+    payload: BatchQueryRequest,
+    request: Request,
+    rag_pipeline: RAGPipeline = Depends(get_rag_pipeline),
+    vectorstore_service: VectorStoreService = Depends(get_vectorstore_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """
+    Ask many questions about one YouTube video.
+    
+    The vector store is resolved once, all questions are embedded in one
+    batch and searched with a single FAISS call, and answers are generated
+    concurrently (up to BATCH_LLM_CONCURRENCY at a time). Answers and
+    per-question errors are returned in request order.
+    """
+    with _request_errors("/ask/batch"):
+        video_url = payload.video_url
+        logger.info("Received /ask/batch request for video_url=%s with %s questions", video_url, len(payload.questions))
+
+        video_id = extract_video_id_from_url(video_url)
+        indexed = _is_indexed(vectorstore_service, video_id)
+        async with admission.admit(request, indexed=indexed, questions=len(payload.questions)):
+            vectorstore = await rag_pipeline.get_vectorstore(video_url)
+            version = vectorstore_service.index_version(video_id)
+            question_vectors = await run_cpu_bound(vectorstore_service.embedding_model.embed_queries, payload.questions)
+            retrieved = await run_cpu_bound(
+                vectorstore_service.retrieve_documents_batch,
+                vectorstore,
+                payload.questions,
+                query_vectors=question_vectors
+            )
+
+    semaphore = asyncio.Semaphore(settings.BATCH_LLM_CONCURRENCY)
+
+    async def answer_one(question, question_vector, docs):
+        cached_answer = _lookup_answer(answer_cache, video_id, version, question_vector)
+        if cached_answer is not None:
+            return BatchAnswer(question=question, answer=cached_answer)
+        async with semaphore:
+            try:
+                context = llm_service.format_documents(llm_service.build_context(docs))
+                answer = await llm_service.agenerate_answer(context, question)
+                _store_answer(answer_cache, video_id, version, question_vector, answer)
+                return BatchAnswer(question=question, answer=answer)
+            except OverloadedError as e:
+                logger.warning("Batch question rejected: %s", e)
+                record_error("/ask/batch", 503)
+                return BatchAnswer(question=question, error=f"Service overloaded, please retry: {e}")
+            except Exception as e:
+                logger.error("Batch question failed: %s", e)
+                record_error("/ask/batch", 500)
+                return BatchAnswer(question=question, error=str(e))
+
+    answers = await asyncio.gather(*(
+        answer_one(question, question_vector, docs)
+        for question, question_vector, docs in zip(payload.questions, question_vectors, retrieved)
+    ))
+    return BatchQueryResponse(video_url=video_url, answers=answers)
+
+
+@router.post("/sessions", response_model=SessionResponse, status_code=201, tags=["Sessions"])
+async def create_session(
+    payload: SessionCreateRequest,
+    request: Request,
+    vectorstore_service: VectorStoreService = Depends(get_vectorstore_service),
+    session_service: SessionService = Depends(get_session_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """
+    Start a conversation about a YouTube video.
+    
+    Loads or builds the video's vector store once and pins it to the
+    session. Ask at `/sessions/{session_id}/ask` (or `/ask/stream`);
+    follow-up questions skip transcript and index resolution and are
+    answered with the session's recent turns as history.
+    """
+    with _request_errors("/sessions"):
+        video_url = payload.video_url
+        logger.info("Received /sessions request for video_url=%s", video_url)
+        video_id = extract_video_id_from_url(video_url)
+        async with admission.admit(request, indexed=_is_indexed(vectorstore_service, video_id)):
+            session = await session_service.create(video_url)
+    return _session_response(session_service, session)
+
+
+@router.get("/sessions/{session_id}", response_model=SessionResponse, tags=["Sessions"])
+async def get_session(session_id: str, session_service: SessionService = Depends(get_session_service)):
+    """Return a session and its recent turns."""
+    return _session_response(session_service, _get_session(session_service, session_id))
+
+
+@router.delete("/sessions/{session_id}", status_code=204, tags=["Sessions"])
+async def delete_session(session_id: str, session_service: SessionService = Depends(get_session_service)):
+    """End a session and release its pinned state."""
+    if not session_service.close(session_id):
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found or expired")
+    return Response(status_code=204)
+
+
+@router.post("/sessions/{session_id}/ask", response_model=QueryResponse, tags=["Sessions"])
+async def ask_in_session(
+    session_id: str,
+    payload: SessionQueryRequest,
+    request: Request,
+    session_service: SessionService = Depends(get_session_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """
+    Ask a question within a session.
+    
+    Uses the session's pinned vector store, so only the question is
+    embedded and searched (or served from the session's chunk cache).
+    The answer is generated with the session's recent turns as history.
+    Returns 404 once the session has expired; start a new one.
+    """
+    session = _get_session(session_service, session_id)
+    with _request_errors("/sessions/ask"):
+        logger.info("Received session ask for session_id=%s (question_chars=%d)", session_id, len(payload.question))
+        history = session_service.history(session)
+        async with admission.admit(request, indexed=True):
+            question_vector, retrieved_docs = await session_service.retrieve(session, payload.question)
+
+        # Earlier turns change the answer, so only opening questions use the answer cache
+        version = session_service.answer_version(session) if not history else None
+        if not history:
+            cached_answer = _lookup_answer(answer_cache, session.video_id, version, question_vector)
+            if cached_answer is not None:
+                session_service.record_turn(session, payload.question, cached_answer)
+                return QueryResponse(answer=cached_answer, video_url=session.video_url)
+
+        context_docs = llm_service.build_context(retrieved_docs)
+        context = llm_service.format_documents(context_docs)
+        answer = await llm_service.agenerate_answer(
+            context, payload.question, history=llm_service.format_history(history)
+        )
+        if not history:
+            _store_answer(answer_cache, session.video_id, version, question_vector, answer)
+        session_service.record_turn(session, payload.question, answer)
+
+        return QueryResponse(
+            answer=answer,
+            video_url=session.video_url,
+            citations=build_citations(context_docs, session.video_id)
         )
+
+
+@router.post("/sessions/{session_id}/ask/stream", tags=["Sessions"])
+async def ask_in_session_stream(
+    session_id: str,
+    payload: SessionQueryRequest,
+    request: Request,
+    session_service: SessionService = Depends(get_session_service),
+    llm_service: LLMService = Depends(get_llm_service),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """
+    Ask a question within a session and stream the answer.
+    
+    Retrieves like `/sessions/{session_id}/ask` and responds with the same
+    Server-Sent Events as `/ask/stream`. The turn joins the session's
+    history once the answer is complete.
+    """
+    session = _get_session(session_service, session_id)
+    with _request_errors("/sessions/ask/stream"):
+        logger.info("Received session ask/stream for session_id=%s (question_chars=%d)", session_id, len(payload.question))
+        history = session_service.history(session)
+        async with admission.admit(request, indexed=True):
+            question_vector, retrieved_docs = await session_service.retrieve(session, payload.question)
+        cached_answer = None
+        version = session_service.answer_version(session) if not history else None
+        if not history:
+            cached_answer = _lookup_answer(answer_cache, session.video_id, version, question_vector)
+        context_docs, context = [], ""
+        if cached_answer is None:
+            context_docs = llm_service.build_context(retrieved_docs)
+            context = llm_service.format_documents(context_docs)
+
+    async def event_stream():
+        yield format_sse("retrieval", {
+            "video_url": session.video_url,
+            "documents": len(context_docs),
+            "cached": cached_answer is not None,
+            "citations": build_citations(context_docs, session.video_id),
+        })
+        if cached_answer is not None:
+            session_service.record_turn(session, payload.question, cached_answer)
+            yield format_sse("token", {"text": cached_answer})
+            yield format_sse("done", {"video_url": session.video_url})
+            return
+
+        tokens = []
+        try:
+            async for token in llm_service.astream_answer(
+                context, payload.question, history=llm_service.format_history(history)
+            ):
+                tokens.append(token)
+                yield format_sse("token", {"text": token})
+        except OverloadedError as e:
+            logger.warning("Rejected session ask/stream generation: %s", e)
+            record_error("/sessions/ask/stream", 503)
+            yield format_sse("error", {"detail": f"Service overloaded, please retry: {e}", "retry_after": e.retry_after})
+            return
+        except Exception as e:
+            logger.error("Error while streaming session answer: %s", e, exc_info=True)
+            record_error("/sessions/ask/stream", 500)
+            yield format_sse("error", {"detail": f"Internal server error: {str(e)}"})
+            return
+        answer = "".join(tokens)
+        if not history:
+            _store_answer(answer_cache, session.video_id, version, question_vector, answer)
+        session_service.record_turn(session, payload.question, answer)
+        yield format_sse("done", {"video_url": session.video_url})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/ingest", response_model=IngestResponse, status_code=202, tags=["Ingest"])
+async def ingest_videos(
+    payload: IngestRequest,
+    request: Request,
+    ingest_service: IngestService = Depends(get_ingest_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """
+    Ingest a batch of videos in the background.
+    
+    Transcript fetch, chunking, embedding and index persistence run on a
+    bounded background worker pool, so later questions about these videos
+    skip straight to retrieval. Poll `/jobs/{job_id}` for progress.
+    Each video is charged to the client as a cold video; while too many
+    jobs or videos are pending, new jobs get a 503.
+    """
+    with _request_errors("/ingest"):
+        videos = len(set(payload.video_urls))
+        admission.charge(request, INGEST, settings.RATE_LIMIT_COLD_COST * videos)
+        job = ingest_service.submit(payload.video_urls)
+    return IngestResponse(job_id=job.job_id, status=job.status, total=len(job.videos))
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse, tags=["Ingest"])
+async def get_job(job_id: str, ingest_service: IngestService = Depends(get_ingest_service)):
+    """Report per-video progress and failures of an ingestion job."""
+    job = ingest_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status,
+        total=len(job.videos),
+        completed=job.count(COMPLETED),
+        failed=job.count(FAILED),
+        videos=[
+            VideoIngestStatus(video_url=video.video_url, status=video.status, error=video.error)
+            for video in job.videos
+        ],
+    )
+
+
+@router.post("/search", response_model=SearchResponse, tags=["Search"])
+async def search_videos(
+    payload: SearchRequest,
+    request: Request,
+    vectorstore_service: VectorStoreService = Depends(get_vectorstore_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """
+    Search transcript chunks across ingested videos.
+    
+    Uses the shared corpus index, optionally restricted to some videos.
+    Videos are not fetched on demand; ingest them first.
+    """
+    if vectorstore_service.corpus is None:
+        raise HTTPException(status_code=501, detail="Corpus index is disabled")
+    video_ids = None
+    if payload.video_urls is not None:
+        video_ids = [extract_video_id_from_url(url) for url in payload.video_urls]
+    with _request_errors("/search"):
+        async with admission.admit(request, indexed=True):
+            docs = await run_cpu_bound(vectorstore_service.search_corpus, payload.query, payload.k, video_ids)
+    hits = []
+    for doc in docs:
+        video_id = doc.metadata["video_id"]
+        citations = build_citations([doc], video_id)
+        hits.append(SearchHit(video_id=video_id, text=doc.page_content, citation=citations[0] if citations else None))
+    return SearchResponse(query=payload.query, hits=hits)
+
+
+@router.delete(
+    "/videos/{video_id}",
+    response_model=VideoDeleteResponse,
+    tags=["Ingest"],
+    dependencies=[Depends(require_admin)],
+)
+async def delete_video(
+    video_id: str,
+    request: Request,
+    transcript_service: TranscriptService = Depends(get_transcript_service),
+    vectorstore_service: VectorStoreService = Depends(get_vectorstore_service),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+    session_service: SessionService = Depends(get_session_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+):
+    """
+    Drop a video's index, cached transcript, cached answers and sessions.
+    
+    Requires an admin key (ADMIN_API_KEYS) and is charged like a cold
+    video, since the next question about the video refetches its
+    transcript and rebuilds its index.
+    """
+    with _request_errors("/videos/delete"):
+        admission.charge(request, DELETE, settings.RATE_LIMIT_COLD_COST)
+        removed = await run_io_bound(vectorstore_service.remove_video, video_id)
+        transcript_service.invalidate(video_id)
+        if answer_cache is not None:
+            answer_cache.invalidate(video_id)
+        session_service.close_video(video_id)
+        return VideoDeleteResponse(video_id=video_id, removed=removed)
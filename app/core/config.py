@@ -16,6 +16,8 @@ class Settings:
     
     # API Keys
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    # Alternative Groq/OpenAI-compatible endpoint (e.g. the load-test stub); empty uses Groq's API
+    GROQ_BASE_URL: str = os.getenv("GROQ_BASE_URL", "")
     
     # Model Configuration
     LLM_MODEL: str = "openai/gpt-oss-120b"
@@ -23,9 +25,142 @@ class Settings:
     EMBEDDING_MODEL: str = "BAAI/bge-small-en"
     
     # RAG Configuration
+    # "segment" cuts timed transcripts on segment boundaries and keeps
+    # timestamps; "recursive" uses RecursiveCharacterTextSplitter on the text
+    CHUNKER: str = os.getenv("CHUNKER", "segment")
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
-    RETRIEVER_K: int = 3
+    # Retrieval returns RETRIEVER_FETCH_K candidates; the context builder
+    # merges overlapping ones and keeps what fits in CONTEXT_TOKEN_BUDGET
+    # (estimated at 4 characters per token)
+    RETRIEVER_FETCH_K: int = int(os.getenv("RETRIEVER_FETCH_K", "8"))
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+    CONTEXT_MIN_NOVELTY: float = float(os.getenv("CONTEXT_MIN_NOVELTY", "0.3"))
+
+    # Index Configuration
+    # INDEX_TYPE "auto" picks flat, HNSW or IVF by vector count;
+    # INDEX_QUANTIZATION is one of none, fp16, int8 (4x smaller) or pq
+    INDEX_TYPE: str = os.getenv("INDEX_TYPE", "auto")
+    INDEX_QUANTIZATION: str = os.getenv("INDEX_QUANTIZATION", "int8")
+    INDEX_HNSW_MIN_VECTORS: int = int(os.getenv("INDEX_HNSW_MIN_VECTORS", "20000"))
+    INDEX_IVF_MIN_VECTORS: int = int(os.getenv("INDEX_IVF_MIN_VECTORS", "500000"))
+    INDEX_HNSW_M: int = int(os.getenv("INDEX_HNSW_M", "32"))
+    INDEX_HNSW_EF_SEARCH: int = int(os.getenv("INDEX_HNSW_EF_SEARCH", "128"))
+    INDEX_IVF_NPROBE: int = int(os.getenv("INDEX_IVF_NPROBE", "16"))
+    INDEX_PQ_M: int = int(os.getenv("INDEX_PQ_M", "48"))
+
+    # Shared index holding every ingested video's chunks, saved as one file
+    # per video; when disabled each video gets its own FAISS store in the
+    # resident LRU and index cache. Either way, resident indexes share the
+    # VECTORSTORE_CACHE_* budget
+    CORPUS_INDEX_ENABLED: bool = os.getenv("CORPUS_INDEX_ENABLED", "true").lower() == "true"
+    CORPUS_INDEX_DIR: str = os.getenv("CORPUS_INDEX_DIR", "cache/corpus")
+
+    # Embedding Configuration
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+    # FastEmbed data-parallel workers for large inputs (0 = all cores)
+    EMBEDDING_PARALLEL: int = int(os.getenv("EMBEDDING_PARALLEL", "0"))
+    EMBEDDING_PARALLEL_MIN_DOCS: int = int(os.getenv("EMBEDDING_PARALLEL_MIN_DOCS", "1024"))
+
+    # Cache Configuration
+    INDEX_CACHE_ENABLED: bool = os.getenv("INDEX_CACHE_ENABLED", "true").lower() == "true"
+    INDEX_CACHE_DIR: str = os.getenv("INDEX_CACHE_DIR", "cache/indexes")
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_DIR: str = os.getenv("EMBEDDING_CACHE_DIR", "cache/embeddings")
+    EMBEDDING_CACHE_DTYPE: str = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")
+    VECTORSTORE_CACHE_MAX_BYTES: int = int(os.getenv("VECTORSTORE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    VECTORSTORE_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("VECTORSTORE_CACHE_MAX_ENTRY_BYTES", str(64 * 1024 * 1024)))
+    ANSWER_CACHE_ENABLED: bool = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_THRESHOLD: float = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+    ANSWER_CACHE_TTL: int = int(os.getenv("ANSWER_CACHE_TTL", str(24 * 3600)))
+    ANSWER_CACHE_MAX_PER_VIDEO: int = int(os.getenv("ANSWER_CACHE_MAX_PER_VIDEO", "256"))
+    ANSWER_CACHE_MAX_VIDEOS: int = int(os.getenv("ANSWER_CACHE_MAX_VIDEOS", "1000"))
+    TRANSCRIPT_CACHE_ENABLED: bool = os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").lower() == "true"
+    TRANSCRIPT_CACHE_PATH: str = os.getenv("TRANSCRIPT_CACHE_PATH", "cache/transcripts.sqlite3")
+    TRANSCRIPT_CACHE_TTL: int = int(os.getenv("TRANSCRIPT_CACHE_TTL", str(7 * 24 * 3600)))
+    TRANSCRIPT_CACHE_NEGATIVE_TTL: int = int(os.getenv("TRANSCRIPT_CACHE_NEGATIVE_TTL", "900"))
+    TRANSCRIPT_CACHE_MAX_BYTES: int = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    TRANSCRIPT_CACHE_MEMORY_BYTES: int = int(os.getenv("TRANSCRIPT_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024)))
+    
+    # Concurrency Configuration
+    EMBEDDING_WORKERS: int = int(os.getenv("EMBEDDING_WORKERS", str(min(4, os.cpu_count() or 1))))
+    IO_WORKERS: int = int(os.getenv("IO_WORKERS", "16"))
+    BATCH_LLM_CONCURRENCY: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+    INGEST_CONCURRENCY: int = int(os.getenv("INGEST_CONCURRENCY", "2"))
+    INGEST_MAX_JOBS: int = int(os.getenv("INGEST_MAX_JOBS", "100"))
+    # New jobs get a 503 while INGEST_MAX_ACTIVE_JOBS are running or
+    # INGEST_MAX_PENDING_VIDEOS videos are still waiting or in progress
+    INGEST_MAX_ACTIVE_JOBS: int = int(os.getenv("INGEST_MAX_ACTIVE_JOBS", "10"))
+    INGEST_MAX_PENDING_VIDEOS: int = int(os.getenv("INGEST_MAX_PENDING_VIDEOS", "1000"))
+
+    # Admission Control
+    # Per-client token buckets (keyed by RATE_LIMIT_KEY_HEADER if it holds one
+    # of the comma-separated RATE_LIMIT_API_KEYS, else IP)
+    # refill at RATE_LIMIT_RATE tokens/s up to RATE_LIMIT_BURST. A question
+    # about an indexed video costs RATE_LIMIT_WARM_COST; a video that still
+    # needs fetching and embedding adds RATE_LIMIT_COLD_COST
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_RATE: float = float(os.getenv("RATE_LIMIT_RATE", "1"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "20"))
+    RATE_LIMIT_WARM_COST: float = float(os.getenv("RATE_LIMIT_WARM_COST", "1"))
+    RATE_LIMIT_COLD_COST: float = float(os.getenv("RATE_LIMIT_COLD_COST", "10"))
+    RATE_LIMIT_KEY_HEADER: str = os.getenv("RATE_LIMIT_KEY_HEADER", "X-API-Key")
+    RATE_LIMIT_API_KEYS: frozenset = frozenset(
+        key.strip() for key in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if key.strip()
+    )
+    RATE_LIMIT_MAX_CLIENTS: int = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+
+    # Keys (comma-separated) allowed to call admin endpoints such as
+    # DELETE /videos/{video_id}; with none set, those endpoints are disabled
+    ADMIN_API_KEYS: frozenset = frozenset(
+        key.strip() for key in os.getenv("ADMIN_API_KEYS", "").split(",") if key.strip()
+    )
+    ADMIN_KEY_HEADER: str = os.getenv("ADMIN_KEY_HEADER", "X-Admin-Key")
+    # At most ASK_MAX_IN_FLIGHT requests fetch, embed and retrieve at once;
+    # ASK_MAX_QUEUE more wait up to ASK_QUEUE_TIMEOUT seconds, then get a 503
+    ASK_MAX_IN_FLIGHT: int = int(os.getenv("ASK_MAX_IN_FLIGHT", "32"))
+    ASK_MAX_QUEUE: int = int(os.getenv("ASK_MAX_QUEUE", "128"))
+    ASK_QUEUE_TIMEOUT: float = float(os.getenv("ASK_QUEUE_TIMEOUT", "10"))
+
+    # Conversation Sessions
+    # A session pins its video's index, its last SESSION_MAX_TURNS turns
+    # (sent to the LLM as history) and the chunks retrieved for up to
+    # SESSION_RETRIEVAL_CACHE_SIZE questions; it is dropped after
+    # SESSION_IDLE_TIMEOUT seconds without use, or when SESSION_MAX_SESSIONS
+    # newer sessions push it out
+    SESSION_IDLE_TIMEOUT: float = float(os.getenv("SESSION_IDLE_TIMEOUT", "1800"))
+    SESSION_MAX_SESSIONS: int = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+    SESSION_MAX_TURNS: int = int(os.getenv("SESSION_MAX_TURNS", "4"))
+    SESSION_RETRIEVAL_CACHE_SIZE: int = int(os.getenv("SESSION_RETRIEVAL_CACHE_SIZE", "32"))
+
+    # LLM Client Configuration
+    # At most LLM_MAX_IN_FLIGHT generations run at once; LLM_MAX_QUEUE more
+    # wait up to LLM_QUEUE_TIMEOUT seconds, after which requests get a 503
+    LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "32"))
+    LLM_MAX_QUEUE: int = int(os.getenv("LLM_MAX_QUEUE", "128"))
+    LLM_QUEUE_TIMEOUT: float = float(os.getenv("LLM_QUEUE_TIMEOUT", "15"))
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "30"))
+    LLM_CONNECT_TIMEOUT: float = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+    # Streams must send their first chunk within LLM_FIRST_CHUNK_TIMEOUT and
+    # finish within LLM_STREAM_TIMEOUT seconds
+    LLM_FIRST_CHUNK_TIMEOUT: float = float(os.getenv("LLM_FIRST_CHUNK_TIMEOUT", "15"))
+    LLM_STREAM_TIMEOUT: float = float(os.getenv("LLM_STREAM_TIMEOUT", "60"))
+    # Retries on 429, 5xx, timeouts and connection errors, with jittered backoff
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+    LLM_POOL_CONNECTIONS: int = int(os.getenv("LLM_POOL_CONNECTIONS", "32"))
+    LLM_POOL_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "30"))
+
+    # Metrics Configuration
+    # Seconds between event loop lag probes (0 disables the probe)
+    EVENT_LOOP_LAG_INTERVAL: float = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.25"))
+
+    # Selenium Fallback Configuration
+    BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+    BROWSER_POOL_WARM: int = int(os.getenv("BROWSER_POOL_WARM", "1"))
+    BROWSER_MAX_USES: int = int(os.getenv("BROWSER_MAX_USES", "25"))
+    BROWSER_ACQUIRE_TIMEOUT: float = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "60"))
     
     # API Configuration
     APP_TITLE: str = "YouTube RAG Chatbot API"
@@ -45,19 +180,12 @@ class Settings:
         return True
 
 
-# Global settings instance
+# Global settings instance. Required credentials are checked when the
+# services that need them are built (see app/api/deps.py), not on import.
 settings = Settings()
-try:
-    settings.validate()
-    logger.info(
-        f"Configuration loaded: APP_TITLE='{settings.APP_TITLE}', "
-        f"APP_VERSION='{settings.APP_VERSION}', "
-        f"LLM_MODEL='{settings.LLM_MODEL}', "
-        f"EMBEDDING_MODEL='{settings.EMBEDDING_MODEL}', "
-        f"CHUNK_SIZE={settings.CHUNK_SIZE}, "
-        f"CHUNK_OVERLAP={settings.CHUNK_OVERLAP}, "
-        f"RETRIEVER_K={settings.RETRIEVER_K}"
-    )
-except Exception as e:
-    logger.critical(f"Application failed to start due to configuration error: {e}")
-    raise
+logger.info(
+    "Configuration loaded: APP_TITLE='%s', APP_VERSION='%s', LLM_MODEL='%s', EMBEDDING_MODEL='%s', "
+    "CHUNK_SIZE=%s, CHUNK_OVERLAP=%s, RETRIEVER_FETCH_K=%s, CONTEXT_TOKEN_BUDGET=%s",
+    settings.APP_TITLE, settings.APP_VERSION, settings.LLM_MODEL, settings.EMBEDDING_MODEL,
+    settings.CHUNK_SIZE, settings.CHUNK_OVERLAP, settings.RETRIEVER_FETCH_K, settings.CONTEXT_TOKEN_BUDGET,
+)
@@ -0,0 +1,41 @@
+"""
+Bounded executors for running blocking work off the asyncio event loop.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+from app.core.logging_config import logger
+
+# CPU-bound work (chunking, FastEmbed/ONNX embedding, FAISS search). Threads
+# rather than processes: ONNX Runtime and FAISS release the GIL and the
+# models and indexes can be shared without pickling.
+cpu_executor = ThreadPoolExecutor(
+    max_workers=settings.EMBEDDING_WORKERS,
+    thread_name_prefix="rag-cpu",
+)
+
+# Blocking I/O (YouTube transcript API, Selenium scraper, index cache disk reads)
+io_executor = ThreadPoolExecutor(
+    max_workers=settings.IO_WORKERS,
+    thread_name_prefix="rag-io",
+)
+
+
+async def run_cpu_bound(fn, *args, **kwargs):
+    """Run a CPU-bound callable in the bounded CPU executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(cpu_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def run_io_bound(fn, *args, **kwargs):
+    """Run a blocking I/O callable in the bounded I/O executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_executors():
+    """Stop accepting work and release the executor threads."""
+    logger.info("Shutting down RAG executors")
+    cpu_executor.shutdown(wait=False, cancel_futures=True)
+    io_executor.shutdown(wait=False, cancel_futures=True)
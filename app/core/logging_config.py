@@ -1,50 +1,183 @@
+"""
+Logging setup: a non-blocking queue handler drained by a background listener.
+
+Application threads (including the event loop) only put records on a queue;
+formatting and file/console I/O happen on the listener thread. Levels,
+output format and DEBUG sampling are configured per environment:
+
+    APP_ENV                 development (default) or production
+    LOG_LEVEL               app log level (DEBUG in development, INFO in production)
+    LOG_FORMAT              text or json (text in development, json in production)
+    LOG_FILE                log file path, empty to disable (default logs/school_api.log)
+    LOG_DEBUG_SAMPLE_RATE   fraction of DEBUG records kept (1.0 in development, 0.1 in production)
+    LOG_RATE_LIMIT          max DEBUG records per second per call site (0 = unlimited)
+    LOG_QUEUE_SIZE          records buffered before new ones are dropped
+
+Records dropped because the queue was full or their call site was over its
+rate limit are counted in the ``log_records_dropped_total`` metric.
+
+Log calls use %-style arguments (``logger.info("x=%s", x)``) so records
+filtered out by level, sampling or rate limiting are never formatted.
+"""
+import atexit
+import json
 import logging
-from logging.config import dictConfig
 import os
-os.makedirs("logs", exist_ok=True)
-
-# Simple logging config 
-LOGGING_CONFIG = {
-    'version':1,
-    'formatters':{
-        'default':{
-            'format':'[%(asctime)s] %(levelname)s in %(module)s: %(message)s',
-        }},
-    'handlers':{
-        'file':{
-            'class':'logging.FileHandler',
-            'filename':'logs/school_api.log',
-            'formatter':'default',
-        },
-        'console':{
-            'class':'logging.StreamHandler',
-            'formatter':'default',
-        }, 
-    },
-    'loggers':{
-        '':{
-            'level':'DEBUG',
-            'handlers':['file','console'],
-        },
-    }
-}
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 
-# Configure logging once, at app startup
-dictConfig(LOGGING_CONFIG)
-# Optionally create a module-level logger you can import everywhere
-logger = logging.getLogger(__name__)
-logger.info('✅ Logging Configured Successfully')
+from app.core.metrics import LOG_RECORDS_DROPPED
+
+APP_ENV = os.getenv("APP_ENV", "development").lower()
+PRODUCTION = APP_ENV == "production"
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO" if PRODUCTION else "DEBUG").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json" if PRODUCTION else "text").lower()
+LOG_FILE = os.getenv("LOG_FILE", "logs/school_api.log")
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1" if PRODUCTION else "1.0"))
+LOG_RATE_LIMIT = float(os.getenv("LOG_RATE_LIMIT", "20" if PRODUCTION else "0"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Chatty third-party loggers, kept at WARNING regardless of LOG_LEVEL
+QUIET_LOGGERS = ("httpx", "httpcore", "urllib3", "selenium", "WDM", "faiss", "filelock", "huggingface_hub", "groq")
+# Server loggers that install their own blocking handlers; routed through the queue instead
+ROUTED_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s in %(module)s: %(message)s"
+# Standard LogRecord attributes; anything else was passed via ``extra``
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a random ``rate`` fraction of DEBUG records."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or self.rate >= 1.0 or random.random() < self.rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site for DEBUG records.
+
+    A debug line inside a per-chunk loop can emit at most ``per_second``
+    records per second (with an equal burst); INFO and above always pass.
+    """
 
+    def __init__(self, per_second: float):
+        super().__init__()
+        self.per_second = per_second
+        self._buckets = {}
+        self._lock = threading.Lock()
 
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.per_second <= 0 or record.levelno > logging.DEBUG:
+            return True
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(site, (self.per_second, now))
+            tokens = min(self.per_second, tokens + (now - last) * self.per_second)
+            allowed = tokens >= 1
+            self._buckets[site] = (tokens - 1 if allowed else tokens, now)
+        if not allowed:
+            LOG_RECORDS_DROPPED.labels("rate_limited").inc()
+        return allowed
 
-# "loggers": {
-#         "auth_hashing": {
-#             "handlers": ["console", "file_auth"],
-#             "level": "DEBUG",
-#             "propagate": False  # <---- Add this here to stop duplication
-#         },
-#         "": {  # root logger
-#             "handlers": ["console"],
-#             "level": "WARNING",
-#         },
-#     },
\ No newline at end of file
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the caller.
+
+    Records are enqueued unformatted; the in-process listener formats them
+    on its own thread. When the queue is full the record is dropped and
+    counted instead of stalling the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.labels("queue_full").inc()
+
+
+def _build_formatter() -> logging.Formatter:
+    return JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging() -> QueueListener:
+    """Install the queue handler on the root logger and start the listener."""
+    formatter = _build_formatter()
+    handlers = [logging.StreamHandler()]
+    if LOG_FILE:
+        os.makedirs(os.path.dirname(LOG_FILE) or ".", exist_ok=True)
+        handlers.append(logging.FileHandler(LOG_FILE))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    queue_handler.addFilter(SamplingFilter(LOG_DEBUG_SAMPLE_RATE))
+    queue_handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    for name in ROUTED_LOGGERS:
+        routed = logging.getLogger(name)
+        routed.handlers.clear()
+        routed.propagate = True
+
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Configure logging once, at app startup
+_listener = configure_logging()
+atexit.register(shutdown_logging)
+
+# Module-level logger imported everywhere
+logger = logging.getLogger(__name__)
+logger.info("Logging configured (env=%s, level=%s, format=%s)", APP_ENV, LOG_LEVEL, LOG_FORMAT)
@@ -0,0 +1,213 @@
+"""
+Prometheus metrics for the API and the RAG pipeline, served at /metrics.
+
+Stage timers and counters are pre-bound to their label values at import,
+so recording on the hot path is a lock-protected float add (about a
+microsecond) with no label lookup.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to a shared,
+empty directory so /metrics aggregates every worker's samples.
+"""
+import asyncio
+import os
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGES = (
+    "transcript_api",       # YouTube transcript API call
+    "transcript_selenium",  # Selenium scraper fallback
+    "chunking",
+    "embedding",            # document (chunk) embedding, cache misses only
+    "query_embedding",
+    "index_build",
+    "retrieval",
+    "context_build",
+    "llm_generation",
+)
+
+STAGE_SECONDS = Histogram(
+    "rag_stage_duration_seconds",
+    "Time spent in each pipeline stage",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+TRANSCRIPT_FETCHES = Counter(
+    "rag_transcript_fetches_total",
+    "Transcript fetch attempts by source (cache, api, selenium) and outcome",
+    ["source", "outcome"],
+)
+CHUNKS_PER_VIDEO = Histogram(
+    "rag_chunks_per_video",
+    "Chunks created per indexed transcript",
+    buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+CONTEXT_TOKENS = Histogram(
+    "rag_context_tokens",
+    "Estimated tokens of retrieved context sent to the LLM per prompt",
+    buckets=(100, 250, 500, 1000, 1500, 2000, 3000, 4000, 8000),
+)
+ANSWER_CACHE_LOOKUPS = Counter(
+    "rag_answer_cache_lookups_total",
+    "Semantic answer cache lookups by result",
+    ["result"],
+)
+ERRORS = Counter(
+    "rag_errors_total",
+    "Failed requests and generations by endpoint and status",
+    ["endpoint", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    ["path"],
+    multiprocess_mode="livesum",
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "End-to-end request latency, including streamed responses",
+    ["path", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+LIMITER_IN_FLIGHT = Gauge(
+    "limiter_in_flight",
+    "Callers holding a concurrency limiter slot",
+    ["limiter"],
+    multiprocess_mode="livesum",
+)
+LIMITER_WAITING = Gauge(
+    "limiter_queue_depth",
+    "Callers waiting for a concurrency limiter slot",
+    ["limiter"],
+    multiprocess_mode="livesum",
+)
+LIMITER_WAIT_SECONDS = Histogram(
+    "limiter_wait_seconds",
+    "Time spent waiting for a concurrency limiter slot",
+    ["limiter"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+LIMITER_REJECTED = Counter(
+    "limiter_rejected_total",
+    "Callers turned away because the wait queue was full or the wait timed out",
+    ["limiter", "reason"],
+)
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "LLM calls retried, by reason (429, 5xx, timeout, connection)",
+    ["reason"],
+)
+ADMISSION_DECISIONS = Counter(
+    "admission_decisions_total",
+    "Question requests admitted or turned away, by cost class (warm, cold)",
+    ["cost_class", "decision"],
+)
+SESSIONS_ACTIVE = Gauge(
+    "chat_sessions_active",
+    "Conversation sessions held in memory",
+    multiprocess_mode="livesum",
+)
+SESSION_EVICTIONS = Counter(
+    "chat_session_evictions_total",
+    "Conversation sessions dropped, by reason (idle, capacity, closed, video_removed)",
+    ["reason"],
+)
+SESSION_RETRIEVALS = Counter(
+    "chat_session_retrievals_total",
+    "Session retrievals served from the session's chunk cache or searched",
+    ["result"],
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records discarded, by reason (queue_full, rate_limited)",
+    ["reason"],
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke a periodic probe; blocking calls on the loop show up here",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+_stage_timers = {stage: STAGE_SECONDS.labels(stage) for stage in STAGES}
+
+
+def stage_timer(stage: str):
+    """
+    Time a pipeline stage; usable as a context manager or decorator.
+
+    Args:
+        stage: One of STAGES
+    """
+    return _stage_timers[stage].time()
+
+
+def record_transcript_fetch(source: str, ok: bool) -> None:
+    TRANSCRIPT_FETCHES.labels(source, "success" if ok else "failure").inc()
+
+
+def record_error(endpoint: str, status: int) -> None:
+    ERRORS.labels(endpoint, str(status)).inc()
+
+
+async def monitor_event_loop(interval: float) -> None:
+    """Record event loop lag every ``interval`` seconds until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
+
+
+def render_metrics():
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        (payload bytes, content type)
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording in-flight requests and request latency.
+
+    Only the given paths are labelled individually; everything else
+    (including paths with IDs in them) shares the "other" label, so label
+    cardinality stays fixed.
+    """
+
+    def __init__(self, app, paths=()):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"] if scope["path"] in self.paths else "other"
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(path)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            REQUEST_SECONDS.labels(path, scope["method"], str(status["code"])).observe(time.perf_counter() - start)
@@ -4,10 +4,14 @@ Main FastAPI application entry point.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
+from app.api.deps import shutdown_services, warm_up
 from app.core.config import settings
+import asyncio
 import warnings
 from contextlib import asynccontextmanager
 from app.core.logging_config import logger
+from app.core.executors import shutdown_executors
+from app.core.metrics import MetricsMiddleware, monitor_event_loop
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
@@ -16,10 +20,21 @@ warnings.filterwarnings("ignore")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
-    logger.info(f"Starting {settings.APP_TITLE} v{settings.APP_VERSION}")
+    logger.info("Starting %s v%s", settings.APP_TITLE, settings.APP_VERSION)
+    # Build services and warm the embedding model in the background;
+    # /health answers immediately, /ready once warm-up has finished
+    warmup_task = asyncio.create_task(warm_up())
+    lag_task = None
+    if settings.EVENT_LOOP_LAG_INTERVAL > 0:
+        lag_task = asyncio.create_task(monitor_event_loop(settings.EVENT_LOOP_LAG_INTERVAL))
     yield
     # Shutdown logic
     logger.info("Shutting down application...")
+    warmup_task.cancel()
+    if lag_task is not None:
+        lag_task.cancel()
+    await shutdown_services()
+    shutdown_executors()
 
 # Create FastAPI app with lifespan
 app = FastAPI(
@@ -42,6 +57,9 @@ app.add_middleware(
 
 logger.debug("CORS middleware configured with allow_origins='*'")
 
+# Record in-flight requests and latency per route (paths with IDs share one label)
+app.add_middleware(MetricsMiddleware, paths=[route.path for route in router.routes if "{" not in route.path])
+
 # Include routers
 app.include_router(router)
 logger.info("API routes included successfully")
@@ -1,6 +1,7 @@
 """
 Pydantic models for request/response validation.
 """
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -13,11 +14,20 @@ class QueryRequest(BaseModel):
 
 
 
+class Citation(BaseModel):
+    """Transcript span a retrieved chunk came from."""
+    
+    start: Optional[float] = Field(None, description="Chunk start time in seconds")
+    end: Optional[float] = Field(None, description="Chunk end time in seconds")
+    url: Optional[str] = Field(None, description="Video link starting at the chunk")
+
+
 class QueryResponse(BaseModel):
     """Response model for question answers."""
     
     answer: str = Field(..., description="Generated answer based on video transcript")
     video_url: str = Field(..., description="The video url that was queried")
+    citations: List[Citation] = Field(default_factory=list, description="Timestamps of the retrieved context")
     
 
 
@@ -26,4 +36,133 @@ class HealthResponse(BaseModel):
     """Health check response."""
     
     status: str
-    message: str
\ No newline at end of file
+    message: str
+
+
+class ReadinessResponse(BaseModel):
+    """Response model for the readiness check."""
+    
+    ready: bool
+    components: Dict[str, str] = Field(..., description="Warm-up state per component: pending, ready or failed: <reason>")
+
+
+class CacheStatsResponse(BaseModel):
+    """Hit/miss/eviction counters for the in-process caches."""
+    
+    vectorstores: dict = Field(..., description="Resident vector store LRU statistics")
+    transcripts: dict = Field(default_factory=dict, description="In-memory transcript LRU statistics")
+    answers: dict = Field(default_factory=dict, description="Semantic answer cache statistics")
+    corpus: dict = Field(default_factory=dict, description="Shared corpus index size")
+
+
+class BatchQueryRequest(BaseModel):
+    """Request model for asking many questions about one video."""
+    
+    video_url: str = Field(..., description="YouTube video URL or ID")
+    questions: List[str] = Field(..., description="Questions to ask about the video content", min_length=1, max_length=100)
+
+
+class BatchAnswer(BaseModel):
+    """Answer, or error, for one question of a batch."""
+    
+    question: str
+    answer: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchQueryResponse(BaseModel):
+    """Response model for batch question answers, in request order."""
+    
+    video_url: str
+    answers: List[BatchAnswer]
+
+
+class SessionCreateRequest(BaseModel):
+    """Request model for starting a conversation about a video."""
+    
+    video_url: str = Field(..., description="YouTube video URL or ID")
+
+
+class SessionQueryRequest(BaseModel):
+    """Request model for asking a question within a session."""
+    
+    question: str = Field(..., description="Question to ask about the video content", min_length=1)
+
+
+class SessionTurn(BaseModel):
+    """One question and answer of a session."""
+    
+    question: str
+    answer: str
+
+
+class SessionResponse(BaseModel):
+    """A conversation session and its recent turns."""
+    
+    session_id: str = Field(..., description="Identifier to ask at /sessions/{session_id}/ask")
+    video_url: str
+    idle_timeout: float = Field(..., description="Seconds without use before the session is dropped")
+    turns: List[SessionTurn] = Field(default_factory=list, description="Most recent turns, oldest first")
+
+
+class IngestRequest(BaseModel):
+    """Request model for ingesting a batch of videos ahead of time."""
+    
+    video_urls: List[str] = Field(..., description="YouTube video URLs or IDs to ingest", min_length=1, max_length=500)
+
+
+class IngestResponse(BaseModel):
+    """Response model for a submitted ingestion job."""
+    
+    job_id: str = Field(..., description="Identifier to poll at /jobs/{job_id}")
+    status: str
+    total: int = Field(..., description="Number of distinct videos in the job")
+
+
+class VideoIngestStatus(BaseModel):
+    """Ingestion progress for one video."""
+    
+    video_url: str
+    status: str = Field(..., description="pending, running, completed or failed")
+    error: Optional[str] = None
+
+
+class JobStatusResponse(BaseModel):
+    """Progress report for an ingestion job."""
+    
+    job_id: str
+    status: str = Field(..., description="pending, running, completed or failed")
+    total: int
+    completed: int
+    failed: int
+    videos: List[VideoIngestStatus]
+
+
+class SearchRequest(BaseModel):
+    """Request model for searching chunks across ingested videos."""
+    
+    query: str = Field(..., description="Search query")
+    video_urls: Optional[List[str]] = Field(None, description="Videos to search; all ingested videos if omitted")
+    k: int = Field(8, description="Number of chunks to return", ge=1, le=50)
+
+
+class SearchHit(BaseModel):
+    """One transcript chunk matching a search."""
+    
+    video_id: str
+    text: str
+    citation: Optional[Citation] = None
+
+
+class SearchResponse(BaseModel):
+    """Response model for a cross-video search."""
+    
+    query: str
+    hits: List[SearchHit]
+
+
+class VideoDeleteResponse(BaseModel):
+    """Response model for dropping a video's index."""
+    
+    video_id: str
+    removed: bool = Field(..., description="False if the video was not indexed")
@@ -0,0 +1,130 @@
+"""
+Admission control for question-answering requests.
+"""
+import hashlib
+from contextlib import asynccontextmanager
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.metrics import ADMISSION_DECISIONS
+from app.utils.limiter import ConcurrencyLimiter, OverloadedError
+from app.utils.rate_limit import (
+    InMemoryRateLimitBackend, RateLimitBackend, RateLimitedError, TokenBucketRateLimiter,
+)
+
+WARM = "warm"
+COLD = "cold"
+INGEST = "ingest"
+DELETE = "delete"
+
+
+class AdmissionController:
+    """
+    Decides whether a request may start work, and how much it costs.
+
+    Each client (a known API key if sent, otherwise IP) has a token bucket.
+    Questions about an indexed video ("warm") cost RATE_LIMIT_WARM_COST
+    tokens each. A video that still needs a transcript fetch and an
+    embedding pass ("cold") costs RATE_LIMIT_COLD_COST more. A client
+    over budget gets RateLimitedError.
+
+    Admitted requests then take a slot in the global "ask"
+    ConcurrencyLimiter for the transcript, embedding and retrieval work.
+    When its queue is full they get OverloadedError instead of waiting on
+    work the server cannot finish. Answer generation is bounded separately
+    by the LLM client's limiter.
+    """
+
+    def __init__(self, backend: RateLimitBackend = None, limiter: ConcurrencyLimiter = None):
+        """
+        Initialize the controller.
+
+        Args:
+            backend: Where token buckets live; defaults to this process's
+                memory, so every worker enforces its own budget. Pass a
+                shared backend to enforce one budget across workers.
+            limiter: Global work queue; defaults to one sized by the
+                ASK_* settings
+        """
+        if backend is None:
+            backend = InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_CLIENTS)
+        self.rate_limiter = None
+        if settings.RATE_LIMIT_ENABLED:
+            self.rate_limiter = TokenBucketRateLimiter(
+                rate=settings.RATE_LIMIT_RATE,
+                burst=settings.RATE_LIMIT_BURST,
+                backend=backend,
+            )
+        self.limiter = limiter or ConcurrencyLimiter(
+            "ask",
+            max_in_flight=settings.ASK_MAX_IN_FLIGHT,
+            max_waiting=settings.ASK_MAX_QUEUE,
+            wait_timeout=settings.ASK_QUEUE_TIMEOUT,
+        )
+
+    @staticmethod
+    def client_key(request: Request) -> str:
+        """
+        Identify the client by API key, falling back to its IP address.
+
+        Only keys listed in RATE_LIMIT_API_KEYS count; any other key is
+        ignored, so a client cannot get a fresh bucket by inventing keys.
+        """
+        api_key = request.headers.get(settings.RATE_LIMIT_KEY_HEADER)
+        if api_key and api_key in settings.RATE_LIMIT_API_KEYS:
+            # Buckets may live in a shared store, so keep the key itself out of it
+            return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return "ip:" + (request.client.host if request.client else "unknown")
+
+    @staticmethod
+    def cost(cost_class: str, questions: int = 1) -> float:
+        """Tokens charged for ``questions`` questions of a cost class."""
+        cost = settings.RATE_LIMIT_WARM_COST * questions
+        if cost_class == COLD:
+            cost += settings.RATE_LIMIT_COLD_COST
+        return cost
+
+    def charge(self, request: Request, cost_class: str, cost: float) -> None:
+        """
+        Charge the client's bucket without taking a work slot.
+
+        Used for work that is bounded elsewhere, such as ingestion jobs.
+
+        Raises:
+            RateLimitedError: The client is over its budget
+        """
+        if self.rate_limiter is None:
+            return
+        try:
+            self.rate_limiter.check(self.client_key(request), cost)
+        except RateLimitedError:
+            ADMISSION_DECISIONS.labels(cost_class, "rate_limited").inc()
+            raise
+
+    @asynccontextmanager
+    async def admit(self, request: Request, indexed: bool, questions: int = 1):
+        """
+        Hold a work slot for the block, after charging the client.
+
+        Args:
+            request: Incoming request, used to identify the client
+            indexed: Whether the video already has an index
+            questions: Number of questions in the request
+
+        Raises:
+            RateLimitedError: The client is over its budget
+            OverloadedError: The global work queue is full or timed out
+        """
+        cost_class = WARM if indexed else COLD
+        self.charge(request, cost_class, self.cost(cost_class, questions))
+        try:
+            await self.limiter.acquire()
+        except OverloadedError:
+            ADMISSION_DECISIONS.labels(cost_class, "overloaded").inc()
+            raise
+        ADMISSION_DECISIONS.labels(cost_class, "admitted").inc()
+        try:
+            yield
+        finally:
+            self.limiter.release()
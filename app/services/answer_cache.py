@@ -0,0 +1,126 @@
+"""
+Semantic cache of generated answers, keyed by video and question embedding.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+from app.core.config import settings
+from app.core.logging_config import logger
+
+
+@dataclass
+class _VideoAnswers:
+    version: str
+    vectors: np.ndarray
+    answers: List[str] = field(default_factory=list)
+    created_at: List[float] = field(default_factory=list)
+
+
+class SemanticAnswerCache:
+    """
+    Returns a stored answer when a new question is close enough to one
+    already answered for the same video.
+
+    Questions are compared by cosine similarity of their embeddings against
+    ``threshold``. Entries expire after ``ttl`` seconds, each video keeps at
+    most ``max_per_video`` answers, and at most ``max_videos`` videos are
+    tracked (least recently used dropped first). All answers for a video
+    are dropped when its index version changes.
+    """
+
+    def __init__(
+        self,
+        threshold: float = None,
+        ttl: float = None,
+        max_per_video: int = None,
+        max_videos: int = None,
+    ):
+        self.threshold = threshold if threshold is not None else settings.ANSWER_CACHE_THRESHOLD
+        self.ttl = ttl if ttl is not None else settings.ANSWER_CACHE_TTL
+        self.max_per_video = max_per_video or settings.ANSWER_CACHE_MAX_PER_VIDEO
+        self.max_videos = max_videos or settings.ANSWER_CACHE_MAX_VIDEOS
+        self._videos: "OrderedDict[str, _VideoAnswers]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, video_id: str, version: str, question_vector) -> Optional[str]:
+        """
+        Find a cached answer for a semantically equivalent question.
+
+        Returns:
+            The cached answer, or None if no stored question is similar enough
+        """
+        vector = self._normalize(question_vector)
+        with self._lock:
+            entry = self._current(video_id, version)
+            if entry is None or not entry.answers:
+                self.misses += 1
+                return None
+            self._videos.move_to_end(video_id)
+
+            similarities = entry.vectors @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            logger.info("Answer cache hit for video_id=%s (similarity=%.3f)", video_id, similarities[best])
+            return entry.answers[best]
+
+    def store(self, video_id: str, version: str, question_vector, answer: str) -> None:
+        vector = self._normalize(question_vector)
+        with self._lock:
+            entry = self._current(video_id, version)
+            if entry is None:
+                entry = _VideoAnswers(version=version, vectors=np.empty((0, vector.shape[0]), dtype=np.float32))
+                self._videos[video_id] = entry
+            self._videos.move_to_end(video_id)
+
+            entry.vectors = np.vstack([entry.vectors, vector[None, :]])[-self.max_per_video:]
+            entry.answers = (entry.answers + [answer])[-self.max_per_video:]
+            entry.created_at = (entry.created_at + [time.time()])[-self.max_per_video:]
+
+            while len(self._videos) > self.max_videos:
+                self._videos.popitem(last=False)
+
+    def invalidate(self, video_id: str) -> None:
+        with self._lock:
+            self._videos.pop(video_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "videos": len(self._videos),
+                "entries": sum(len(entry.answers) for entry in self._videos.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _current(self, video_id: str, version: str) -> Optional[_VideoAnswers]:
+        """Return the video's entry after dropping stale versions and expired answers."""
+        entry = self._videos.get(video_id)
+        if entry is None:
+            return None
+        if entry.version != version:
+            logger.info("Answer cache invalidated for video_id=%s: index version changed", video_id)
+            del self._videos[video_id]
+            return None
+
+        cutoff = time.time() - self.ttl
+        keep = [i for i, created in enumerate(entry.created_at) if created > cutoff]
+        if len(keep) != len(entry.answers):
+            entry.vectors = entry.vectors[keep]
+            entry.answers = [entry.answers[i] for i in keep]
+            entry.created_at = [entry.created_at[i] for i in keep]
+        return entry
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
@@ -0,0 +1,179 @@
+"""
+Pool of warm headless Chrome drivers for the Selenium transcript fallback.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+class BrowserPoolTimeout(TimeoutError):
+    """Raised when no driver becomes available within the acquire timeout."""
+
+
+@dataclass
+class _PooledDriver:
+    driver: "webdriver.Chrome"
+    uses: int = 0
+
+
+class ChromeDriverPool:
+    """
+    Bounded pool of reusable headless Chrome drivers.
+
+    At most ``size`` browsers exist at once; callers beyond that wait up to
+    ``acquire_timeout`` seconds for one to be released. Drivers are health
+    checked before each use and recycled after ``max_uses`` uses or when a
+    caller reports them broken. The chromedriver path is resolved once.
+    """
+
+    def __init__(self, size: int = None, max_uses: int = None, acquire_timeout: float = None, warm: int = None):
+        self.size = size or settings.BROWSER_POOL_SIZE
+        self.max_uses = max_uses or settings.BROWSER_MAX_USES
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else settings.BROWSER_ACQUIRE_TIMEOUT
+        self.warm = min(warm if warm is not None else settings.BROWSER_POOL_WARM, self.size)
+        self._idle = []
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._driver_path = None
+        self._driver_path_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Resolve the driver path and pre-start the warm drivers."""
+        started = []
+        try:
+            for _ in range(self.warm):
+                started.append(self._acquire())
+        except Exception as e:
+            logger.warning("Could not pre-start Chrome drivers: %s", e)
+        for pooled in started:
+            self._release(pooled)
+        logger.info("Chrome driver pool started with %s warm driver(s)", len(started))
+
+    @contextmanager
+    def driver(self):
+        """
+        Borrow a driver for the duration of a ``with`` block.
+
+        An exception escaping the block marks the driver broken, so it is
+        quit instead of returned to the pool.
+        """
+        pooled = self._acquire()
+        try:
+            yield pooled.driver
+        except Exception:
+            self._discard(pooled)
+            raise
+        else:
+            self._release(pooled)
+
+    def close(self) -> None:
+        """Quit every idle driver and refuse further acquisitions."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+        logger.info("Chrome driver pool closed")
+
+    def _acquire(self) -> _PooledDriver:
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._total >= self.size:
+                    if self._closed:
+                        raise RuntimeError("Chrome driver pool is closed")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolTimeout(
+                            f"No Chrome driver available within {self.acquire_timeout}s"
+                        )
+                    self._cond.wait(remaining)
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    self._total += 1
+                    pooled = None
+
+            if pooled is None:
+                try:
+                    return _PooledDriver(self._create_driver())
+                except Exception:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    raise
+
+            if self._is_healthy(pooled.driver):
+                return pooled
+            logger.warning("Discarding unhealthy Chrome driver")
+            self._discard(pooled)
+
+    def _release(self, pooled: _PooledDriver) -> None:
+        pooled.uses += 1
+        if pooled.uses >= self.max_uses or self._closed:
+            logger.debug("Recycling Chrome driver after %s uses", pooled.uses)
+            self._discard(pooled)
+            return
+        try:
+            pooled.driver.delete_all_cookies()
+            pooled.driver.get("about:blank")
+        except Exception:
+            self._discard(pooled)
+            return
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    def _discard(self, pooled: _PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.debug("Error while quitting Chrome driver: %s", e)
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def _create_driver(self) -> "webdriver.Chrome":
+        # Selenium is only needed once the fallback scraper runs
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless=new")  # Uses the newer, more stable headless engine
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument(
+            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        )
+        driver = webdriver.Chrome(service=Service(self._resolve_driver_path()), options=chrome_options)
+        logger.debug("Chrome WebDriver initialized")
+        return driver
+
+    def _resolve_driver_path(self) -> str:
+        with self._driver_path_lock:
+            if self._driver_path is None:
+                from webdriver_manager.chrome import ChromeDriverManager
+                self._driver_path = ChromeDriverManager().install()
+                logger.info("Resolved chromedriver at '%s'", self._driver_path)
+            return self._driver_path
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,76 @@
+"""
+Segment-aligned chunking of timed transcripts.
+"""
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+from app.services.transcript_segments import TranscriptSegments
+
+
+class SegmentChunker:
+    """
+    Groups whole transcript segments into chunks of at most ``chunk_size``
+    characters, repeating up to ``chunk_overlap`` characters of trailing
+    segments at the start of the next chunk.
+
+    Cuts fall on segment boundaries, found by binary search over the
+    segment offsets, so the cost grows with the number of chunks rather
+    than the number of characters. A single segment longer than
+    ``chunk_size`` (e.g. scraped text without line breaks) is cut with the
+    recursive character splitter instead, and its pieces share the
+    segment's times. Each chunk carries its start and end time in seconds,
+    plus its character offset in the transcript.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._text_splitter = None
+
+    def _split_long_segment(self, segments: TranscriptSegments, index: int) -> List[Document]:
+        if self._text_splitter is None:
+            # Imported here, as in VectorStoreService, to keep it out of the cold start
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+            self._text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                add_start_index=True,
+            )
+        start, end = segments.span_times(index, index + 1)
+        offset = int(segments.offsets[index])
+        return [
+            Document(
+                page_content=piece.page_content,
+                metadata={"start": start, "end": end, "start_index": offset + piece.metadata["start_index"]},
+            )
+            for piece in self._text_splitter.create_documents([segments.span_text(index, index + 1)])
+        ]
+
+    def split(self, segments: TranscriptSegments) -> List[Document]:
+        offsets = segments.offsets
+        count = len(segments)
+        documents = []
+        first = 0
+        while first < count:
+            # Last boundary that keeps the chunk (without its trailing space) within chunk_size
+            last = int(np.searchsorted(offsets, offsets[first] + self.chunk_size + 1, side="right")) - 1
+            last = min(max(last, first + 1), count)
+
+            if last == first + 1 and offsets[last] - offsets[first] - 1 > self.chunk_size:
+                documents.extend(self._split_long_segment(segments, first))
+            else:
+                start, end = segments.span_times(first, last)
+                documents.append(Document(
+                    page_content=segments.span_text(first, last),
+                    metadata={"start": start, "end": end, "start_index": int(offsets[first])},
+                ))
+            if last >= count:
+                break
+
+            # Back up to the earliest segment that fits in the overlap, always moving forward
+            next_first = int(np.searchsorted(offsets, offsets[last] - self.chunk_overlap, side="left"))
+            first = min(max(next_first, first + 1), last)
+        return documents
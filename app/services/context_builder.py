@@ -0,0 +1,144 @@
+"""
+Token-budgeted assembly of LLM context from retrieved chunks.
+"""
+from typing import List, Optional
+
+from langchain_core.documents import Document
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import CONTEXT_TOKENS
+
+# Characters per token of English text for typical BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate prompt tokens for text.
+
+    This is a characters-per-token estimate, not the LLM's tokenizer, so
+    the context budget is approximate; leave headroom below the model's
+    context window.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class _Span:
+    """A retrieved chunk's character range in the transcript."""
+
+    __slots__ = ("start", "end", "doc")
+
+    def __init__(self, doc: Document):
+        self.doc = doc
+        self.start = doc.metadata.get("start_index")
+        self.end = None if self.start is None else self.start + len(doc.page_content)
+
+
+class ContextBuilder:
+    """
+    Builds the LLM context from ranked retrieval results.
+
+    Chunks are taken in relevance order while they fit in ``token_budget``;
+    if even the most relevant one does not, it is cut to the budget.
+    A chunk is skipped when less than ``min_novelty`` of its characters are
+    new, i.e. not already covered by higher-ranked chunks (MMR-style
+    redundancy filtering). Selected chunks that overlap or touch in the
+    transcript are merged so shared text is sent once, and the result is
+    ordered by position in the transcript.
+    """
+
+    def __init__(self, token_budget: int = None, min_novelty: float = None):
+        self.token_budget = token_budget if token_budget is not None else settings.CONTEXT_TOKEN_BUDGET
+        self.min_novelty = min_novelty if min_novelty is not None else settings.CONTEXT_MIN_NOVELTY
+
+    def build(self, documents: List[Document]) -> List[Document]:
+        """
+        Select, de-duplicate and merge retrieved documents.
+
+        Args:
+            documents: Retrieved documents, most relevant first
+
+        Returns:
+            Merged context documents in transcript order
+        """
+        selected: List[_Span] = []
+        seen_texts = set()
+        used_tokens = 0
+
+        for doc in documents:
+            span = _Span(doc)
+            if span.start is None:
+                if doc.page_content in seen_texts:
+                    continue
+                novel = len(doc.page_content)
+            else:
+                novel = len(doc.page_content) - self._covered(span, selected)
+                if novel < self.min_novelty * len(doc.page_content):
+                    continue
+
+            # Overlapping text is merged away, so only the new share costs tokens
+            tokens = count_tokens(doc.page_content) * novel // max(len(doc.page_content), 1)
+            if used_tokens + tokens > self.token_budget:
+                if selected:
+                    continue
+                # The most relevant chunk alone is over budget, so send the part that fits
+                doc = Document(
+                    page_content=doc.page_content[:self.token_budget * CHARS_PER_TOKEN],
+                    metadata=doc.metadata,
+                )
+                if not doc.page_content:
+                    continue
+                span = _Span(doc)
+                tokens = count_tokens(doc.page_content)
+            selected.append(span)
+            seen_texts.add(doc.page_content)
+            used_tokens += tokens
+
+        merged = self._merge(selected)
+        logger.info(
+            "Context built from %s merged spans out of %s retrieved (~%s tokens, budget=%s)",
+            len(merged), len(documents), used_tokens, self.token_budget,
+        )
+        CONTEXT_TOKENS.observe(used_tokens)
+        return merged
+
+    @staticmethod
+    def _covered(span: _Span, selected: List[_Span]) -> int:
+        """Number of the span's characters already covered by selected spans."""
+        ranges = sorted(
+            (max(span.start, other.start), min(span.end, other.end))
+            for other in selected
+            if other.start is not None and other.start < span.end and other.end > span.start
+        )
+        covered, cursor = 0, span.start
+        for start, end in ranges:
+            start = max(start, cursor)
+            if end > start:
+                covered += end - start
+                cursor = end
+        return covered
+
+    @staticmethod
+    def _merge(spans: List[_Span]) -> List[Document]:
+        positioned = sorted((s for s in spans if s.start is not None), key=lambda s: s.start)
+        merged: List[Document] = []
+        current: Optional[dict] = None
+
+        for span in positioned:
+            # Chunks of one transcript are joined by a single separator character
+            if current is not None and span.start <= current["end"] + 1:
+                if span.end > current["end"]:
+                    if span.start > current["end"]:
+                        current["text"] += " " + span.doc.page_content
+                    else:
+                        current["text"] += span.doc.page_content[current["end"] - span.start:]
+                    current["end"] = span.end
+                    current["metadata"]["end"] = span.doc.metadata.get("end")
+                continue
+            if current is not None:
+                merged.append(Document(page_content=current["text"], metadata=current["metadata"]))
+            current = {"text": span.doc.page_content, "end": span.end, "metadata": dict(span.doc.metadata)}
+
+        if current is not None:
+            merged.append(Document(page_content=current["text"], metadata=current["metadata"]))
+        return merged + [s.doc for s in spans if s.start is None]
@@ -0,0 +1,419 @@
+"""
+Long-lived vector index shared by all videos.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.services.index_factory import build_index, index_bytes
+from app.utils.cache import LRUCache
+from app.utils.rwlock import ReadWriteLock
+
+SEGMENT_SUFFIX = ".seg"
+DOCUMENT_OVERHEAD_BYTES = 512
+# Shared index ids are (video slot << ROW_BITS) | row, so each video owns one id range
+ROW_BITS = 32
+
+
+@dataclass
+class _Segment:
+    """One video's chunks and their FAISS index; never modified once built."""
+
+    index: faiss.Index
+    documents: List[Document]
+    version: Optional[str]
+    nbytes: int
+
+
+def _segment_bytes(index: faiss.Index, documents: List[Document]) -> int:
+    return index_bytes(index) + sum(len(doc.page_content) + DOCUMENT_OVERHEAD_BYTES for doc in documents)
+
+
+@dataclass
+class _SegmentFile:
+    version: Optional[str]
+    mtime_ns: int
+
+
+class CorpusIndex:
+    """
+    The chunks of every ingested video: one shared index plus a segment per video.
+
+    The shared index is a single ``IndexIDMap2`` holding every video's
+    vectors (float16 unless INDEX_QUANTIZATION is "none"), where each
+    video owns a contiguous id range. Cross-video and multi-video searches
+    run on it in one call, with an id-range filter when restricted to some
+    videos. It is held under a reader/writer lock: searches run
+    concurrently and only adding or removing a video waits for them.
+
+    A segment is one video's own FAISS index, built with INDEX_TYPE and
+    INDEX_QUANTIZATION, plus its chunks. Questions about a single video
+    search only its segment. Resident segments are kept in this index's
+    own LRU, which replaces the per-video store LRU in corpus mode and is
+    bounded by the same VECTORSTORE_CACHE_MAX_BYTES; evicted segments are
+    read back from disk when next asked about. Cross-video searches never
+    load segments into the LRU, so they cannot evict the hot ones.
+
+    Each segment is saved to its own file as soon as it is built, written
+    to a temporary file and renamed into place, so a crash loses nothing
+    already indexed. Worker processes sharing ``path`` only ever write the
+    videos they index. A search checks the directory's modification time
+    and, only when it changed, folds segments added, replaced or removed
+    by other workers into the shared index.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        index_type: str = None,
+        quantization: str = None,
+        max_bytes: int = None,
+    ):
+        self.path = path or settings.CORPUS_INDEX_DIR
+        self.index_type = index_type or settings.INDEX_TYPE
+        self.quantization = quantization or settings.INDEX_QUANTIZATION
+        # Segments built under another embedding or index setup are ignored
+        raw = (
+            f"{settings.EMBEDDING_MODEL}|{settings.CHUNKER}|{settings.CHUNK_SIZE}|{settings.CHUNK_OVERLAP}|"
+            f"{self.index_type}|{self.quantization}"
+        )
+        self.setup_key = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+        max_bytes = max_bytes or settings.VECTORSTORE_CACHE_MAX_BYTES
+        self.segments = LRUCache(
+            max_bytes=max_bytes,
+            sizeof=lambda segment: segment.nbytes,
+            max_entry_bytes=min(settings.VECTORSTORE_CACHE_MAX_ENTRY_BYTES, max_bytes),
+        )
+        self.files: Dict[str, _SegmentFile] = {}
+        self.shared: Optional[faiss.IndexIDMap2] = None
+        self.slots: Dict[str, int] = {}
+        self.slot_videos: Dict[int, str] = {}
+        self._next_slot = 0
+        self._dir_mtime_ns = None
+        self._lock = threading.Lock()
+        self._shared_lock = ReadWriteLock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, video_id: str) -> str:
+        return os.path.join(self.path, f"{video_id}-{self.setup_key}{SEGMENT_SUFFIX}")
+
+    def contains(self, video_id: str) -> bool:
+        return self._entry(video_id) is not None
+
+    def version(self, video_id: str) -> Optional[str]:
+        entry = self._entry(video_id)
+        return entry.version if entry else None
+
+    def video_ids(self) -> List[str]:
+        """Every video in the corpus, including those written by other workers."""
+        self._sync()
+        return list(self.slots)
+
+    def add_video(self, video_id: str, documents: List[Document], vectors: np.ndarray, version: str = None) -> _Segment:
+        """
+        Build and save a video's segment, replacing any segment it already has.
+
+        Args:
+            video_id: YouTube video ID
+            documents: Chunks in the same order as the vector rows
+            vectors: Contiguous float32 matrix of shape (len(documents), dim)
+            version: Index version of the video's transcript
+
+        Returns:
+            The video's new segment
+        """
+        documents = [
+            Document(page_content=doc.page_content, metadata={**doc.metadata, "video_id": video_id})
+            for doc in documents
+        ]
+        index = build_index(vectors, self.index_type, self.quantization)
+        segment = _Segment(
+            index=index,
+            documents=documents,
+            version=version,
+            nbytes=_segment_bytes(index, documents),
+        )
+        mtime_ns = self._write(video_id, segment, vectors)
+        self._share(video_id, vectors)
+        with self._lock:
+            self.files[video_id] = _SegmentFile(version=version, mtime_ns=mtime_ns)
+            self.segments.put(video_id, segment)
+        logger.info("Corpus index added %s chunks for video_id=%s", len(documents), video_id)
+        return segment
+
+    def remove_video(self, video_id: str) -> bool:
+        """Remove a video's segment. Returns False if it was not indexed."""
+        try:
+            os.remove(self._file(video_id))
+            removed = True
+        except FileNotFoundError:
+            removed = False
+        removed = self._forget(video_id) or removed
+        if removed:
+            logger.info("Corpus index removed video_id=%s", video_id)
+        return removed
+
+    def segment(self, video_id: str) -> Optional[_Segment]:
+        """
+        The video's segment, read from disk if it is not resident.
+
+        The segment never changes, so a caller may keep it to go on
+        searching the same version of the video.
+        """
+        entry = self._entry(video_id)
+        if entry is None:
+            return None
+        segment = self.segments.get(video_id)
+        if segment is not None and segment.version == entry.version:
+            return segment
+        try:
+            version, documents, index_data, _ = self._read(video_id)
+            index = faiss.deserialize_index(index_data)
+        except Exception as e:
+            logger.warning("Skipping unreadable corpus segment for video_id=%s: %s", video_id, e)
+            return None
+        segment = _Segment(index=index, documents=documents, version=version, nbytes=_segment_bytes(index, documents))
+        self.segments.put(video_id, segment)
+        return segment
+
+    @staticmethod
+    def search_segment(segment: _Segment, query_vectors: np.ndarray, k: int) -> List[List[Document]]:
+        """Search one video's segment."""
+        query_vectors = np.ascontiguousarray(query_vectors, dtype=np.float32).reshape(-1, query_vectors.shape[-1])
+        if segment.index.ntotal == 0:
+            return [[] for _ in range(len(query_vectors))]
+        _, indices = segment.index.search(query_vectors, min(k, segment.index.ntotal))
+        return [[segment.documents[int(i)] for i in row if i != -1] for row in indices]
+
+    def search(self, query_vectors: np.ndarray, k: int, video_ids: Iterable[str] = None) -> List[List[Document]]:
+        """
+        Search the corpus, optionally restricted to some videos.
+
+        Args:
+            query_vectors: Float32 matrix of shape (num_queries, dim)
+            k: Number of documents to return per query
+            video_ids: Videos to search; all videos when None
+
+        Returns:
+            One list of documents per query, nearest first
+        """
+        query_vectors = np.ascontiguousarray(query_vectors, dtype=np.float32).reshape(-1, query_vectors.shape[-1])
+        empty = [[] for _ in range(len(query_vectors))]
+        if video_ids is not None:
+            video_ids = list(dict.fromkeys(video_ids))
+            if len(video_ids) == 1:
+                segment = self.segment(video_ids[0])
+                return self.search_segment(segment, query_vectors, k) if segment is not None else empty
+
+        self._sync()
+        with self._shared_lock.reading():
+            if self.shared is None or self.shared.ntotal == 0:
+                return empty
+            params = None
+            if video_ids is not None:
+                slots = [self.slots[v] for v in video_ids if v in self.slots]
+                if not slots:
+                    return empty
+                params = faiss.SearchParameters(sel=self._selector(slots))
+            _, ids = self.shared.search(query_vectors, k, params=params)
+
+        documents: Dict[str, Optional[List[Document]]] = {}
+        results = []
+        for row in ids:
+            docs = []
+            for shared_id in row:
+                if shared_id == -1:
+                    continue
+                video_id = self.slot_videos.get(int(shared_id) >> ROW_BITS)
+                if video_id is None:
+                    continue
+                if video_id not in documents:
+                    documents[video_id] = self._documents(video_id)
+                video_docs = documents[video_id]
+                position = int(shared_id) & ((1 << ROW_BITS) - 1)
+                if video_docs is not None and position < len(video_docs):
+                    docs.append(video_docs[position])
+            results.append(docs)
+        return results
+
+    @staticmethod
+    def _selector(slots: List[int]) -> faiss.IDSelector:
+        selector = None
+        for slot in slots:
+            slot_range = faiss.IDSelectorRange(slot << ROW_BITS, (slot + 1) << ROW_BITS)
+            if selector is None:
+                selector = slot_range
+            else:
+                selector = faiss.IDSelectorOr(selector, slot_range)
+        return selector
+
+    def nbytes(self) -> int:
+        """Estimated memory held by the shared index and the resident segments."""
+        with self._shared_lock.reading():
+            shared_bytes = index_bytes(self.shared) if self.shared is not None else 0
+        return shared_bytes + self.segments.current_bytes
+
+    def stats(self) -> dict:
+        self._sync()
+        with self._shared_lock.reading():
+            vectors = self.shared.ntotal if self.shared is not None else 0
+            shared_bytes = index_bytes(self.shared) if self.shared is not None else 0
+        return {
+            "videos": len(self.slots),
+            "vectors": vectors,
+            "shared_bytes": shared_bytes,
+            "segments": self.segments.stats(),
+        }
+
+    def load(self) -> bool:
+        """Load saved segments into the shared index. Returns False if there are none."""
+        self._sync()
+        logger.info("Corpus index loaded %s saved videos from '%s'", len(self.slots), self.path)
+        return bool(self.slots)
+
+    def _sync(self) -> None:
+        """Fold in segments other workers added, replaced or removed since the last check."""
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime_ns == self._dir_mtime_ns:
+            return
+        # Recorded before listing, so a change made meanwhile is picked up next time
+        self._dir_mtime_ns = mtime_ns
+        suffix = f"-{self.setup_key}{SEGMENT_SUFFIX}"
+        video_ids = {name[:-len(suffix)] for name in os.listdir(self.path) if name.endswith(suffix)}
+        for video_id in set(self.files) - video_ids:
+            self._forget(video_id)
+        for video_id in video_ids:
+            self._entry(video_id)
+
+    def _entry(self, video_id: str) -> Optional[_SegmentFile]:
+        """The video's saved segment, re-read if another process replaced or removed it."""
+        try:
+            mtime_ns = os.stat(self._file(video_id)).st_mtime_ns
+        except FileNotFoundError:
+            self._forget(video_id)
+            return None
+        entry = self.files.get(video_id)
+        if entry is not None and entry.mtime_ns == mtime_ns:
+            return entry
+        try:
+            version, _, _, vectors = self._read(video_id)
+        except Exception as e:
+            logger.warning("Skipping unreadable corpus segment for video_id=%s: %s", video_id, e)
+            return None
+        self._share(video_id, vectors.astype(np.float32))
+        entry = _SegmentFile(version=version, mtime_ns=mtime_ns)
+        with self._lock:
+            self.files[video_id] = entry
+            self.segments.pop(video_id)
+        return entry
+
+    def _documents(self, video_id: str) -> Optional[List[Document]]:
+        """A video's chunks, from its resident segment or its file, without filling the LRU."""
+        segment = self.segments.peek(video_id)
+        if segment is not None:
+            return segment.documents
+        try:
+            return self._read(video_id, with_index=False)[1]
+        except Exception as e:
+            logger.warning("Skipping unreadable corpus segment for video_id=%s: %s", video_id, e)
+            return None
+
+    def _share(self, video_id: str, vectors: np.ndarray) -> None:
+        """Put a video's vectors in the shared index, replacing any it had."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._shared_lock.writing():
+            self._unshare(video_id)
+            if self.shared is None:
+                self.shared = self._new_shared(vectors.shape[1])
+            slot = self._next_slot
+            self._next_slot += 1
+            self.shared.add_with_ids(vectors, (slot << ROW_BITS) + np.arange(len(vectors), dtype=np.int64))
+            self.slots[video_id] = slot
+            self.slot_videos[slot] = video_id
+
+    def _unshare(self, video_id: str) -> None:
+        """Drop a video's vectors from the shared index; the caller holds the write lock."""
+        slot = self.slots.pop(video_id, None)
+        if slot is None:
+            return
+        del self.slot_videos[slot]
+        self.shared.remove_ids(faiss.IDSelectorRange(slot << ROW_BITS, (slot + 1) << ROW_BITS))
+
+    def _new_shared(self, dim: int) -> faiss.IndexIDMap2:
+        # Videos arrive one at a time, so the shared index must not need training
+        if self.quantization == "none":
+            return faiss.IndexIDMap2(faiss.IndexFlatL2(dim))
+        return faiss.IndexIDMap2(faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_L2))
+
+    def _read(self, video_id: str, with_index: bool = True):
+        """Read a segment file as (version, documents, index data, float16 vectors)."""
+        with open(self._file(video_id), "rb") as f:
+            version = pickle.load(f)
+            documents = pickle.load(f)
+            index_data, vectors = pickle.load(f) if with_index else (None, None)
+        return version, documents, index_data, vectors
+
+    def _write(self, video_id: str, segment: _Segment, vectors: np.ndarray) -> int:
+        """Save a segment atomically and return the file's modification time."""
+        fd, tmp_file = tempfile.mkstemp(dir=self.path, prefix=".tmp-", suffix=SEGMENT_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # Version and chunks come first so they can be read without the vectors
+                pickle.dump(segment.version, f)
+                pickle.dump(segment.documents, f)
+                pickle.dump((faiss.serialize_index(segment.index), vectors.astype(np.float16)), f)
+            mtime_ns = os.stat(tmp_file).st_mtime_ns
+            os.replace(tmp_file, self._file(video_id))
+        except Exception as e:
+            logger.error("Failed to save corpus segment for video_id=%s: %s", video_id, e)
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        return mtime_ns
+
+    def _forget(self, video_id: str) -> bool:
+        """Drop a video from memory and from the shared index."""
+        with self._lock:
+            self.segments.pop(video_id)
+            known = self.files.pop(video_id, None) is not None
+        if video_id in self.slots:
+            with self._shared_lock.writing():
+                self._unshare(video_id)
+        return known
+
+
+@dataclass(frozen=True)
+class CorpusVideo:
+    """
+    Handle for querying one video inside the corpus index.
+
+    With a ``segment``, the handle searches exactly that segment: no file
+    checks, no reload after LRU eviction, and the same version of the video
+    even after it is re-indexed. Without one, each search resolves the
+    video's current segment.
+    """
+
+    corpus: CorpusIndex
+    video_id: str
+    segment: Optional[_Segment] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.segment.version if self.segment is not None else self.corpus.version(self.video_id)
+
+    def search(self, query_vectors: np.ndarray, k: int) -> List[List[Document]]:
+        if self.segment is not None:
+            return CorpusIndex.search_segment(self.segment, query_vectors, k)
+        return self.corpus.search(query_vectors, k, video_ids=[self.video_id])
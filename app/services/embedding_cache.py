@@ -0,0 +1,123 @@
+"""
+Content-addressed on-disk cache of chunk embeddings.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from typing import List, Tuple
+
+import numpy as np
+from app.core.config import settings
+from app.core.logging_config import logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+VECTORS_FILE = "vectors.bin"
+INDEX_FILE = "index.sqlite3"
+
+
+class EmbeddingCache:
+    """
+    Maps hash(model name, chunk text) to a stored embedding.
+
+    Vectors live in one append-only matrix file read through a memory map;
+    a SQLite table maps each 20-byte content hash to its row. The same text
+    therefore embeds once per model, whichever video, transcript source or
+    chunk overlap produced it.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = None, dtype: str = None):
+        self.model_name = model_name
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.dir = os.path.join(cache_dir or settings.EMBEDDING_CACHE_DIR, slug)
+        self.dtype = np.dtype(dtype or settings.EMBEDDING_CACHE_DTYPE)
+        os.makedirs(self.dir, exist_ok=True)
+        self.vectors_path = os.path.join(self.dir, VECTORS_FILE)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.dir, INDEX_FILE), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS rows (hash BLOB PRIMARY KEY, row INTEGER NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        self.dim = int(row[0]) if row else None
+        self._matrix = None
+        logger.debug("EmbeddingCache initialized at '%s' (dtype=%s)", self.dir, self.dtype)
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha1(f"{self.model_name}\0{text}".encode("utf-8")).digest()
+
+    def lookup(self, texts: List[str]) -> Tuple[dict, List[int]]:
+        """
+        Find cached embeddings for texts.
+
+        Returns:
+            Mapping of text position to float32 vector for hits, and the
+            positions of texts that still need embedding
+        """
+        if self.dim is None:
+            return {}, list(range(len(texts)))
+
+        keys = [self.key(text) for text in texts]
+        with self._lock:
+            rows = {}
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows.update(self._conn.execute(
+                    f"SELECT hash, row FROM rows WHERE hash IN ({placeholders})", batch
+                ).fetchall())
+            matrix = self._matrix_view(max(rows.values(), default=-1) + 1)
+
+        found, missing = {}, []
+        for i, key in enumerate(keys):
+            row = rows.get(key)
+            if row is None:
+                missing.append(i)
+            else:
+                found[i] = matrix[row].astype(np.float32)
+        return found, missing
+
+    def store(self, texts: List[str], vectors: np.ndarray) -> None:
+        """Append embeddings for texts that are not cached yet."""
+        if len(texts) == 0:
+            return
+        keys = [self.key(text) for text in texts]
+        with self._lock, open(self.vectors_path, "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('dim', ?)", (str(self.dim),))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dim {vectors.shape[1]} does not match cached dim {self.dim}")
+
+            row_bytes = self.dim * self.dtype.itemsize
+            size = f.seek(0, os.SEEK_END)
+            first_row, partial = divmod(size, row_bytes)
+            if partial:
+                # An earlier append was cut short; drop its partial row so
+                # new rows land at the offsets recorded for them
+                logger.warning("Dropping %s trailing bytes from '%s'", partial, self.vectors_path)
+                f.truncate(first_row * row_bytes)
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+            f.flush()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO rows (hash, row) VALUES (?, ?)",
+                [(key, first_row + i) for i, key in enumerate(keys)],
+            )
+            self._conn.commit()
+        logger.debug("Cached %s embeddings for model='%s'", len(texts), self.model_name)
+
+    def _matrix_view(self, min_rows: int):
+        """Return a memory map covering at least ``min_rows`` rows."""
+        if self._matrix is None or self._matrix.shape[0] < min_rows:
+            rows = os.path.getsize(self.vectors_path) // (self.dim * self.dtype.itemsize)
+            self._matrix = np.memmap(self.vectors_path, dtype=self.dtype, mode="r", shape=(rows, self.dim))
+        return self._matrix
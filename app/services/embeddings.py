@@ -0,0 +1,99 @@
+"""
+LangChain-compatible FastEmbed embeddings with batching and caching.
+"""
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import stage_timer
+from app.services.embedding_cache import EmbeddingCache
+
+
+class FastEmbedEmbeddings(Embeddings):
+    """LangChain-compatible wrapper for FastEmbed."""
+
+    def __init__(
+        self,
+        model_name: str = "BAAI/bge-small-en",
+        batch_size: int = None,
+        parallel: Optional[int] = None,
+        parallel_min_docs: int = None,
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        logger.debug("Initializing FastEmbedEmbeddings with model='%s'", model_name)
+        from fastembed import TextEmbedding
+        self.model_name = model_name
+        self.model = TextEmbedding(model_name=model_name)
+        self.batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.parallel = parallel if parallel is not None else settings.EMBEDDING_PARALLEL
+        self.parallel_min_docs = parallel_min_docs or settings.EMBEDDING_PARALLEL_MIN_DOCS
+        self.cache = cache
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts into one contiguous float32 matrix.
+
+        When an embedding cache is attached, only texts it has not seen
+        before (deduplicated) are sent to the model.
+
+        Returns:
+            Array of shape (len(texts), dim), ready for FAISS
+        """
+        if self.cache is None:
+            return self._embed_model(texts)
+
+        found, missing = self.cache.lookup(texts)
+        logger.info("Embedding cache: %s hits, %s misses", len(found), len(missing))
+        if not missing:
+            return np.stack([found[i] for i in range(len(texts))])
+
+        unique_texts = list(dict.fromkeys(texts[i] for i in missing))
+        new_vectors = self._embed_model(unique_texts)
+        self.cache.store(unique_texts, new_vectors)
+        new_rows = {text: row for row, text in enumerate(unique_texts)}
+
+        vectors = np.empty((len(texts), new_vectors.shape[1]), dtype=np.float32)
+        for i, vector in found.items():
+            vectors[i] = vector
+        for i in missing:
+            vectors[i] = new_vectors[new_rows[texts[i]]]
+        return vectors
+
+    def _embed_model(self, texts: List[str], stage: str = "embedding") -> np.ndarray:
+        """
+        Run the model over texts into a preallocated float32 matrix.
+
+        Inputs with at least ``parallel_min_docs`` texts are embedded by
+        FastEmbed's data-parallel workers; smaller ones stay in-process,
+        where worker start-up would cost more than it saves.
+        """
+        logger.info("Embedding %s documents", len(texts))
+        parallel = self.parallel if len(texts) >= self.parallel_min_docs else None
+        vectors = None
+        with stage_timer(stage):
+            for i, vector in enumerate(self.model.embed(texts, batch_size=self.batch_size, parallel=parallel)):
+                if vectors is None:
+                    vectors = np.empty((len(texts), vector.shape[-1]), dtype=np.float32)
+                vectors[i] = vector
+        if vectors is None:
+            return np.empty((0, 0), dtype=np.float32)
+        logger.debug("Generated embeddings for %s documents", len(texts))
+        return vectors
+
+    def embed_documents(self, texts):
+        # Rows of one matrix: no per-vector copies
+        return list(self.embed_array(texts))
+
+    def embed_query(self, text):
+        logger.debug("Embedding query (chars=%d)", len(text))
+        with stage_timer("query_embedding"):
+            embedding = next(iter(self.model.embed([text], batch_size=1)))
+        logger.debug("Query embedding generated successfully")
+        return embedding
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """Embed many queries in one batch, bypassing the chunk cache."""
+        logger.info("Embedding %s queries in one batch", len(texts))
+        return self._embed_model(texts, stage="query_embedding")
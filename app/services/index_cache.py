@@ -0,0 +1,154 @@
+"""
+Disk-backed cache of built FAISS indexes, keyed per video and embedding setup.
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from typing import TYPE_CHECKING, Optional
+
+import faiss
+from app.core.config import settings
+from app.core.logging_config import logger
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from langchain_community.vectorstores import FAISS
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.pkl"
+META_FILE = "meta.json"
+
+
+class IndexCache:
+    """
+    Saves FAISS indexes plus their docstore under one directory per cache key.
+
+    The key covers everything that changes the index: the video ID, the
+    embedding model, the chunker and its parameters, and the index type and
+    quantization. Flat indexes are loaded
+    memory-mapped, so a hit costs a file open instead of a full read.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = None,
+        embedding_model: str = None,
+        chunk_size: int = None,
+        chunk_overlap: int = None,
+        chunker: str = None,
+        index_type: str = None,
+        quantization: str = None,
+    ):
+        self.cache_dir = cache_dir or settings.INDEX_CACHE_DIR
+        self.embedding_model = embedding_model or settings.EMBEDDING_MODEL
+        self.chunk_size = chunk_size or settings.CHUNK_SIZE
+        self.chunk_overlap = chunk_overlap if chunk_overlap is not None else settings.CHUNK_OVERLAP
+        self.chunker = chunker or settings.CHUNKER
+        self.index_type = index_type or settings.INDEX_TYPE
+        self.quantization = quantization or settings.INDEX_QUANTIZATION
+        os.makedirs(self.cache_dir, exist_ok=True)
+        logger.debug("IndexCache initialized at '%s'", self.cache_dir)
+
+    def key(self, video_id: str) -> str:
+        """Build the cache key for a video under the current embedding setup."""
+        raw = (
+            f"{video_id}|{self.embedding_model}|{self.chunker}|{self.chunk_size}|{self.chunk_overlap}|"
+            f"{self.index_type}|{self.quantization}"
+        )
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+        return f"{video_id}-{digest}"
+
+    def path(self, video_id: str) -> str:
+        return os.path.join(self.cache_dir, self.key(video_id))
+
+    def contains(self, video_id: str) -> bool:
+        return os.path.exists(os.path.join(self.path(video_id), META_FILE))
+
+    def load(self, video_id: str, embeddings: "Embeddings") -> Optional["FAISS"]:
+        """
+        Load a cached vector store for a video.
+
+        Args:
+            video_id: YouTube video ID
+            embeddings: Embedding function attached to the loaded store
+
+        Returns:
+            FAISS vector store, or None on a miss or unreadable entry
+        """
+        folder = self.path(video_id)
+        if not os.path.exists(os.path.join(folder, META_FILE)):
+            logger.debug("Index cache miss for video_id=%s", video_id)
+            return None
+
+        try:
+            index = self._read_index(os.path.join(folder, INDEX_FILE))
+            with open(os.path.join(folder, DOCSTORE_FILE), "rb") as f:
+                docstore, index_to_docstore_id = pickle.load(f)
+        except Exception as e:
+            logger.warning("Discarding unreadable index cache entry for video_id=%s: %s", video_id, e)
+            shutil.rmtree(folder, ignore_errors=True)
+            return None
+
+        logger.info("Index cache hit for video_id=%s (%s vectors)", video_id, index.ntotal)
+        from langchain_community.vectorstores import FAISS
+        return FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id,
+        )
+
+    def save(self, video_id: str, vectorstore: "FAISS", **meta) -> None:
+        """
+        Persist a vector store for a video.
+
+        The entry is written to a temporary directory and renamed into place,
+        so concurrent readers never see a half-written index.
+        """
+        folder = self.path(video_id)
+        tmp_folder = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            faiss.write_index(vectorstore.index, os.path.join(tmp_folder, INDEX_FILE))
+            with open(os.path.join(tmp_folder, DOCSTORE_FILE), "wb") as f:
+                pickle.dump((vectorstore.docstore, vectorstore.index_to_docstore_id), f)
+            with open(os.path.join(tmp_folder, META_FILE), "w") as f:
+                json.dump({
+                    "video_id": video_id,
+                    "embedding_model": self.embedding_model,
+                    "chunk_size": self.chunk_size,
+                    "chunk_overlap": self.chunk_overlap,
+                    "chunker": self.chunker,
+                    "index_type": type(faiss.downcast_index(vectorstore.index)).__name__,
+                    "quantization": self.quantization,
+                    "num_vectors": vectorstore.index.ntotal,
+                    "created_at": time.time(),
+                    **meta,
+                }, f)
+
+            shutil.rmtree(folder, ignore_errors=True)
+            os.replace(tmp_folder, folder)
+            logger.info("Index cached for video_id=%s at '%s'", video_id, folder)
+        except Exception as e:
+            logger.error("Failed to cache index for video_id=%s: %s", video_id, e)
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    def read_meta(self, video_id: str) -> Optional[dict]:
+        """Return the metadata stored alongside a cached index, if any."""
+        try:
+            with open(os.path.join(self.path(video_id), META_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _read_index(path: str):
+        """Read an index memory-mapped when FAISS supports it for its type."""
+        mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+        try:
+            return faiss.read_index(path, mmap_flag)
+        except RuntimeError:
+            return faiss.read_index(path)
@@ -0,0 +1,130 @@
+"""
+FAISS index selection and vector quantization.
+"""
+import math
+
+import faiss
+import numpy as np
+from app.core.config import settings
+from app.core.logging_config import logger
+
+INDEX_TYPES = ("auto", "flat", "hnsw", "ivf")
+QUANTIZATIONS = ("none", "fp16", "int8", "pq")
+
+SCALAR_TYPES = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+# k-means wants about 39 training points per centroid; 8-bit PQ has 256
+PQ_MIN_TRAIN_VECTORS = 256 * 39
+IVF_POINTS_PER_LIST = 39
+
+
+def choose_index_type(num_vectors: int) -> str:
+    """
+    Pick an index type for a number of vectors.
+
+    Exact flat search is fastest below INDEX_HNSW_MIN_VECTORS; HNSW covers
+    the middle range and IVF takes over past INDEX_IVF_MIN_VECTORS, where
+    the graph's link memory and build time dominate.
+    """
+    if settings.INDEX_TYPE != "auto":
+        return settings.INDEX_TYPE
+    if num_vectors < settings.INDEX_HNSW_MIN_VECTORS:
+        return "flat"
+    if num_vectors < settings.INDEX_IVF_MIN_VECTORS:
+        return "hnsw"
+    return "ivf"
+
+
+def pq_subquantizers(dim: int, requested: int = None) -> int:
+    """Largest number of PQ sub-quantizers up to ``requested`` that divides ``dim``."""
+    requested = min(requested or settings.INDEX_PQ_M, dim)
+    return next(m for m in range(requested, 0, -1) if dim % m == 0)
+
+
+def build_index(vectors: np.ndarray, index_type: str = None, quantization: str = None) -> faiss.Index:
+    """
+    Build, train and fill a FAISS index for a vector matrix.
+
+    Args:
+        vectors: Contiguous float32 matrix of shape (n, dim)
+        index_type: "flat", "hnsw", "ivf" or "auto" (default: INDEX_TYPE)
+        quantization: "none", "fp16", "int8" or "pq" (default: INDEX_QUANTIZATION)
+
+    Returns:
+        FAISS index holding all vectors, using L2 distance
+    """
+    num_vectors, dim = vectors.shape
+    index_type = index_type or settings.INDEX_TYPE
+    if index_type == "auto":
+        index_type = choose_index_type(num_vectors)
+    quantization = quantization or settings.INDEX_QUANTIZATION
+    if index_type not in INDEX_TYPES or quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unsupported index configuration: {index_type}/{quantization}")
+    if quantization == "pq" and num_vectors < PQ_MIN_TRAIN_VECTORS:
+        # Too few points to train 256 centroids per sub-quantizer
+        quantization = "int8"
+
+    if index_type == "flat":
+        index = _flat_index(dim, quantization)
+    elif index_type == "hnsw":
+        index = _hnsw_index(dim, quantization)
+    else:
+        index = _ivf_index(dim, quantization, num_vectors)
+
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    logger.debug("Built %s/%s index over %s vectors (%s bytes)", index_type, quantization, num_vectors, index_bytes(index))
+    return index
+
+
+def _flat_index(dim: int, quantization: str) -> faiss.Index:
+    if quantization == "none":
+        return faiss.IndexFlatL2(dim)
+    if quantization == "pq":
+        return faiss.IndexPQ(dim, pq_subquantizers(dim), 8)
+    return faiss.IndexScalarQuantizer(dim, SCALAR_TYPES[quantization], faiss.METRIC_L2)
+
+
+def _hnsw_index(dim: int, quantization: str) -> faiss.Index:
+    m = settings.INDEX_HNSW_M
+    if quantization == "none":
+        index = faiss.IndexHNSWFlat(dim, m)
+    elif quantization == "pq":
+        index = faiss.IndexHNSWPQ(dim, pq_subquantizers(dim), m)
+    else:
+        index = faiss.IndexHNSWSQ(dim, SCALAR_TYPES[quantization], m)
+    index.hnsw.efSearch = settings.INDEX_HNSW_EF_SEARCH
+    return index
+
+
+def _ivf_index(dim: int, quantization: str, num_vectors: int) -> faiss.Index:
+    nlist = max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // IVF_POINTS_PER_LIST))
+    coarse = faiss.IndexFlatL2(dim)
+    if quantization == "none":
+        index = faiss.IndexIVFFlat(coarse, dim, nlist)
+    elif quantization == "pq":
+        index = faiss.IndexIVFPQ(coarse, dim, nlist, pq_subquantizers(dim), 8)
+    else:
+        index = faiss.IndexIVFScalarQuantizer(coarse, dim, nlist, SCALAR_TYPES[quantization])
+    index.nprobe = min(settings.INDEX_IVF_NPROBE, nlist)
+    return index
+
+
+def index_bytes(index: faiss.Index) -> int:
+    """Estimate the memory held by a FAISS index, including codes and graph links."""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        links = index.hnsw.neighbors.size() * 4 + index.ntotal * 8
+        return index_bytes(index.storage) + links
+    if isinstance(index, faiss.IndexIVF):
+        # Inverted lists store a code plus an int64 id per vector
+        return index.ntotal * (index.code_size + 8) + index_bytes(index.quantizer)
+    if isinstance(index, faiss.IndexPQ):
+        return index.ntotal * index.code_size + index.pq.centroids.size() * 4
+    code_size = getattr(index, "code_size", None)
+    if code_size:
+        return index.ntotal * code_size
+    return index.ntotal * index.d * 4
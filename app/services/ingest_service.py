@@ -0,0 +1,158 @@
+"""
+Service for ingesting batches of videos ahead of time in the background.
+"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import LIMITER_REJECTED
+from app.services.rag_pipeline import RAGPipeline
+from app.utils.limiter import OverloadedError
+
+# Seconds a client rejected for a full ingest backlog is told to wait
+INGEST_RETRY_AFTER = 30.0
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass
+class VideoProgress:
+    """Ingestion progress of a single video within a job."""
+
+    video_url: str
+    status: str = PENDING
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+@dataclass
+class IngestJob:
+    """A batch of videos submitted together."""
+
+    job_id: str
+    videos: List[VideoProgress]
+    created_at: float = field(default_factory=time.time)
+    task: Optional[asyncio.Task] = None
+
+    def count(self, status: str) -> int:
+        return sum(1 for video in self.videos if video.status == status)
+
+    @property
+    def status(self) -> str:
+        if any(video.status in (PENDING, RUNNING) for video in self.videos):
+            return RUNNING if any(video.status != PENDING for video in self.videos) else PENDING
+        return FAILED if self.count(FAILED) == len(self.videos) else COMPLETED
+
+
+class IngestService:
+    """
+    Runs transcript fetch, chunking, embedding and index persistence for
+    submitted videos on a background worker pool.
+
+    Concurrency is bounded across all jobs, and finished jobs are kept for
+    status queries until ``max_jobs`` newer ones push them out. New jobs
+    are rejected while ``max_active_jobs`` are running or
+    ``max_pending_videos`` videos have not finished, so the backlog of
+    fetches and scrapes stays bounded.
+    """
+
+    def __init__(
+        self,
+        pipeline: RAGPipeline,
+        max_concurrency: int = None,
+        max_jobs: int = None,
+        max_active_jobs: int = None,
+        max_pending_videos: int = None,
+    ):
+        self.pipeline = pipeline
+        self.max_concurrency = max_concurrency or settings.INGEST_CONCURRENCY
+        self.max_jobs = max_jobs or settings.INGEST_MAX_JOBS
+        self.max_active_jobs = max_active_jobs or settings.INGEST_MAX_ACTIVE_JOBS
+        self.max_pending_videos = max_pending_videos or settings.INGEST_MAX_PENDING_VIDEOS
+        self.jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._semaphore = None
+
+    def submit(self, video_urls: List[str]) -> IngestJob:
+        """
+        Start ingesting a batch of videos in the background.
+
+        Must be called from within the running event loop.
+
+        Args:
+            video_urls: YouTube video URLs or IDs
+
+        Returns:
+            The created job
+
+        Raises:
+            OverloadedError: Too many jobs are running or videos pending
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        unique_urls = list(dict.fromkeys(video_urls))
+        active = [job for job in self.jobs.values() if not job.task.done()]
+        if len(active) >= self.max_active_jobs:
+            LIMITER_REJECTED.labels("ingest", "jobs_full").inc()
+            raise OverloadedError(f"ingest: {len(active)} jobs already running", retry_after=INGEST_RETRY_AFTER)
+        pending = sum(job.count(PENDING) + job.count(RUNNING) for job in active)
+        if pending + len(unique_urls) > self.max_pending_videos:
+            LIMITER_REJECTED.labels("ingest", "videos_full").inc()
+            raise OverloadedError(f"ingest: {pending} videos already pending", retry_after=INGEST_RETRY_AFTER)
+
+        job = IngestJob(job_id=uuid.uuid4().hex, videos=[VideoProgress(url) for url in unique_urls])
+        job.task = asyncio.create_task(self._run(job))
+        self.jobs[job.job_id] = job
+        self._prune()
+        logger.info("Ingest job %s submitted with %s videos", job.job_id, len(job.videos))
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self.jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        """Cancel jobs that are still running."""
+        for job in self.jobs.values():
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+
+    async def _run(self, job: IngestJob) -> None:
+        await asyncio.gather(*(self._ingest_video(video) for video in job.videos))
+        logger.info(
+            "Ingest job %s finished: %s completed, %s failed", job.job_id, job.count(COMPLETED), job.count(FAILED)
+        )
+
+    async def _ingest_video(self, video: VideoProgress) -> None:
+        async with self._semaphore:
+            video.status = RUNNING
+            video.started_at = time.time()
+            try:
+                await self.pipeline.get_vectorstore(video.video_url)
+                video.status = COMPLETED
+            except HTTPException as e:
+                video.status = FAILED
+                video.error = str(e.detail)
+            except Exception as e:
+                logger.error("Ingest failed for video_url=%s: %s", video.video_url, e, exc_info=True)
+                video.status = FAILED
+                video.error = str(e)
+            finally:
+                video.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs once more than ``max_jobs`` are tracked."""
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            if self.jobs[job_id].task.done():
+                del self.jobs[job_id]
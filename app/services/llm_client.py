@@ -0,0 +1,212 @@
+"""
+Resilient chat model access: a shared keep-alive connection pool, a
+concurrency limit with a bounded wait queue, per-call timeouts and
+jittered retries on rate limits and server errors.
+"""
+import asyncio
+import random
+import time
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import LLM_RETRIES
+from app.utils.limiter import ConcurrencyLimiter
+
+
+def build_http_clients():
+    """
+    Build the sync and async HTTP clients shared by every LLM call.
+
+    Connections are kept alive between calls, so steady traffic does not
+    pay a TCP and TLS handshake per question.
+
+    Returns:
+        (httpx.Client, httpx.AsyncClient)
+    """
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=settings.LLM_POOL_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_POOL_CONNECTIONS,
+        keepalive_expiry=settings.LLM_POOL_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(settings.LLM_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT)
+    return httpx.Client(limits=limits, timeout=timeout), httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+def retry_reason(error: BaseException) -> Optional[str]:
+    """
+    Classify a failed call as retryable.
+
+    Returns:
+        "429", "5xx", "timeout" or "connection", or None if retrying
+        would not help (e.g. a 400 or an authentication error)
+    """
+    status = getattr(error, "status_code", None)
+    if status == 429:
+        return "429"
+    if isinstance(status, int) and status >= 500:
+        return "5xx"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    import httpx
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.TransportError):
+        return "connection"
+    try:
+        from groq import APIConnectionError, APITimeoutError
+    except ImportError:
+        return None
+    if isinstance(error, APITimeoutError):
+        return "timeout"
+    if isinstance(error, APIConnectionError):
+        return "connection"
+    return None
+
+
+def retry_delay(attempt: int, error: BaseException) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (0-based).
+
+    Full jitter over an exponential backoff, so clients that failed
+    together do not retry together; a Retry-After header from the provider
+    sets the minimum. Both are capped at LLM_RETRY_MAX_DELAY.
+    """
+    delay = random.uniform(0, settings.LLM_RETRY_BASE_DELAY * 2 ** attempt)
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        delay = max(delay, float(headers.get("retry-after", 0)))
+    except ValueError:
+        pass
+    return min(delay, settings.LLM_RETRY_MAX_DELAY)
+
+
+class ResilientChatModel:
+    """
+    Wraps a LangChain chat model with admission, timeouts and retries.
+
+    Every async call takes a slot from a shared ConcurrencyLimiter (named
+    "llm"), so at most LLM_MAX_IN_FLIGHT generations run at once and at
+    most LLM_MAX_QUEUE wait; beyond that callers get OverloadedError
+    instead of piling up. Each attempt is bounded by LLM_TIMEOUT, and
+    429s, 5xx responses, timeouts and connection errors are retried up to
+    LLM_MAX_RETRIES times. The slot is released while backing off.
+
+    Streams are bounded by LLM_FIRST_CHUNK_TIMEOUT until their first chunk
+    and by LLM_STREAM_TIMEOUT overall, and are only retried if they failed
+    before their first chunk. A background task reads the stream into a
+    buffer, so the slot is held for as long as the model generates, not
+    for as long as the caller takes to consume the chunks.
+    """
+
+    def __init__(
+        self,
+        llm,
+        limiter: ConcurrencyLimiter = None,
+        timeout: float = None,
+        max_retries: int = None,
+        first_chunk_timeout: float = None,
+        stream_timeout: float = None,
+    ):
+        self.llm = llm
+        self.limiter = limiter or ConcurrencyLimiter(
+            "llm",
+            max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+            max_waiting=settings.LLM_MAX_QUEUE,
+            wait_timeout=settings.LLM_QUEUE_TIMEOUT,
+        )
+        self.timeout = timeout if timeout is not None else settings.LLM_TIMEOUT
+        self.max_retries = max_retries if max_retries is not None else settings.LLM_MAX_RETRIES
+        self.first_chunk_timeout = (
+            first_chunk_timeout if first_chunk_timeout is not None else settings.LLM_FIRST_CHUNK_TIMEOUT
+        )
+        self.stream_timeout = stream_timeout if stream_timeout is not None else settings.LLM_STREAM_TIMEOUT
+
+    def _should_retry(self, attempt: int, error: BaseException) -> Optional[float]:
+        """Backoff before the next attempt, or None to give up."""
+        reason = retry_reason(error)
+        if reason is None or attempt >= self.max_retries:
+            return None
+        LLM_RETRIES.labels(reason).inc()
+        delay = retry_delay(attempt, error)
+        logger.warning(
+            "LLM call failed (%s: %s), retry %d/%d in %.2fs",
+            reason, error, attempt + 1, self.max_retries, delay,
+        )
+        return delay
+
+    async def ainvoke(self, prompt):
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.limiter.slot():
+                    return await asyncio.wait_for(self.llm.ainvoke(prompt), self.timeout)
+            except Exception as e:
+                delay = self._should_retry(attempt, e)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+    async def astream(self, prompt):
+        buffer = asyncio.Queue()
+        producer = asyncio.create_task(self._fill(prompt, buffer))
+        try:
+            while True:
+                kind, item = await buffer.get()
+                if kind == "chunk":
+                    yield item
+                elif kind == "error":
+                    raise item
+                else:
+                    return
+        finally:
+            # The caller stopped early (e.g. the client disconnected)
+            producer.cancel()
+
+    async def _fill(self, prompt, buffer: asyncio.Queue) -> None:
+        """Read the stream into ``buffer``, ending with ("done", None) or ("error", exc)."""
+        try:
+            async for chunk in self._stream(prompt):
+                buffer.put_nowait(("chunk", chunk))
+        except Exception as e:
+            buffer.put_nowait(("error", e))
+        else:
+            buffer.put_nowait(("done", None))
+
+    async def _stream(self, prompt):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            started = False
+            try:
+                async with self.limiter.slot():
+                    deadline = loop.time() + self.stream_timeout
+                    chunks = self.llm.astream(prompt).__aiter__()
+                    while True:
+                        remaining = deadline - loop.time()
+                        if not started:
+                            remaining = min(remaining, self.first_chunk_timeout)
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError()
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), remaining)
+                        except StopAsyncIteration:
+                            return
+                        started = True
+                        yield chunk
+            except Exception as e:
+                delay = None if started else self._should_retry(attempt, e)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+    def invoke(self, prompt):
+        """Blocking call with the same retry policy; not subject to the limiter."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.llm.invoke(prompt)
+            except Exception as e:
+                delay = self._should_retry(attempt, e)
+                if delay is None:
+                    raise
+            time.sleep(delay)
@@ -1,23 +1,47 @@
 """
 Service for LLM interaction and answer generation.
 """
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+from typing import AsyncIterator, List
+from langchain_core.documents import Document
 from app.core.config import settings
-from langchain_groq import ChatGroq
 from app.core.logging_config import logger
+from app.core.metrics import stage_timer
+from app.services.context_builder import ContextBuilder
+from app.services.llm_client import ResilientChatModel, build_http_clients
 
 
 class LLMService:
     """Handles LLM-based question answering."""
     
-    def __init__(self):
+    def __init__(self, llm=None):
+        """
+        Args:
+            llm: Chat model to use instead of Groq (benchmarks pass a local
+                stand-in); needs invoke, ainvoke and astream. Either way it
+                is wrapped in a ResilientChatModel
+        """
         logger.debug("Initializing LLMService...")
-        self.llm = ChatGroq(
-            model=settings.LLM_MODEL,
-            api_key=settings.GROQ_API_KEY
-        )
-        logger.info(f"LLM initialized with model='{settings.LLM_MODEL}'")
+        # LangChain's prompt stack and the Groq client are heavy to import,
+        # so they load when the service is built rather than with the app
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_core.prompts import PromptTemplate
+
+        self.http_client = self.http_async_client = None
+        if llm is None:
+            from langchain_groq import ChatGroq
+            self.http_client, self.http_async_client = build_http_clients()
+            # Retries are handled by ResilientChatModel, with jitter and metrics
+            llm = ChatGroq(
+                model=settings.LLM_MODEL,
+                api_key=settings.GROQ_API_KEY,
+                base_url=settings.GROQ_BASE_URL or None,
+                timeout=settings.LLM_TIMEOUT,
+                max_retries=0,
+                http_client=self.http_client,
+                http_async_client=self.http_async_client,
+            )
+            logger.info("LLM initialized with model='%s'", settings.LLM_MODEL)
+        self.llm = ResilientChatModel(llm)
 
         self.prompt_template = PromptTemplate(
             template="""You are a helpful assistant.
@@ -27,15 +51,40 @@ If the context is insufficient, just say "I don't know based on the video conten
 Context:
 {context}
 
-Question: {question}
+{history}Question: {question}
 
 Answer:""",
-            input_variables=['context', 'question']
+            input_variables=['context', 'history', 'question']
         )
         logger.debug("Prompt template configured")
 
         self.parser = StrOutputParser()
         logger.debug("Output parser initialized")
+
+        self.context_builder = ContextBuilder()
+        logger.debug("Context token budget set to %s", self.context_builder.token_budget)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections."""
+        if self.http_async_client is not None:
+            await self.http_async_client.aclose()
+            self.http_client.close()
+
+    def build_context(self, documents) -> List[Document]:
+        """
+        Select the retrieved documents that go into the prompt.
+
+        Overlapping or adjacent chunks are merged, redundant ones dropped,
+        and the rest kept in relevance order until the token budget is used.
+
+        Args:
+            documents: Retrieved documents, most relevant first
+
+        Returns:
+            Context documents in transcript order
+        """
+        with stage_timer("context_build"):
+            return self.context_builder.build(documents)
     
     def format_documents(self, documents) -> str:
         """
@@ -47,39 +96,116 @@ Answer:""",
         Returns:
             Formatted context string
         """
-        logger.info(f"Formatting {len(documents)} retrieved documents into context string")
+        logger.info("Formatting %s retrieved documents into context string", len(documents))
         formatted_context = "\n\n".join(doc.page_content for doc in documents)
-        logger.debug(f"Formatted context length={len(formatted_context)} characters")
+        logger.debug("Formatted context length=%s characters", len(formatted_context))
         return formatted_context
     
-    def generate_answer(self, context: str, question: str) -> str:
+    def format_history(self, turns) -> str:
+        """
+        Format earlier turns of a conversation for the prompt.
+
+        Args:
+            turns: Earlier turns, oldest first, each with question and answer
+
+        Returns:
+            History section ending in a blank line, or "" without turns
+        """
+        if not turns:
+            return ""
+        lines = ["Conversation so far:"]
+        for turn in turns:
+            lines.append(f"User: {turn.question}")
+            lines.append(f"Assistant: {turn.answer}")
+        return "\n".join(lines) + "\n\n"
+
+    def generate_answer(self, context: str, question: str, history: str = "") -> str:
         """
         Generate an answer using the LLM.
         
         Args:
             context: Context text from retrieved documents
             question: User's question
+            history: Earlier turns from ``format_history``, if any
         
         Returns:
             Generated answer
         """
-        logger.info(f"Generating answer for question='{question}'")
+        logger.info("Generating answer (question_chars=%d)", len(question))
         
         # Create prompt with context and question
         final_prompt = self.prompt_template.invoke({
             'context': context,
+            'history': history,
             'question': question
         })
         logger.debug("Prompt constructed and passed to LLM")
 
         try:
             # Generate answer from LLM
-            response = self.llm.invoke(final_prompt)
+            with stage_timer("llm_generation"):
+                response = self.llm.invoke(final_prompt)
             logger.info("LLM response received successfully")
-            logger.debug(f"Raw LLM response length={len(response.content)} characters")
+            logger.debug("Raw LLM response length=%s characters", len(response.content))
             
             # Parse and return answer content
             return response.content
         except Exception as e:
-            logger.error(f"Error during LLM answer generation: {e}", exc_info=True)
+            logger.error("Error during LLM answer generation: %s", e, exc_info=True)
             raise
+
+    async def agenerate_answer(self, context: str, question: str, history: str = "") -> str:
+        """
+        Generate an answer using the LLM without blocking the event loop.
+        
+        Args:
+            context: Context text from retrieved documents
+            question: User's question
+            history: Earlier turns from ``format_history``, if any
+        
+        Returns:
+            Generated answer
+        """
+        logger.info("Generating answer (async, question_chars=%d)", len(question))
+        
+        final_prompt = self.prompt_template.invoke({
+            'context': context,
+            'history': history,
+            'question': question
+        })
+
+        try:
+            with stage_timer("llm_generation"):
+                response = await self.llm.ainvoke(final_prompt)
+            logger.info("LLM response received successfully")
+            logger.debug("Raw LLM response length=%s characters", len(response.content))
+            return response.content
+        except Exception as e:
+            logger.error("Error during LLM answer generation: %s", e, exc_info=True)
+            raise
+
+    async def astream_answer(self, context: str, question: str, history: str = "") -> AsyncIterator[str]:
+        """
+        Stream an answer from the LLM as it is generated.
+        
+        Args:
+            context: Context text from retrieved documents
+            question: User's question
+            history: Earlier turns from ``format_history``, if any
+        
+        Yields:
+            Answer text fragments in generation order
+        """
+        logger.info("Streaming answer (question_chars=%d)", len(question))
+        
+        final_prompt = self.prompt_template.invoke({
+            'context': context,
+            'history': history,
+            'question': question
+        })
+
+        with stage_timer("llm_generation"):
+            async for chunk in self.llm.astream(final_prompt):
+                if chunk.content:
+                    yield chunk.content
+        logger.info("LLM stream completed")
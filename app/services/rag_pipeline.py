@@ -0,0 +1,59 @@
+"""
+Service that resolves a video to a ready-to-query vector store.
+"""
+from app.core.executors import run_cpu_bound, run_io_bound
+from app.services.transcript_service import TranscriptService
+from app.services.vectorstore_service import VectorStoreService, VideoIndex
+from app.utils.helpers import extract_video_id_from_url
+from app.utils.singleflight import SingleFlight
+from app.core.logging_config import logger
+
+
+class RAGPipeline:
+    """
+    Loads or builds the vector store for a video.
+
+    Concurrent requests for the same video share one transcript fetch and
+    one index build instead of each starting their own. Blocking steps run
+    in the bounded executors so the event loop stays responsive.
+    """
+
+    def __init__(self, transcript_service: TranscriptService, vectorstore_service: VectorStoreService):
+        self.transcript_service = transcript_service
+        self.vectorstore_service = vectorstore_service
+        self.singleflight = SingleFlight()
+
+    async def get_vectorstore(self, video_url: str) -> VideoIndex:
+        """
+        Get the vector store for a video, building it if needed.
+
+        Args:
+            video_url: YouTube video URL or ID
+
+        Returns:
+            The video's index (its FAISS store or corpus segment)
+        """
+        video_id = extract_video_id_from_url(video_url)
+        return await self.singleflight.do(
+            video_id or video_url,
+            lambda: self._resolve(video_url, video_id),
+        )
+
+    async def _resolve(self, video_url: str, video_id: str) -> VideoIndex:
+        # Step 1 & 2: Load cached vector store, or fetch transcript and build one
+        vectorstore = await run_io_bound(self.vectorstore_service.load_vectorstore, video_id)
+        if vectorstore is not None:
+            logger.info("Steps 1-2 skipped: Vector store loaded from cache")
+            return vectorstore
+
+        transcript = await run_io_bound(self.transcript_service.fetch_segments, video_url)
+        logger.info(
+            "Step 1 completed: Transcript fetched (%s segments, length=%s characters)",
+            len(transcript), len(transcript.text),
+        )
+
+        vectorstore = await run_cpu_bound(
+            self.vectorstore_service.create_vectorstore, transcript, video_id=video_id
+        )
+        logger.info("Step 2 completed: Vector store created")
+        return vectorstore
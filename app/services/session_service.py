@@ -0,0 +1,216 @@
+"""
+Service for conversation sessions that pin a video's retrieval state.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.executors import run_cpu_bound
+from app.core.logging_config import logger
+from app.core.metrics import SESSION_EVICTIONS, SESSION_RETRIEVALS, SESSIONS_ACTIVE
+from app.services.corpus_index import CorpusVideo
+from app.services.rag_pipeline import RAGPipeline
+from app.services.vectorstore_service import VideoIndex
+from app.utils.helpers import extract_video_id_from_url
+
+
+@dataclass
+class Turn:
+    """One question and its answer."""
+
+    question: str
+    answer: str
+
+
+@dataclass
+class ChatSession:
+    """A conversation about one video."""
+
+    session_id: str
+    video_url: str
+    video_id: Optional[str]
+    vectorstore: VideoIndex
+    version: Optional[str]
+    turns: Deque[Turn]
+    # Normalized question -> (question vector, retrieved documents)
+    retrieved: "OrderedDict[str, Tuple[object, list]]" = field(default_factory=OrderedDict)
+    created_at: float = field(default_factory=time.time)
+    last_used: float = 0.0
+
+
+class SessionService:
+    """
+    Keeps conversation sessions in memory.
+
+    A session resolves its video's index once, when it is created, so
+    follow-up questions go straight to embedding and retrieval. It also
+    remembers its most recent turns, which are passed to the LLM as
+    history, and the chunks retrieved for recent questions, so a repeated
+    question skips embedding and search too.
+
+    Sessions unused for ``idle_timeout`` seconds are dropped on the next
+    access, and at most ``max_sessions`` are kept (least recently used
+    dropped first). A session holds a reference to its index (in corpus
+    mode, to the video's segment itself), so the index stays alive while
+    the session does, even after the resident LRU evicts it, and follow-ups
+    keep searching it without touching disk. If the video is re-indexed
+    meanwhile, the session goes on answering from the version it started
+    with and stops using the answer cache.
+    """
+
+    def __init__(
+        self,
+        pipeline: RAGPipeline,
+        idle_timeout: float = None,
+        max_sessions: int = None,
+        max_turns: int = None,
+        retrieval_cache_size: int = None,
+        clock=time.monotonic,
+    ):
+        self.pipeline = pipeline
+        self.vectorstore_service = pipeline.vectorstore_service
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.SESSION_IDLE_TIMEOUT
+        self.max_sessions = max_sessions or settings.SESSION_MAX_SESSIONS
+        self.max_turns = max_turns if max_turns is not None else settings.SESSION_MAX_TURNS
+        self.retrieval_cache_size = (
+            retrieval_cache_size if retrieval_cache_size is not None else settings.SESSION_RETRIEVAL_CACHE_SIZE
+        )
+        self.clock = clock
+        self.sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def create(self, video_url: str) -> ChatSession:
+        """
+        Start a session, loading or building the video's index.
+
+        Args:
+            video_url: YouTube video URL or ID
+
+        Returns:
+            The new session
+        """
+        vectorstore = await self.pipeline.get_vectorstore(video_url)
+        video_id = extract_video_id_from_url(video_url)
+        if isinstance(vectorstore, CorpusVideo):
+            # The handle is pinned to one segment, so its version is exact
+            version = vectorstore.version
+        else:
+            version = self.vectorstore_service.index_version(video_id) if video_id else None
+        session = ChatSession(
+            session_id=uuid.uuid4().hex,
+            video_url=video_url,
+            video_id=video_id,
+            vectorstore=vectorstore,
+            version=version,
+            turns=deque(maxlen=self.max_turns),
+            last_used=self.clock(),
+        )
+        with self._lock:
+            self._evict_idle()
+            self.sessions[session.session_id] = session
+            SESSIONS_ACTIVE.inc()
+            while len(self.sessions) > self.max_sessions:
+                self._drop(next(iter(self.sessions)), "capacity")
+        logger.info("Session %s created for video_id=%s", session.session_id, video_id)
+        return session
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """Return a live session and mark it used, or None if unknown or expired."""
+        with self._lock:
+            self._evict_idle()
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.last_used = self.clock()
+                self.sessions.move_to_end(session_id)
+            return session
+
+    def close(self, session_id: str) -> bool:
+        """End a session; returns False if it did not exist."""
+        with self._lock:
+            return self._drop(session_id, "closed")
+
+    def close_video(self, video_id: str) -> int:
+        """End every session about a video, e.g. after its index was removed."""
+        with self._lock:
+            session_ids = [sid for sid, session in self.sessions.items() if session.video_id == video_id]
+            for session_id in session_ids:
+                self._drop(session_id, "video_removed")
+        return len(session_ids)
+
+    async def retrieve(self, session: ChatSession, question: str):
+        """
+        Embed a question and retrieve chunks from the session's index.
+
+        Returns:
+            (question vector, retrieved documents), from the session's
+            chunk cache if the same question was asked recently
+        """
+        key = " ".join(question.lower().split())
+        cached = session.retrieved.get(key)
+        if cached is not None:
+            session.retrieved.move_to_end(key)
+            SESSION_RETRIEVALS.labels("hit").inc()
+            return cached
+
+        SESSION_RETRIEVALS.labels("miss").inc()
+        embedding_model = self.vectorstore_service.embedding_model
+        question_vector = await run_cpu_bound(embedding_model.embed_query, question)
+        docs = await run_cpu_bound(
+            self.vectorstore_service.retrieve_documents,
+            session.vectorstore,
+            question,
+            query_vector=question_vector,
+        )
+        if self.retrieval_cache_size > 0:
+            session.retrieved[key] = (question_vector, docs)
+            while len(session.retrieved) > self.retrieval_cache_size:
+                session.retrieved.popitem(last=False)
+        return question_vector, docs
+
+    def answer_version(self, session: ChatSession) -> Optional[str]:
+        """
+        Index version to use for the session's answer-cache entries.
+
+        A session keeps answering from the index it pinned at creation. Once
+        the video is re-indexed, that index no longer matches the cached
+        answers, so this returns None and the answer cache is skipped rather
+        than invalidated under the newer version.
+        """
+        if session.version is None or not session.video_id:
+            return None
+        if self.vectorstore_service.index_version(session.video_id) != session.version:
+            return None
+        return session.version
+
+    @staticmethod
+    def history(session: ChatSession) -> List[Turn]:
+        return list(session.turns)
+
+    @staticmethod
+    def record_turn(session: ChatSession, question: str, answer: str) -> None:
+        session.turns.append(Turn(question=question, answer=answer))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sessions": len(self.sessions), "max_sessions": self.max_sessions}
+
+    def _evict_idle(self) -> None:
+        """Drop sessions idle for longer than ``idle_timeout``; the caller holds the lock."""
+        deadline = self.clock() - self.idle_timeout
+        # Sessions are ordered by last use, so stop at the first fresh one
+        for session_id, session in list(self.sessions.items()):
+            if session.last_used > deadline:
+                break
+            self._drop(session_id, "idle")
+
+    def _drop(self, session_id: str, reason: str) -> bool:
+        if self.sessions.pop(session_id, None) is None:
+            return False
+        SESSIONS_ACTIVE.dec()
+        SESSION_EVICTIONS.labels(reason).inc()
+        logger.info("Session %s ended (%s)", session_id, reason)
+        return True
@@ -0,0 +1,165 @@
+"""
+Two-level transcript cache: an in-process LRU in front of a SQLite store.
+"""
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.services.transcript_segments import TranscriptSegments
+from app.utils.cache import LRUCache
+
+
+@dataclass
+class CachedTranscript:
+    """A cached transcript fetch result, successful or not."""
+
+    segments: Optional[TranscriptSegments]
+    error: Optional[str]
+    expires_at: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def text(self) -> Optional[str]:
+        return self.segments.text if self.segments is not None else None
+
+
+class TranscriptCache:
+    """
+    Caches transcript fetches, including failures.
+
+    Transcript segments are zlib-compressed on disk. Successful fetches
+    live for ``ttl`` seconds and failures for ``negative_ttl`` seconds, so a
+    video without a transcript does not hit YouTube and the scraper on
+    every retry. When the disk store grows past ``max_bytes`` the least recently
+    accessed rows are deleted.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        ttl: int = None,
+        negative_ttl: int = None,
+        max_bytes: int = None,
+        memory_bytes: int = None,
+    ):
+        self.path = path or settings.TRANSCRIPT_CACHE_PATH
+        self.ttl = ttl if ttl is not None else settings.TRANSCRIPT_CACHE_TTL
+        self.negative_ttl = negative_ttl if negative_ttl is not None else settings.TRANSCRIPT_CACHE_NEGATIVE_TTL
+        self.max_bytes = max_bytes or settings.TRANSCRIPT_CACHE_MAX_BYTES
+        self.memory = LRUCache(memory_bytes or settings.TRANSCRIPT_CACHE_MEMORY_BYTES)
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS transcript_segments (
+                key TEXT PRIMARY KEY,
+                data BLOB,
+                error TEXT,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_accessed ON transcript_segments (accessed_at)")
+        self._conn.commit()
+        logger.debug("TranscriptCache initialized at '%s'", self.path)
+
+    def get(self, key: str) -> Optional[CachedTranscript]:
+        """
+        Look up a cached fetch result.
+
+        Returns:
+            The cached entry, or None on a miss or expired entry
+        """
+        now = time.time()
+        entry = self.memory.get(key)
+        if entry is not None:
+            if entry.expires_at > now:
+                return entry
+            self.memory.pop(key)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, error, expires_at FROM transcript_segments WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            data, error, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM transcript_segments WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE transcript_segments SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        segments = TranscriptSegments.from_bytes(zlib.decompress(data)) if data is not None else None
+        entry = CachedTranscript(segments=segments, error=error, expires_at=expires_at)
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, segments: TranscriptSegments) -> None:
+        """Cache a successfully fetched transcript."""
+        entry = CachedTranscript(segments=segments, error=None, expires_at=time.time() + self.ttl)
+        self._store(key, entry, zlib.compress(segments.to_bytes()))
+
+    def put_failure(self, key: str, error: str) -> None:
+        """Cache a failed fetch so retries fail fast until it expires."""
+        entry = CachedTranscript(segments=None, error=error, expires_at=time.time() + self.negative_ttl)
+        self._store(key, entry, None)
+
+    def invalidate(self, key: str) -> None:
+        self.memory.pop(key)
+        with self._lock:
+            self._conn.execute("DELETE FROM transcript_segments WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _remember(self, key: str, entry: CachedTranscript) -> None:
+        size = len(entry.error or "")
+        if entry.segments is not None:
+            segments = entry.segments
+            size += len(segments.text) + segments.offsets.nbytes + segments.starts.nbytes + segments.durations.nbytes
+        self.memory.put(key, entry, size=size)
+
+    def _store(self, key: str, entry: CachedTranscript, data: Optional[bytes]) -> None:
+        self._remember(key, entry)
+        size = len(data or b"") + len(entry.error or "")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcript_segments (key, data, error, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, data, entry.error, size, entry.expires_at, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop expired rows, then least recently accessed rows over the byte budget."""
+        self._conn.execute("DELETE FROM transcript_segments WHERE expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcript_segments").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM transcript_segments ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM transcript_segments WHERE key = ?", (key,))
+            self.memory.pop(key)
+            total -= size
+            evicted += 1
+        logger.info("Transcript cache evicted %s entries to stay under %s bytes", evicted, self.max_bytes)
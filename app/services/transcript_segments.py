@@ -0,0 +1,135 @@
+"""
+Compact, array-backed representation of a timed transcript.
+"""
+import re
+import struct
+from typing import Iterable, List
+
+import numpy as np
+
+# Leading "[hh:]mm:ss[.fff]" timestamp on scraped transcript lines
+TIMESTAMP_PATTERN = re.compile(r"^\s*(?:(\d{1,2}):)?(\d{1,2}):(\d{2}(?:\.\d+)?)\s*[-–]?\s*")
+HEADER = struct.Struct("<II")
+
+
+class TranscriptSegments:
+    """
+    Transcript segments stored as one joined string plus parallel arrays.
+
+    ``text`` is the segments joined with single spaces. Segment ``i``
+    spans ``text[offsets[i]:offsets[i + 1] - 1]`` and starts at
+    ``starts[i]`` seconds for ``durations[i]`` seconds; timestamps are NaN
+    when the source did not provide them.
+    """
+
+    __slots__ = ("text", "offsets", "starts", "durations")
+
+    def __init__(self, text: str, offsets: np.ndarray, starts: np.ndarray, durations: np.ndarray):
+        self.text = text
+        self.offsets = offsets
+        self.starts = starts
+        self.durations = durations
+
+    @classmethod
+    def from_items(cls, items: Iterable[dict]) -> "TranscriptSegments":
+        """Build from YouTube transcript items with text, start and duration."""
+        texts, starts, durations = [], [], []
+        for item in items:
+            segment_text = " ".join(item["text"].split())
+            if not segment_text:
+                continue
+            texts.append(segment_text)
+            starts.append(item.get("start", np.nan))
+            durations.append(item.get("duration", np.nan))
+        return cls._build(texts, starts, durations)
+
+    @classmethod
+    def from_text(cls, text: str) -> "TranscriptSegments":
+        """
+        Build from scraped text, one segment per line.
+
+        Lines starting with a timestamp get it as their start time; each
+        segment's duration runs to the next timestamped line.
+        """
+        texts, starts = [], []
+        for line in text.splitlines():
+            match = TIMESTAMP_PATTERN.match(line)
+            start = np.nan
+            if match:
+                hours, minutes, seconds = match.groups()
+                start = int(hours or 0) * 3600 + int(minutes) * 60 + float(seconds)
+                line = line[match.end():]
+            segment_text = " ".join(line.split())
+            if segment_text:
+                texts.append(segment_text)
+                starts.append(start)
+            elif match and texts and np.isnan(starts[-1]):
+                starts[-1] = start
+
+        starts_array = np.asarray(starts, dtype=np.float32)
+        durations = np.full(len(starts), np.nan, dtype=np.float32)
+        if len(starts) > 1:
+            durations[:-1] = np.diff(starts_array)
+        return cls._build(texts, starts_array, durations)
+
+    @classmethod
+    def _build(cls, texts: List[str], starts, durations) -> "TranscriptSegments":
+        lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=len(texts))
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(
+            text=" ".join(texts),
+            offsets=offsets,
+            starts=np.asarray(starts, dtype=np.float32),
+            durations=np.asarray(durations, dtype=np.float32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def span_text(self, first: int, last: int) -> str:
+        """Text of segments ``first`` up to, not including, ``last``."""
+        return self.text[self.offsets[first]:self.offsets[last] - 1]
+
+    def span_times(self, first: int, last: int):
+        """(start, end) seconds of segments ``first`` to ``last - 1``, or Nones."""
+        start = self.starts[first]
+        end = self.starts[last - 1] + self.durations[last - 1]
+        return (
+            None if np.isnan(start) else float(start),
+            None if np.isnan(end) else float(end),
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary form."""
+        encoded = self.text.encode("utf-8")
+        return b"".join([
+            HEADER.pack(len(self), len(encoded)),
+            self.offsets.astype("<i8").tobytes(),
+            self.starts.astype("<f4").tobytes(),
+            self.durations.astype("<f4").tobytes(),
+            encoded,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TranscriptSegments":
+        count, text_length = HEADER.unpack_from(data)
+        position = HEADER.size
+        offsets = np.frombuffer(data, dtype="<i8", count=count + 1, offset=position)
+        position += offsets.nbytes
+        starts = np.frombuffer(data, dtype="<f4", count=count, offset=position)
+        position += starts.nbytes
+        durations = np.frombuffer(data, dtype="<f4", count=count, offset=position)
+        position += durations.nbytes
+        text = data[position:position + text_length].decode("utf-8")
+        return cls(text=text, offsets=offsets, starts=starts, durations=durations)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TranscriptSegments):
+            return NotImplemented
+        return (
+            self.text == other.text
+            and np.array_equal(self.offsets, other.offsets)
+            and np.array_equal(self.starts, other.starts, equal_nan=True)
+            and np.array_equal(self.durations, other.durations, equal_nan=True)
+        )
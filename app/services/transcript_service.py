@@ -2,49 +2,92 @@
 Service for fetching and processing YouTube transcripts with Selenium fallback.
 """
 import time
-from youtube_transcript_api import YouTubeTranscriptApi
 from fastapi import HTTPException
 from app.utils.helpers import extract_video_id_from_url
-
-# Selenium Imports
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from app.core.config import settings
 from app.core.logging_config import logger
+from app.core.metrics import record_transcript_fetch, stage_timer
+from app.services.browser_pool import ChromeDriverPool, BrowserPoolTimeout
+from app.services.transcript_cache import TranscriptCache
+from app.services.transcript_segments import TranscriptSegments
 
 
 class TranscriptService:
     def __init__(self):
-        pass
+        self.cache = TranscriptCache() if settings.TRANSCRIPT_CACHE_ENABLED else None
+        self.browser_pool = ChromeDriverPool()
+
+    def invalidate(self, video_id: str, languages: list = None) -> None:
+        """Forget a cached transcript so the next fetch goes to YouTube."""
+        if self.cache is not None:
+            self.cache.invalidate(f"{video_id}:{','.join(languages or ['en', 'hi', 'ur'])}")
 
     def fetch_transcript(self, video_url: str, languages: list = None) -> str:
+        return self.fetch_segments(video_url, languages).text
+
+    def fetch_segments(self, video_url: str, languages: list = None) -> TranscriptSegments:
+        """
+        Fetch a transcript with per-segment timestamps.
+
+        Args:
+            video_url: YouTube video URL or ID
+            languages: Preferred transcript languages, in order
+
+        Returns:
+            Transcript segments (timestamps are NaN for scraped text without them)
+        """
         if languages is None:
             languages = ['en', 'hi', 'ur']
         
         video_id = extract_video_id_from_url(video_url)
-        logger.info(f"Attempting API fetch for video_id={video_id}")
+        if self.cache is None or not video_id:
+            return self._fetch_uncached(video_url, video_id, languages)
+
+        cache_key = f"{video_id}:{','.join(languages)}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("Transcript cache hit for video_id=%s (ok=%s)", video_id, cached.ok)
+            record_transcript_fetch("cache", cached.ok)
+            if cached.ok:
+                return cached.segments
+            raise HTTPException(status_code=404, detail=cached.error)
+
+        try:
+            segments = self._fetch_uncached(video_url, video_id, languages)
+        except HTTPException as e:
+            if e.status_code == 404:
+                self.cache.put_failure(cache_key, e.detail)
+            raise
+        self.cache.put(cache_key, segments)
+        return segments
+
+    def _fetch_uncached(self, video_url: str, video_id: str, languages: list) -> TranscriptSegments:
+        logger.info("Attempting API fetch for video_id=%s", video_id)
 
         # --- OPTION 1: Try YouTube Transcript API ---
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
-            transcript = " ".join([item['text'] for item in transcript_list])
-            if transcript.strip():
+            from youtube_transcript_api import YouTubeTranscriptApi
+            with stage_timer("transcript_api"):
+                transcript_list = YouTubeTranscriptApi().fetch(video_id, languages=languages).to_raw_data()
+            segments = TranscriptSegments.from_items(transcript_list)
+            if segments.text.strip():
                 logger.info("Transcript successfully fetched via API")
-                return transcript
+                record_transcript_fetch("api", True)
+                return segments
         except Exception as e:
-            logger.warning(f"API fetch failed for video_id={video_id}. Error: {str(e)}. Switching to Selenium fallback.")
+            logger.warning("API fetch failed for video_id=%s. Error: %s. Switching to Selenium fallback.", video_id, e)
+        record_transcript_fetch("api", False)
 
         # --- OPTION 2: Fallback to Selenium Scraping ---
-        scraped_text = self._scrape_transcript_fallback(video_url)
+        with stage_timer("transcript_selenium"):
+            scraped_text = self._scrape_transcript_fallback(video_url)
         
         # Validation: Ensure we didn't just get headers or empty strings
-        if scraped_text and len(scraped_text) > 200:
+        ok = bool(scraped_text) and len(scraped_text) > 200
+        record_transcript_fetch("selenium", ok)
+        if ok:
             logger.info("Transcript successfully fetched via Selenium scraper")
-            return scraped_text
+            return TranscriptSegments.from_text(scraped_text)
         
         logger.error("Transcript unavailable. API failed and Scraper returned insufficient data.")
         raise HTTPException(
@@ -53,58 +96,57 @@ class TranscriptService:
         )
 
     def _scrape_transcript_fallback(self, youtube_url: str) -> str:
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")  # Uses the newer, more stable headless engine
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-        logger.debug("Chrome WebDriver initialized")
-
         try:
-            driver.get("https://tactiq.io/tools/youtube-transcript")
-            wait = WebDriverWait(driver, 30)
-            
-            # 1. Enter URL
-            input_field = wait.until(EC.element_to_be_clickable((By.ID, "yt-2")))
-            input_field.send_keys(youtube_url)
-            logger.debug("YouTube URL entered into transcript tool")
-
-            # 2. Submit
-            btn = driver.find_element(By.CSS_SELECTOR, "input[value='Get Video Transcript']")
-            driver.execute_script("arguments[0].click();", btn)  # JS click is more reliable
-            logger.debug("Transcript request submitted")
-
-            # 3. Wait for the 'Copy' button to signal completion
-            wait.until(EC.presence_of_element_located((By.ID, "copy")))
-            time.sleep(3)  # Essential: Wait for JS to finish rendering
-            logger.debug("Waited for transcript to render")
-
-            # 4. Extract transcript
-            transcript_result = ""
-            elements = driver.find_elements(By.CSS_SELECTOR, "[data-astro-cid-puhxsgk4]")
-            
-            if len(elements) > 5:
-                transcript_result = "\n".join([el.text for el in elements if len(el.text) > 2])
-            else:
-                try:
-                    anchor = driver.find_element(By.XPATH, "//*[contains(text(), '00:00')]")
-                    parent = anchor.find_element(By.XPATH, "./..")
-                    transcript_result = parent.text
-                except Exception:
-                    logger.warning("Fallback extraction failed; no timestamp anchor found")
-
-            logger.info(f"Transcript extracted with length={len(transcript_result)} characters")
-            return transcript_result.strip()
-
+            with self.browser_pool.driver() as driver:
+                return self._scrape_with_driver(driver, youtube_url)
+        except BrowserPoolTimeout as e:
+            logger.warning("Selenium scraper busy: %s", e)
+            raise HTTPException(
+                status_code=503,
+                detail="Transcript scraper is busy, please retry shortly."
+            )
         except Exception as e:
-            logger.error(f"Selenium scraper error: {e}")
+            # The pool recycles the driver when the scrape raises
+            logger.error("Selenium scraper error: %s", e)
             return ""
-        finally:
-            logger.debug("Closing Chrome WebDriver")
-            driver.quit()
+
+    def _scrape_with_driver(self, driver, youtube_url: str) -> str:
+        # Selenium is only needed once the fallback scraper runs
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        driver.get("https://tactiq.io/tools/youtube-transcript")
+        wait = WebDriverWait(driver, 30)
+        
+        # 1. Enter URL
+        input_field = wait.until(EC.element_to_be_clickable((By.ID, "yt-2")))
+        input_field.send_keys(youtube_url)
+        logger.debug("YouTube URL entered into transcript tool")
+
+        # 2. Submit
+        btn = driver.find_element(By.CSS_SELECTOR, "input[value='Get Video Transcript']")
+        driver.execute_script("arguments[0].click();", btn)  # JS click is more reliable
+        logger.debug("Transcript request submitted")
+
+        # 3. Wait for the 'Copy' button to signal completion
+        wait.until(EC.presence_of_element_located((By.ID, "copy")))
+        time.sleep(3)  # Essential: Wait for JS to finish rendering
+        logger.debug("Waited for transcript to render")
+
+        # 4. Extract transcript
+        transcript_result = ""
+        elements = driver.find_elements(By.CSS_SELECTOR, "[data-astro-cid-puhxsgk4]")
+        
+        if len(elements) > 5:
+            transcript_result = "\n".join([el.text for el in elements if len(el.text) > 2])
+        else:
+            try:
+                anchor = driver.find_element(By.XPATH, "//*[contains(text(), '00:00')]")
+                parent = anchor.find_element(By.XPATH, "./..")
+                transcript_result = parent.text
+            except Exception:
+                logger.warning("Fallback extraction failed; no timestamp anchor found")
+
+        logger.info("Transcript extracted with length=%s characters", len(transcript_result))
+        return transcript_result.strip()
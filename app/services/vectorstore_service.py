@@ -1,93 +1,336 @@
 """
 Service for creating and managing vector stores using FastEmbed + FAISS.
 """
+import hashlib
+import shutil
+import uuid
+from typing import TYPE_CHECKING, List, Optional, Union
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_core.embeddings import Embeddings
-from langchain_community.vectorstores import FAISS
-from fastembed import TextEmbedding
+import numpy as np
+from langchain_core.documents import Document
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.core.metrics import CHUNKS_PER_VIDEO, stage_timer
+from app.services.chunking import SegmentChunker
+from app.services.corpus_index import CorpusIndex, CorpusVideo
+from app.services.embedding_cache import EmbeddingCache
+from app.services.index_cache import IndexCache
+from app.services.index_factory import build_index, index_bytes
+from app.services.transcript_segments import TranscriptSegments
+from app.utils.cache import LRUCache
 
+# FastEmbed, LangChain's FAISS wrapper and the text splitter are imported
+# where first used, keeping them out of the app's cold-start import
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+    from langchain_community.vectorstores import FAISS
 
-class FastEmbedEmbeddings(Embeddings):
-    """LangChain-compatible wrapper for FastEmbed."""
+# A video's searchable index: its own FAISS store, or its segment of the corpus index
+VideoIndex = Union["FAISS", CorpusVideo]
 
-    def __init__(self, model_name: str = "BAAI/bge-small-en"):
-        logger.debug(f"Initializing FastEmbedEmbeddings with model='{model_name}'")
-        self.model = TextEmbedding(model_name=model_name)
+# Rough per-chunk overhead of a Document object and its docstore entry
+DOCUMENT_OVERHEAD_BYTES = 512
 
-    def embed_documents(self, texts):
-        logger.info(f"Embedding {len(texts)} documents")
-        # FastEmbed returns a generator, so convert to list
-        embeddings = list(self.model.embed(texts))
-        logger.debug(f"Generated embeddings for {len(embeddings)} documents")
-        return embeddings
 
-    def embed_query(self, text):
-        logger.info(f"Embedding query: '{text[:50]}...' (truncated for log)")
-        embedding = list(self.model.embed([text]))[0]
-        logger.debug("Query embedding generated successfully")
-        return embedding
+def estimate_vectorstore_bytes(vectorstore: "FAISS") -> int:
+    """Estimate the resident size of a FAISS vector store in bytes."""
+    vector_bytes = index_bytes(vectorstore.index)
+    text_bytes = 0
+    for doc_id in vectorstore.index_to_docstore_id.values():
+        doc = vectorstore.docstore.search(doc_id)
+        if hasattr(doc, "page_content"):
+            text_bytes += len(doc.page_content) + DOCUMENT_OVERHEAD_BYTES
+    return vector_bytes + text_bytes
+
+
+def build_faiss(documents: List[Document], vectors: np.ndarray, embeddings: "Embeddings") -> "FAISS":
+    """
+    Build a FAISS vector store from precomputed vectors.
+
+    The index type and quantization follow INDEX_TYPE and INDEX_QUANTIZATION.
+
+    Args:
+        documents: Documents in the same order as the vector rows
+        vectors: Contiguous float32 matrix of shape (len(documents), dim)
+        embeddings: Embedding function used for queries
+
+    Returns:
+        FAISS vector store
+    """
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+
+    index = build_index(vectors)
+    ids = [str(uuid.uuid4()) for _ in documents]
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, documents))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
 
 
 class VectorStoreService:
     """Handles text chunking, embedding, and vector store creation."""
 
-    def __init__(self):
+    def __init__(self, embedding_model: "Embeddings" = None):
+        """
+        Args:
+            embedding_model: Embeddings to use instead of the configured
+                FastEmbed model (benchmarks pass a local stand-in)
+        """
         logger.debug("Initializing VectorStoreService...")
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.CHUNK_SIZE,
             chunk_overlap=settings.CHUNK_OVERLAP,
+            add_start_index=True,
         )
         logger.info(
-            f"TextSplitter configured with chunk_size={settings.CHUNK_SIZE}, "
-            f"chunk_overlap={settings.CHUNK_OVERLAP}"
+            "TextSplitter configured with chunk_size=%s, chunk_overlap=%s",
+            settings.CHUNK_SIZE, settings.CHUNK_OVERLAP,
+        )
+        self.segment_chunker = SegmentChunker(
+            chunk_size=settings.CHUNK_SIZE,
+            chunk_overlap=settings.CHUNK_OVERLAP,
         )
-        self.embedding_model = FastEmbedEmbeddings(
-            model_name=settings.EMBEDDING_MODEL
+        if embedding_model is None:
+            from app.services.embeddings import FastEmbedEmbeddings
+            embedding_model = FastEmbedEmbeddings(
+                model_name=settings.EMBEDDING_MODEL,
+                cache=EmbeddingCache(settings.EMBEDDING_MODEL) if settings.EMBEDDING_CACHE_ENABLED else None,
+            )
+            logger.info("Embedding model set to '%s'", settings.EMBEDDING_MODEL)
+        self.embedding_model = embedding_model
+        self.index_cache = IndexCache() if settings.INDEX_CACHE_ENABLED else None
+        self.resident = LRUCache(
+            max_bytes=settings.VECTORSTORE_CACHE_MAX_BYTES,
+            sizeof=estimate_vectorstore_bytes,
+            max_entry_bytes=settings.VECTORSTORE_CACHE_MAX_ENTRY_BYTES,
         )
-        logger.info(f"Embedding model set to '{settings.EMBEDDING_MODEL}'")
+        self.versions = {}
+        self.corpus = None
+        if settings.CORPUS_INDEX_ENABLED:
+            self.corpus = CorpusIndex()
+            self.corpus.load()
+
+    def index_version(self, video_id: str) -> Optional[str]:
+        """
+        Identify the transcript and embedding setup behind a video's index.
 
-    def create_vectorstore(self, text: str) -> FAISS:
+        The version changes whenever the transcript text, embedding model or
+        chunking parameters change, so anything derived from the index can
+        be invalidated by comparing versions.
         """
-        Create a FAISS vector store from text.
+        if self.corpus is not None and self.corpus.contains(video_id):
+            return self.corpus.version(video_id)
+        version = self.versions.get(video_id)
+        if version is None and self.index_cache is not None:
+            meta = self.index_cache.read_meta(video_id)
+            if meta and meta.get("transcript_sha1"):
+                version = self._version(meta["transcript_sha1"])
+                self.versions[video_id] = version
+        return version
+
+    @staticmethod
+    def _version(transcript_sha1: str) -> str:
+        raw = (
+            f"{transcript_sha1}|{settings.EMBEDDING_MODEL}|{settings.CHUNKER}|"
+            f"{settings.CHUNK_SIZE}|{settings.CHUNK_OVERLAP}|"
+            f"{settings.INDEX_TYPE}|{settings.INDEX_QUANTIZATION}"
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def load_vectorstore(self, video_id: str) -> Optional[VideoIndex]:
+        """
+        Load a previously built vector store for a video.
+
+        With the corpus index enabled, an ingested video is a segment of the
+        shared index, and the returned handle is pinned to that segment. Otherwise hot videos are served from the in-memory LRU
+        and the disk index cache is consulted, keeping a hit resident.
 
         Args:
-            text: Raw text to be chunked and embedded
+            video_id: YouTube video ID
 
         Returns:
-            FAISS vector store
+            The video's index, or None if the video has not been indexed yet
+        """
+        if not video_id:
+            return None
+        if self.corpus is not None:
+            segment = self.corpus.segment(video_id)
+            return CorpusVideo(self.corpus, video_id, segment) if segment is not None else None
+
+        vectorstore = self.resident.get(video_id)
+        if vectorstore is not None:
+            logger.info("Resident vector store hit for video_id=%s", video_id)
+            return vectorstore
+
+        if self.index_cache is None:
+            return None
+        vectorstore = self.index_cache.load(video_id, self.embedding_model)
+        if vectorstore is not None:
+            self.resident.put(video_id, vectorstore)
+        return vectorstore
+
+    def split_transcript(self, transcript: Union[str, TranscriptSegments]) -> List[Document]:
+        """
+        Split a transcript into chunks.
+
+        Timed transcripts are cut on segment boundaries and their chunks carry
+        start/end timestamps, unless CHUNKER is set to "recursive".
+        """
+        if isinstance(transcript, TranscriptSegments):
+            if settings.CHUNKER == "segment":
+                return self.segment_chunker.split(transcript)
+            transcript = transcript.text
+        return self.text_splitter.create_documents([transcript])
+
+    def create_vectorstore(self, text: Union[str, TranscriptSegments], video_id: str = None) -> VideoIndex:
+        """
+        Create a vector store from a transcript.
+
+        Args:
+            text: Raw text or timed transcript segments to be chunked and embedded
+            video_id: Optional YouTube video ID; when given, the chunks are
+                added to the corpus index (replacing any earlier version),
+                or the built store is kept resident and saved to the index cache
+
+        Returns:
+            The video's index
         """
         logger.info("Creating vector store from input text")
         # Split text into chunks
-        chunks = self.text_splitter.create_documents([text])
-        logger.debug(f"Text split into {len(chunks)} chunks")
+        with stage_timer("chunking"):
+            chunks = self.split_transcript(text)
+        logger.debug("Text split into %s chunks", len(chunks))
+        CHUNKS_PER_VIDEO.observe(len(chunks))
+
+        # Embed all chunks into one matrix and build the index from it
+        vectors = self.embedding_model.embed_array([chunk.page_content for chunk in chunks])
+        raw_text = text.text if isinstance(text, TranscriptSegments) else text
+        transcript_sha1 = hashlib.sha1(raw_text.encode("utf-8")).hexdigest()
 
-        # Create vector store from chunks
-        vectorstore = FAISS.from_documents(chunks, self.embedding_model)
+        if self.corpus is not None and video_id:
+            with stage_timer("index_build"):
+                segment = self.corpus.add_video(video_id, chunks, vectors, version=self._version(transcript_sha1))
+            return CorpusVideo(self.corpus, video_id, segment)
+
+        with stage_timer("index_build"):
+            vectorstore = build_faiss(chunks, vectors, self.embedding_model)
         logger.info("FAISS vector store created successfully")
+        if video_id:
+            self.versions[video_id] = self._version(transcript_sha1)
+            self.resident.put(video_id, vectorstore)
+        if self.index_cache is not None and video_id:
+            self.index_cache.save(video_id, vectorstore, transcript_sha1=transcript_sha1)
 
         return vectorstore
 
-    def retrieve_documents(self, vectorstore: FAISS, query: str, k: int = None):
+    def remove_video(self, video_id: str) -> bool:
+        """
+        Drop a video's index everywhere it is kept, so the next request
+        rebuilds it from a fresh transcript.
+
+        Returns:
+            True if the video was indexed
+        """
+        removed = self.corpus.remove_video(video_id) if self.corpus is not None else False
+        removed = self.resident.pop(video_id) is not None or removed
+        if self.index_cache is not None and self.index_cache.contains(video_id):
+            shutil.rmtree(self.index_cache.path(video_id), ignore_errors=True)
+            removed = True
+        self.versions.pop(video_id, None)
+        return removed
+
+    def search_corpus(self, query: str, k: int = None, video_ids: List[str] = None) -> List[Document]:
+        """
+        Search chunks across videos in the corpus index.
+
+        Args:
+            query: Search query
+            k: Number of documents to retrieve
+            video_ids: Videos to search; all ingested videos when None
+
+        Returns:
+            Relevant documents, each with its video_id in metadata
+        """
+        if self.corpus is None:
+            raise RuntimeError("Corpus index is disabled (CORPUS_INDEX_ENABLED=false)")
+        query_vector = self.embedding_model.embed_query(query)
+        with stage_timer("retrieval"):
+            return self.corpus.search(np.asarray([query_vector], dtype=np.float32), k or settings.RETRIEVER_FETCH_K, video_ids)[0]
+
+    def retrieve_documents(self, vectorstore: VideoIndex, query: str, k: int = None, query_vector=None):
         """
         Retrieve relevant documents from vector store.
 
         Args:
-            vectorstore: FAISS vector store
+            vectorstore: The video's FAISS store or corpus segment
             query: Search query
             k: Number of documents to retrieve
+            query_vector: Precomputed embedding of the query, if available
 
         Returns:
             List of relevant documents
         """
         if k is None:
-            k = settings.RETRIEVER_K
-        logger.info(f"Retrieving top {k} documents for query='{query}'")
+            k = settings.RETRIEVER_FETCH_K
+        logger.info("Retrieving top %d documents (query_chars=%d)", k, len(query))
 
-        # Use similarity_search directly instead of retriever
-        retrieved_docs = vectorstore.similarity_search(query, k=k)
-        logger.debug(f"Retrieved {len(retrieved_docs)} documents from vector store")
+        if query_vector is None and isinstance(vectorstore, CorpusVideo):
+            query_vector = self.embedding_model.embed_query(query)
+        with stage_timer("retrieval"):
+            if isinstance(vectorstore, CorpusVideo):
+                retrieved_docs = vectorstore.search(np.asarray([query_vector], dtype=np.float32), k)[0]
+            elif query_vector is not None:
+                retrieved_docs = vectorstore.similarity_search_by_vector(list(query_vector), k=k)
+            else:
+                # Use similarity_search directly instead of retriever
+                retrieved_docs = vectorstore.similarity_search(query, k=k)
+        logger.debug("Retrieved %s documents from vector store", len(retrieved_docs))
 
         return retrieved_docs
+
+    def retrieve_documents_batch(
+        self, vectorstore: VideoIndex, queries: List[str], k: int = None, query_vectors: np.ndarray = None
+    ) -> List[List[Document]]:
+        """
+        Retrieve relevant documents for many queries at once.
+
+        All queries are embedded in one batch and searched with a single
+        FAISS call over the query matrix.
+
+        Args:
+            vectorstore: The video's FAISS store or corpus segment
+            queries: Search queries
+            k: Number of documents to retrieve per query
+            query_vectors: Precomputed query embedding matrix, if available
+
+        Returns:
+            One list of relevant documents per query, in query order
+        """
+        if k is None:
+            k = settings.RETRIEVER_FETCH_K
+        logger.info("Retrieving top %s documents for %s queries", k, len(queries))
+
+        if query_vectors is None:
+            query_vectors = self.embedding_model.embed_queries(queries)
+        if isinstance(vectorstore, CorpusVideo):
+            with stage_timer("retrieval"):
+                return vectorstore.search(query_vectors, k)
+        with stage_timer("retrieval"):
+            _, indices = vectorstore.index.search(query_vectors, k)
+
+        results = []
+        for row in indices:
+            docs = []
+            for i in row:
+                if i == -1:
+                    continue
+                doc = vectorstore.docstore.search(vectorstore.index_to_docstore_id[int(i)])
+                if isinstance(doc, Document):
+                    docs.append(doc)
+            results.append(docs)
+        return results
@@ -0,0 +1,100 @@
+"""
+In-process caching primitives shared by the services.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache bounded by the total estimated size of its values.
+
+    Entries are evicted least-recently-used first until the sum of their
+    sizes fits in ``max_bytes``. A value larger than ``max_entry_bytes``
+    (the whole budget by default) is never stored, so one huge entry
+    cannot flush everything else.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = None, max_entry_bytes: int = None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes or max_bytes, max_bytes)
+        self.sizeof = sizeof or sys.getsizeof
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return a value without counting a hit or changing its recency."""
+        with self._lock:
+            item = self._data.get(key)
+            return default if item is None else item[0]
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> bool:
+        """
+        Store a value, evicting older entries as needed.
+
+        Returns:
+            True if the value was stored, False if it exceeds the budget
+        """
+        if size is None:
+            size = self.sizeof(value)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_entry_bytes:
+                return False
+            self._data[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._remove(key)
+            return default if item is None else item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: Hashable):
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.current_bytes -= item[1]
+        return item
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,8 +1,11 @@
 """
 Utility helper functions.
 """
+import json
 import re
 
+from app.core.logging_config import logger
+
 
 def validate_youtube_id(video_id: str) -> bool:
     """
@@ -15,7 +18,7 @@ def validate_youtube_id(video_id: str) -> bool:
         True if valid format, False otherwise
     """
     pattern = r'^[a-zA-Z0-9_-]{11}$'
-    print(f'This video id is valid : {video_id}')
+    logger.debug("Validating video id %s", video_id)
     return bool(re.match(pattern, video_id))
 
 
@@ -32,12 +35,48 @@ def extract_video_id_from_url(url: str) -> str:
     patterns = [
         r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([a-zA-Z0-9_-]{11})',
         r'youtube\.com\/embed\/([a-zA-Z0-9_-]{11})',
+        r'^([a-zA-Z0-9_-]{11})$',
     ]
     
     for pattern in patterns:
         match = re.search(pattern, url)
         if match:
-            print(f"Video id is extracted from URL {url}")
+            logger.debug("Video id extracted from URL %s", url)
             return match.group(1)
     
-    return ""
\ No newline at end of file
+    return ""
+
+
+def format_sse(event: str, data: dict) -> str:
+    """
+    Format a Server-Sent Events message.
+    
+    Args:
+        event: Event name
+        data: JSON-serializable payload
+    
+    Returns:
+        SSE-encoded message, terminated by a blank line
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def build_citations(documents, video_id: str) -> list:
+    """
+    Build timestamp citations from retrieved documents.
+    
+    Args:
+        documents: Retrieved documents with optional start/end metadata
+        video_id: YouTube video ID used for deep links
+    
+    Returns:
+        List of dicts with start, end and url, for documents that have a start time
+    """
+    citations = []
+    for doc in documents:
+        start = doc.metadata.get("start")
+        if start is None:
+            continue
+        url = f"https://www.youtube.com/watch?v={video_id}&t={int(start)}s" if video_id else None
+        citations.append({"start": start, "end": doc.metadata.get("end"), "url": url})
+    return citations
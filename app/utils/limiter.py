@@ -0,0 +1,105 @@
+"""
+Async concurrency limiter with a bounded wait queue.
+"""
+import asyncio
+import collections
+import time
+from contextlib import asynccontextmanager, suppress
+
+from app.core.metrics import LIMITER_IN_FLIGHT, LIMITER_REJECTED, LIMITER_WAIT_SECONDS, LIMITER_WAITING
+
+
+class OverloadedError(Exception):
+    """Raised when a limiter's wait queue is full or the wait timed out."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    Lets at most ``max_in_flight`` callers run at once.
+
+    Up to ``max_waiting`` more wait in FIFO order for at most
+    ``wait_timeout`` seconds; beyond that callers are rejected right away
+    with OverloadedError, so load the backend cannot absorb turns into
+    fast failures instead of an ever-growing queue. Waiters are plain
+    futures on the caller's loop, so one limiter can serve any event loop.
+
+    In-flight count, queue depth, wait time and rejections are exported as
+    ``limiter_*`` metrics labelled with ``name``.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_waiting: int, wait_timeout: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._in_flight = 0
+        self._waiters = collections.deque()
+        self._in_flight_gauge = LIMITER_IN_FLIGHT.labels(name)
+        self._waiting_gauge = LIMITER_WAITING.labels(name)
+        self._wait_seconds = LIMITER_WAIT_SECONDS.labels(name)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _reject(self, reason: str, message: str):
+        LIMITER_REJECTED.labels(self.name, reason).inc()
+        return OverloadedError(message, retry_after=max(1.0, self.wait_timeout))
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if necessary."""
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            self._in_flight_gauge.inc()
+            self._wait_seconds.observe(0.0)
+            return
+        if len(self._waiters) >= self.max_waiting:
+            raise self._reject("queue_full", f"{self.name}: {self.max_waiting} requests already waiting")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._waiting_gauge.inc()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.wait_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as this caller gave up
+                self.release()
+            else:
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("timeout", f"{self.name}: no capacity within {self.wait_timeout:g}s") from None
+            raise
+        finally:
+            self._waiting_gauge.dec()
+            self._wait_seconds.observe(time.monotonic() - start)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the oldest live waiter."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot passes straight to the waiter; in_flight is unchanged
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+        self._in_flight_gauge.dec()
+
+    @asynccontextmanager
+    async def slot(self):
+        """``async with limiter.slot():`` holds one slot for the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
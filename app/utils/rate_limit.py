@@ -0,0 +1,98 @@
+"""
+Token-bucket rate limiting with a pluggable state backend.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class RateLimitedError(Exception):
+    """Raised when a client has used up its request budget."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitBackend(ABC):
+    """
+    Stores token buckets by client key.
+
+    Subclasses must make ``take`` atomic for their storage. A shared
+    backend (for example a Redis script doing the same arithmetic) lets
+    several workers or hosts enforce one budget per client.
+    """
+
+    @abstractmethod
+    def take(self, key: str, cost: float, rate: float, burst: float) -> float:
+        """
+        Spend ``cost`` tokens from ``key``'s bucket if it holds enough.
+
+        Buckets start full at ``burst`` tokens and refill at ``rate``
+        tokens per second.
+
+        Returns:
+            0.0 if the tokens were taken, otherwise seconds until they
+            would be available (nothing is taken in that case)
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Buckets held in this process.
+
+    Each worker process enforces its own budget. At most ``max_keys``
+    buckets are kept; the least recently used are dropped first, which
+    only ever hands a client a fresh (full) bucket.
+    """
+
+    def __init__(self, max_keys: int = 10000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, rate: float, burst: float) -> float:
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate if rate > 0 else float("inf")
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class TokenBucketRateLimiter:
+    """
+    Per-client token buckets.
+
+    Every request spends ``cost`` tokens from its client's bucket, so
+    expensive requests use up the budget faster than cheap ones. A cost
+    above ``burst`` is charged as ``burst``, so no request is impossible.
+    """
+
+    def __init__(self, rate: float, burst: float, backend: RateLimitBackend = None):
+        self.rate = rate
+        self.burst = burst
+        self.backend = backend if backend is not None else InMemoryRateLimitBackend()
+
+    def check(self, key: str, cost: float = 1.0) -> None:
+        """
+        Charge a request to ``key``.
+
+        Raises:
+            RateLimitedError: The bucket does not hold ``cost`` tokens
+        """
+        wait = self.backend.take(key, min(cost, self.burst), self.rate, self.burst)
+        if wait > 0:
+            raise RateLimitedError(f"rate limit exceeded, retry in {wait:.1f}s", retry_after=wait)
@@ -0,0 +1,77 @@
+"""
+Benchmark the segment-aligned chunker against RecursiveCharacterTextSplitter.
+
+Builds synthetic timed transcripts (about one caption segment every three
+seconds) and reports chunks/sec and total time for each splitter.
+
+Usage:
+    python -m benchmarks.bench_chunking --hours 1 3 6
+"""
+import argparse
+import random
+import time
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from app.services.chunking import SegmentChunker
+from app.services.transcript_segments import TranscriptSegments
+
+WORDS = (
+    "so today we are going to talk about how transformers work and why attention "
+    "matters for long sequences let me show you an example on the whiteboard"
+).split()
+SEGMENT_SECONDS = 3.0
+
+
+def make_transcript(hours: float, seed: int = 0) -> TranscriptSegments:
+    rng = random.Random(seed)
+    count = int(hours * 3600 / SEGMENT_SECONDS)
+    return TranscriptSegments.from_items(
+        {
+            "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))),
+            "start": i * SEGMENT_SECONDS,
+            "duration": SEGMENT_SECONDS,
+        }
+        for i in range(count)
+    )
+
+
+def best_time(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(hours_values: list, chunk_size: int, chunk_overlap: int, repeat: int) -> None:
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunker = SegmentChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    print(f"chunk_size={chunk_size} chunk_overlap={chunk_overlap}")
+    print(f"{'hours':>5} {'segments':>8} {'chars':>10} {'splitter':>10} {'chunks':>7} {'seconds':>8} {'speedup':>8}")
+    for hours in hours_values:
+        segments = make_transcript(hours)
+        baseline, _ = best_time(lambda: splitter.create_documents([segments.text]), repeat)
+        for name, fn in (
+            ("recursive", lambda: splitter.create_documents([segments.text])),
+            ("segment", lambda: chunker.split(segments)),
+        ):
+            seconds, chunks = best_time(fn, repeat)
+            print(
+                f"{hours:>5} {len(segments):>8} {len(segments.text):>10} {name:>10} "
+                f"{len(chunks):>7} {seconds:>8.3f} {baseline / seconds:>7.1f}x"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 3, 6])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.hours, args.chunk_size, args.chunk_overlap, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
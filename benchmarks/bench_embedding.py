@@ -0,0 +1,69 @@
+"""
+Micro-benchmark for the document embedding path.
+
+Reports docs/sec for FastEmbedEmbeddings.embed_array across batch sizes and
+data-parallel settings, on synthetic transcript-sized chunks.
+
+Usage:
+    python -m benchmarks.bench_embedding --docs 2000 --batch-sizes 64 256 --parallel 1 0
+"""
+import argparse
+import random
+import time
+
+from app.core.config import settings
+from app.services.embeddings import FastEmbedEmbeddings
+
+WORDS = (
+    "the video explains how models learn from data and why training takes time "
+    "we look at gradients loss functions optimizers and evaluation on held out sets"
+).split()
+
+
+def make_chunks(n: int, chunk_size: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(n):
+        words = []
+        while sum(len(w) + 1 for w in words) < chunk_size:
+            words.append(rng.choice(WORDS))
+        chunks.append(" ".join(words))
+    return chunks
+
+
+def run(docs: int, batch_sizes: list, parallel_values: list, repeat: int) -> None:
+    chunks = make_chunks(docs, settings.CHUNK_SIZE)
+    print(f"model={settings.EMBEDDING_MODEL} docs={docs} chunk_size={settings.CHUNK_SIZE}")
+    print(f"{'batch':>6} {'parallel':>8} {'docs/sec':>10} {'seconds':>8}")
+    for parallel in parallel_values:
+        # parallel=1 means a single in-process worker
+        embeddings = FastEmbedEmbeddings(
+            model_name=settings.EMBEDDING_MODEL,
+            parallel=None if parallel == 1 else parallel,
+            parallel_min_docs=1,
+        )
+        for batch_size in batch_sizes:
+            embeddings.batch_size = batch_size
+            embeddings.embed_array(chunks[:batch_size])  # warm-up
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                vectors = embeddings.embed_array(chunks)
+                best = min(best, time.perf_counter() - start)
+            assert vectors.flags["C_CONTIGUOUS"] and vectors.shape[0] == docs
+            print(f"{batch_size:>6} {parallel:>8} {docs / best:>10.1f} {best:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 128, 256])
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, 0],
+                        help="FastEmbed parallel values; 1 = in-process, 0 = all cores")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.docs, args.batch_sizes, args.parallel, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
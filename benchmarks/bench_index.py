@@ -0,0 +1,79 @@
+"""
+Benchmark recall, latency and memory for each index configuration.
+
+Builds clustered, L2-normalized synthetic vectors (the shape of bge-small
+sentence embeddings), then reports for every index type and quantization:
+build time, bytes per vector, recall@k against exact flat search, and
+per-query search latency.
+
+Usage:
+    python -m benchmarks.bench_index --vectors 1000 50000 --dim 384
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+from app.services.index_factory import build_index, index_bytes
+
+CONFIGURATIONS = [
+    ("flat", "none"),
+    ("flat", "fp16"),
+    ("flat", "int8"),
+    ("flat", "pq"),
+    ("hnsw", "none"),
+    ("hnsw", "int8"),
+    ("ivf", "none"),
+    ("ivf", "int8"),
+    ("ivf", "pq"),
+]
+
+
+def make_vectors(count: int, dim: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)] + 0.5 * rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.ascontiguousarray(vectors)
+
+
+def run(counts: list, dim: int, queries: int, k: int) -> None:
+    print(f"dim={dim} queries={queries} k={k}")
+    print(f"{'vectors':>8} {'index':>6} {'quant':>5} {'build_s':>8} {'bytes/vec':>9} {'recall':>7} {'ms/query':>9}")
+    for count in counts:
+        vectors = make_vectors(count, dim)
+        query_vectors = make_vectors(queries, dim, seed=1)
+        exact = faiss.IndexFlatL2(dim)
+        exact.add(vectors)
+        _, truth = exact.search(query_vectors, k)
+
+        for index_type, quantization in CONFIGURATIONS:
+            start = time.perf_counter()
+            index = build_index(vectors, index_type=index_type, quantization=quantization)
+            build_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for query in query_vectors:
+                _, found = index.search(query[None, :], k)
+            search_ms = (time.perf_counter() - start) * 1000 / queries
+            _, found = index.search(query_vectors, k)
+            recall = np.mean([len(set(t) & set(f)) / k for t, f in zip(truth, found)])
+
+            print(
+                f"{count:>8} {index_type:>6} {quantization:>5} {build_seconds:>8.2f} "
+                f"{index_bytes(index) / count:>9.1f} {recall:>7.3f} {search_ms:>9.3f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, nargs="+", default=[1000, 20000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=8)
+    args = parser.parse_args()
+    run(args.vectors, args.dim, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
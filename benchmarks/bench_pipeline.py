@@ -0,0 +1,333 @@
+"""
+Offline benchmark of the /ask pipeline, per stage and end to end.
+
+Runs the real chunking, indexing, retrieval, context assembly and FastAPI
+routes against local stand-ins (benchmarks/fakes.py): synthetic timed
+transcripts, bag-of-words embeddings and a chat model with a fixed
+latency. No network is needed.
+
+Two sections:
+- stages: per-stage seconds for transcripts of each length, read from the
+  Prometheus stage histograms the app already records
+- ask: /ask latency percentiles and throughput at each concurrency, for
+  warm videos (index already built) and cold ones (fetch, chunk, embed and
+  index on the request path)
+
+Results are written as JSON; pass --baseline with an earlier result to
+print the change in p50/p95 latency and throughput.
+
+Usage:
+    python -m benchmarks.bench_pipeline --minutes 1 10 60 600 --concurrency 1 8 32 --output results.json
+    python -m benchmarks.bench_pipeline --real-embeddings --baseline results.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import STAGE_SECONDS, STAGES
+from benchmarks.fakes import (
+    FakeChatModel, FakeEmbeddings, FakeTranscriptService, synthetic_questions, video_id_for,
+)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def stage_totals() -> dict:
+    """Cumulative (seconds, count) per stage from the stage histograms."""
+    totals = {}
+    for metric in STAGE_SECONDS.collect():
+        for sample in metric.samples:
+            stage = sample.labels.get("stage")
+            if sample.name.endswith("_sum"):
+                totals.setdefault(stage, [0.0, 0])[0] = sample.value
+            elif sample.name.endswith("_count"):
+                totals.setdefault(stage, [0.0, 0])[1] = int(sample.value)
+    return totals
+
+
+def stage_delta(before: dict, after: dict) -> dict:
+    """Seconds spent and calls made per stage between two snapshots."""
+    delta = {}
+    for stage in STAGES:
+        seconds = after.get(stage, [0.0, 0])[0] - before.get(stage, [0.0, 0])[0]
+        calls = after.get(stage, [0.0, 0])[1] - before.get(stage, [0.0, 0])[1]
+        if calls:
+            delta[stage] = {"seconds": round(seconds, 6), "calls": calls}
+    return delta
+
+
+def build_services(args):
+    from app.services.llm_service import LLMService
+    from app.services.rag_pipeline import RAGPipeline
+    from app.services.vectorstore_service import VectorStoreService
+
+    embeddings = None
+    if not args.real_embeddings:
+        embeddings = FakeEmbeddings(seconds_per_text=args.embed_seconds_per_text)
+    vectorstore_service = VectorStoreService(embedding_model=embeddings)
+    transcript_service = FakeTranscriptService(latency=args.transcript_latency)
+    llm_service = LLMService(llm=FakeChatModel(latency=args.llm_latency))
+    pipeline = RAGPipeline(transcript_service, vectorstore_service)
+    return transcript_service, vectorstore_service, llm_service, pipeline
+
+
+def bench_stages(services, minutes_list, queries: int) -> list:
+    """Time ingestion and per-question stages for each transcript length."""
+    transcript_service, vectorstore_service, llm_service, _ = services
+    questions = synthetic_questions(queries, seed=1)
+    rows = []
+    for minutes in minutes_list:
+        video_id = video_id_for(minutes, 0)
+        transcript = transcript_service.fetch_segments(video_id)
+
+        before = stage_totals()
+        start = time.perf_counter()
+        index = vectorstore_service.create_vectorstore(transcript, video_id=video_id)
+        ingest_seconds = time.perf_counter() - start
+        ingest = stage_delta(before, stage_totals())
+
+        before = stage_totals()
+        start = time.perf_counter()
+        for question in questions:
+            vector = vectorstore_service.embedding_model.embed_query(question)
+            docs = vectorstore_service.retrieve_documents(index, question, query_vector=vector)
+            llm_service.format_documents(llm_service.build_context(docs))
+        question_seconds = (time.perf_counter() - start) / queries
+        per_question = {
+            stage: {"seconds": round(value["seconds"] / queries, 6), "calls": value["calls"]}
+            for stage, value in stage_delta(before, stage_totals()).items()
+        }
+
+        rows.append({
+            "transcript_minutes": minutes,
+            "characters": len(transcript.text),
+            "chunks": len(vectorstore_service.split_transcript(transcript)),
+            "ingest_seconds": round(ingest_seconds, 6),
+            "ingest_stages": ingest,
+            "question_seconds": round(question_seconds, 6),
+            "question_stages": per_question,
+        })
+        vectorstore_service.remove_video(video_id)
+    return rows
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    values = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            **{f"p{p}": round(float(np.percentile(values, p)), 3) for p in PERCENTILES},
+            "mean": round(float(values.mean()), 3),
+            "max": round(float(values.max()), 3),
+        },
+    }
+
+
+async def bench_ask(services, scenario: str, minutes: float, concurrency: int, requests: int, run_id: int) -> dict:
+    """Drive /ask in-process at a fixed concurrency."""
+    import httpx
+    from app.main import app
+
+    questions = synthetic_questions(requests, seed=2 + run_id)
+    if scenario == "warm":
+        video_ids = [video_id_for(minutes, 0)] * requests
+        await services[3].get_vectorstore(video_ids[0])
+    else:
+        # A fresh video per request: every request fetches, chunks, embeds and indexes
+        video_ids = [video_id_for(minutes, 1 + run_id * requests + i) for i in range(requests)]
+
+    latencies, errors = [], 0
+    pending = iter(range(requests))
+
+    async def worker(client):
+        nonlocal errors
+        for i in pending:
+            start = time.perf_counter()
+            response = await client.post("/ask", json={"video_url": video_ids[i], "question": questions[i]})
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    if scenario == "cold":
+        for video_id in set(video_ids):
+            services[1].remove_video(video_id)
+    return {"scenario": scenario, "transcript_minutes": minutes, "concurrency": concurrency,
+            **summarize(latencies, errors, elapsed)}
+
+
+def install_overrides(services, answer_cache: bool) -> None:
+    from app.api import deps
+    from app.main import app
+    from app.services.admission import AdmissionController
+    from app.services.answer_cache import SemanticAnswerCache
+
+    transcript_service, vectorstore_service, llm_service, pipeline = services
+    cache = SemanticAnswerCache() if answer_cache else None
+    # Every request comes from one client; keep the work queue, skip its rate limit
+    admission = AdmissionController()
+    admission.rate_limiter = None
+    app.dependency_overrides.update({
+        deps.get_transcript_service: lambda: transcript_service,
+        deps.get_vectorstore_service: lambda: vectorstore_service,
+        deps.get_llm_service: lambda: llm_service,
+        deps.get_rag_pipeline: lambda: pipeline,
+        deps.get_answer_cache: lambda: cache,
+        deps.get_admission_controller: lambda: admission,
+    })
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(result: dict, baseline: dict) -> None:
+    """Print p50/p95 latency and throughput relative to a baseline run."""
+    def key(row):
+        return row["scenario"], row["transcript_minutes"], row["concurrency"]
+
+    previous = {key(row): row for row in baseline.get("ask", [])}
+    print(f"\nvs baseline {baseline['meta'].get('commit') or '?'}:")
+    print(f"{'scenario':>8} {'min':>6} {'conc':>5} {'p50':>8} {'p95':>8} {'rps':>8}")
+    for row in result["ask"]:
+        old = previous.get(key(row))
+        if old is None:
+            continue
+
+        def ratio(new_value, old_value):
+            return f"{new_value / old_value:>7.2f}x" if old_value else "     n/a"
+
+        print(
+            f"{row['scenario']:>8} {row['transcript_minutes']:>6} {row['concurrency']:>5} "
+            f"{ratio(row['latency_ms']['p50'], old['latency_ms']['p50'])} "
+            f"{ratio(row['latency_ms']['p95'], old['latency_ms']['p95'])} "
+            f"{ratio(row['throughput_rps'], old['throughput_rps'])}"
+        )
+
+
+def run(args) -> dict:
+    # Keep the benchmark's indexes and caches out of the app's cache directory,
+    # and put the settings back afterwards
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as workdir:
+        overrides = {
+            "CORPUS_INDEX_DIR": os.path.join(workdir, "corpus"),
+            "INDEX_CACHE_DIR": os.path.join(workdir, "indexes"),
+            "EMBEDDING_CACHE_ENABLED": False,
+        }
+        saved = {name: getattr(settings, name) for name in overrides}
+        try:
+            for name, value in overrides.items():
+                setattr(settings, name, value)
+            return _run(args)
+        finally:
+            for name, value in saved.items():
+                setattr(settings, name, value)
+
+
+def _run(args) -> dict:
+    services = build_services(args)
+    install_overrides(services, args.answer_cache)
+
+    result = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "embeddings": settings.EMBEDDING_MODEL if args.real_embeddings else "fake",
+            "llm_latency": args.llm_latency,
+            "transcript_latency": args.transcript_latency,
+            "answer_cache": args.answer_cache,
+            "settings": {
+                name: getattr(settings, name) for name in (
+                    "CHUNKER", "CHUNK_SIZE", "CHUNK_OVERLAP", "RETRIEVER_FETCH_K", "CONTEXT_TOKEN_BUDGET",
+                    "INDEX_TYPE", "INDEX_QUANTIZATION", "CORPUS_INDEX_ENABLED", "EMBEDDING_WORKERS",
+                )
+            },
+        },
+        "stages": bench_stages(services, args.minutes, args.queries),
+        "ask": [],
+    }
+
+    print(f"{'minutes':>8} {'chunks':>7} {'ingest s':>9} {'question ms':>12}")
+    for row in result["stages"]:
+        print(f"{row['transcript_minutes']:>8} {row['chunks']:>7} {row['ingest_seconds']:>9.3f} "
+              f"{row['question_seconds'] * 1000:>12.2f}")
+
+    print(f"\n{'scenario':>8} {'min':>6} {'conc':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    run_id = 0
+    for scenario in args.scenarios:
+        for concurrency in args.concurrency:
+            requests = args.requests if scenario == "warm" else args.cold_requests
+            row = asyncio.run(bench_ask(services, scenario, args.ask_minutes, concurrency, requests, run_id))
+            run_id += 1
+            result["ask"].append(row)
+            latency = row["latency_ms"]
+            print(
+                f"{scenario:>8} {args.ask_minutes:>6} {concurrency:>5} {row['throughput_rps']:>8.1f} "
+                f"{latency['p50']:>8.1f} {latency['p95']:>8.1f} {latency['p99']:>8.1f} {row['errors']:>6}"
+            )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 60, 600],
+                        help="transcript lengths for the stage section")
+    parser.add_argument("--queries", type=int, default=50, help="questions per transcript in the stage section")
+    parser.add_argument("--scenarios", nargs="+", choices=["warm", "cold"], default=["warm", "cold"])
+    parser.add_argument("--ask-minutes", type=float, default=30, help="transcript length for /ask runs")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per warm run")
+    parser.add_argument("--cold-requests", type=int, default=32, help="requests per cold run")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per fake LLM call")
+    parser.add_argument("--transcript-latency", type=float, default=0.3, help="seconds per fake transcript fetch")
+    parser.add_argument("--embed-seconds-per-text", type=float, default=0.0,
+                        help="simulated model cost per text for the fake embeddings")
+    parser.add_argument("--real-embeddings", action="store_true",
+                        help="use the configured FastEmbed model (must already be downloaded)")
+    parser.add_argument("--answer-cache", action="store_true", help="enable the semantic answer cache")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="earlier JSON result to compare against")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    result = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark cold-start import time of the API and enforce a budget.
+
+Imports ``app.main`` in fresh interpreters under ``python -X importtime``,
+reports the median total and the slowest modules, and checks that heavy
+dependencies used only on specific code paths (Selenium, FastEmbed, the
+LangChain FAISS wrapper, the Groq client) are not loaded at import.
+
+Exits non-zero when the median exceeds the budget or a deferred module is
+imported, so it can run in CI.
+
+Usage:
+    python -m benchmarks.bench_startup --budget-ms 1000 --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+DEFERRED_MODULES = (
+    "selenium",
+    "webdriver_manager",
+    "fastembed",
+    "onnxruntime",
+    "langchain_community",
+    "langchain_groq",
+    "langchain_text_splitters",
+    "youtube_transcript_api",
+)
+
+PROBE = (
+    "import sys, {target}; "
+    "print(','.join(m for m in {modules!r} if m in sys.modules))"
+)
+
+
+def import_once(target: str) -> tuple:
+    """
+    Import the target in a fresh interpreter.
+
+    Returns:
+        (total_us, {module: cumulative_us}, [deferred modules that were loaded])
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(target=target, modules=DEFERRED_MODULES)],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        modules[name.strip()] = max(modules.get(name.strip(), 0), int(cumulative))
+        if depth == 1:
+            total += int(cumulative)
+    loaded = [m for m in result.stdout.strip().splitlines()[-1].split(",") if m] if result.stdout.strip() else []
+    return total, modules, loaded
+
+
+def run(target: str, runs: int, budget_ms: float, top: int) -> int:
+    totals, modules, loaded = [], {}, []
+    for _ in range(runs):
+        total, modules, loaded = import_once(target)
+        totals.append(total)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"import {target}: median {median_ms:.0f} ms over {runs} runs (budget {budget_ms:.0f} ms)")
+    print(f"{'ms':>8}  module")
+    first_party = {name: us for name, us in modules.items() if "." not in name or name.startswith("app.")}
+    for name, us in sorted(first_party.items(), key=lambda item: -item[1])[:top]:
+        print(f"{us / 1000:>8.1f}  {name}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: deferred modules imported at startup: {', '.join(loaded)}")
+        failed = True
+    if median_ms > budget_ms:
+        print(f"FAIL: startup import exceeds budget by {median_ms - budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    sys.exit(run(args.target, args.runs, args.budget_ms, args.top))
+
+
+if __name__ == "__main__":
+    main()
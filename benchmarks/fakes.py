@@ -0,0 +1,174 @@
+"""
+Local stand-ins for the pipeline's network-bound dependencies.
+
+Used by the benchmarks to exercise the real chunking, indexing, retrieval,
+context assembly and API code without YouTube, Groq or a downloaded
+embedding model.
+"""
+import asyncio
+import time
+import zlib
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from app.core.metrics import stage_timer
+from app.services.transcript_segments import TranscriptSegments
+from app.utils.helpers import extract_video_id_from_url
+
+WORDS = (
+    "the video explains how models learn from data and why training takes time "
+    "we look at gradients loss functions optimizers and evaluation on held out sets "
+    "then the speaker compares transformers with recurrent networks attention heads "
+    "tokenizers context windows retrieval augmented generation vector search indexes "
+    "latency throughput memory bandwidth caching batching quantization and deployment"
+).split()
+
+# Speaking rate of a typical talk, and YouTube's usual caption segment length
+WORDS_PER_MINUTE = 150
+SEGMENT_SECONDS = 4.0
+
+
+def video_id_for(minutes: float, n: int = 0) -> str:
+    """A valid 11-character video ID that encodes the transcript length."""
+    return f"{int(minutes):05d}x{n:05d}"
+
+
+def minutes_of(video_id: str) -> int:
+    return int(video_id[:5])
+
+
+def synthetic_transcript(minutes: float, seed: int = 0) -> TranscriptSegments:
+    """A timed transcript of ``minutes`` of speech, deterministic per seed."""
+    rng = np.random.default_rng(seed)
+    words_per_segment = max(1, int(WORDS_PER_MINUTE * SEGMENT_SECONDS / 60))
+    segments = max(1, int(minutes * 60 / SEGMENT_SECONDS))
+    picks = rng.integers(0, len(WORDS), size=(segments, words_per_segment))
+    items = [
+        {"text": " ".join(WORDS[i] for i in row), "start": n * SEGMENT_SECONDS, "duration": SEGMENT_SECONDS}
+        for n, row in enumerate(picks)
+    ]
+    return TranscriptSegments.from_items(items)
+
+
+def synthetic_questions(n: int, seed: int = 0) -> List[str]:
+    rng = np.random.default_rng(seed)
+    return [
+        "what does the speaker say about " + " and ".join(WORDS[i] for i in rng.integers(0, len(WORDS), size=3))
+        for _ in range(n)
+    ]
+
+
+class NoBrowserPool:
+    """Browser pool stand-in for services that never scrape."""
+
+    def start(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FakeTranscriptService:
+    """
+    Serves synthetic transcripts whose length is encoded in the video ID
+    (see ``video_id_for``), after an optional simulated network delay.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.cache = None
+        self.browser_pool = NoBrowserPool()
+
+    def fetch_segments(self, video_url: str, languages: list = None) -> TranscriptSegments:
+        video_id = extract_video_id_from_url(video_url)
+        if self.latency:
+            time.sleep(self.latency)
+        return synthetic_transcript(minutes_of(video_id), seed=zlib.crc32(video_id.encode()))
+
+    def fetch_transcript(self, video_url: str, languages: list = None) -> str:
+        return self.fetch_segments(video_url, languages).text
+
+    def invalidate(self, video_id: str, languages: list = None) -> None:
+        pass
+
+
+class FakeEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embeddings.
+
+    Each word maps to a fixed random unit vector and a text embeds to the
+    normalized mean of its words, so related texts land close together and
+    retrieval returns sensible neighbours. Far cheaper than a real model;
+    use ``seconds_per_text`` to simulate model cost. Records the same stage
+    timings as FastEmbedEmbeddings.
+    """
+
+    def __init__(self, dim: int = 384, seconds_per_text: float = 0.0):
+        self.dim = dim
+        self.seconds_per_text = seconds_per_text
+        self._word_vectors = {}
+
+    def _word_vector(self, word: str) -> np.ndarray:
+        vector = self._word_vectors.get(word)
+        if vector is None:
+            vector = np.random.default_rng(zlib.crc32(word.encode())).standard_normal(self.dim).astype(np.float32)
+            self._word_vectors[word] = vector
+        return vector
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if self.seconds_per_text:
+            time.sleep(self.seconds_per_text * len(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[i] += self._word_vector(word)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        with stage_timer("embedding"):
+            return self._embed(texts)
+
+    def embed_documents(self, texts):
+        return list(self.embed_array(texts))
+
+    def embed_query(self, text):
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        with stage_timer("query_embedding"):
+            return self._embed(texts)
+
+
+class FakeChatModel:
+    """
+    Chat model stand-in with a fixed generation latency.
+
+    Supports the ``invoke``/``ainvoke``/``astream`` calls LLMService makes;
+    streaming spreads the latency evenly over ``tokens`` chunks.
+    """
+
+    def __init__(self, latency: float = 0.5, tokens: int = 50):
+        self.latency = latency
+        self.tokens = tokens
+
+    def _answer(self, prompt) -> str:
+        return f"Synthetic answer from {len(str(prompt))} prompt characters."
+
+    def invoke(self, prompt):
+        time.sleep(self.latency)
+        return AIMessage(content=self._answer(prompt))
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.latency)
+        return AIMessage(content=self._answer(prompt))
+
+    async def astream(self, prompt):
+        words = self._answer(prompt).split()
+        delay = self.latency / self.tokens
+        for i in range(self.tokens):
+            await asyncio.sleep(delay)
+            yield AIMessageChunk(content=words[i % len(words)] + " ")
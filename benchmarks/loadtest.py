@@ -0,0 +1,334 @@
+"""
+Concurrency load test of /ask against a local Groq-compatible stub.
+
+Starts benchmarks.stub_llm_server and the API (benchmarks.loadtest_app,
+the real app with stub transcripts) under uvicorn with each requested
+worker count, then drives /ask with closed-loop clients at each
+concurrency level for a fixed duration. Per level it reports throughput,
+p50/p95/p99 latency, error rate, event loop lag (from the app's
+event_loop_lag_seconds histogram, aggregated over workers) and the RSS of
+the uvicorn process tree.
+
+Each worker keeps its own indexes, so a warm-up phase sends enough
+requests for every worker to have built every video before measuring.
+Use --cold-fraction to mix in requests for never-seen videos.
+
+Usage:
+    python -m benchmarks.loadtest --workers 1 4 --concurrency 1 8 32 64 --duration 20 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+
+from benchmarks.fakes import synthetic_questions, video_id_for
+
+PERCENTILES = (50, 95, 99)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_process(args: list, env: dict, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(
+        [sys.executable, *args], env=env, stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+    )
+
+
+def stop_process(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+
+
+def wait_until_ok(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url}: server exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise TimeoutError(f"{url} not ready after {timeout:.0f}s")
+
+
+def rss_bytes(pid: int) -> int:
+    """Resident memory of a process and all its descendants (Linux /proc)."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields resume after ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def scrape_lag(base_url: str) -> dict:
+    """Cumulative event loop lag histogram: {"sum", "count", "buckets": {le: count}}."""
+    from prometheus_client.parser import text_string_to_metric_families
+
+    lag = {"sum": 0.0, "count": 0.0, "buckets": {}}
+    text = httpx.get(f"{base_url}/metrics", timeout=10).text
+    for family in text_string_to_metric_families(text):
+        if family.name != "event_loop_lag_seconds":
+            continue
+        for sample in family.samples:
+            if sample.name.endswith("_bucket"):
+                le = float(sample.labels["le"])
+                lag["buckets"][le] = lag["buckets"].get(le, 0.0) + sample.value
+            elif sample.name.endswith("_sum"):
+                lag["sum"] += sample.value
+            elif sample.name.endswith("_count"):
+                lag["count"] += sample.value
+    return lag
+
+
+def lag_summary(before: dict, after: dict) -> dict:
+    """Mean lag and the bucket bounds holding the p99 and the worst probe."""
+    count = after["count"] - before["count"]
+    if count <= 0:
+        return {"probes": 0}
+    deltas = sorted((le, after["buckets"][le] - before["buckets"].get(le, 0.0)) for le in after["buckets"])
+    p99 = next(le for le, cumulative in deltas if cumulative >= 0.99 * count)
+    worst = next(le for le, cumulative in deltas if cumulative >= count)
+    return {
+        "probes": int(count),
+        "mean_ms": round((after["sum"] - before["sum"]) / count * 1000, 3),
+        "p99_le_ms": p99 * 1000,
+        "max_le_ms": worst * 1000,
+    }
+
+
+async def drive(base_url: str, concurrency: int, duration: float, pick_request, timeout: float, pid: int) -> dict:
+    """Closed-loop clients issuing /ask until ``duration`` elapses."""
+    latencies, statuses = [], Counter()
+    rss_samples = []
+    deadline = time.monotonic() + duration
+
+    async def client_loop(client):
+        while time.monotonic() < deadline:
+            payload = pick_request()
+            start = time.perf_counter()
+            try:
+                response = await client.post("/ask", json=payload)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            statuses[status] += 1
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+
+    async def sample_rss():
+        while time.monotonic() < deadline:
+            rss_samples.append(rss_bytes(pid))
+            await asyncio.sleep(0.5)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(sample_rss(), *(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    total = sum(statuses.values())
+    errors = total - statuses[200]
+    values = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "throughput_rps": round(statuses[200] / elapsed, 3),
+        "latency_ms": {
+            **{f"p{p}": round(float(np.percentile(values, p)), 3) for p in PERCENTILES},
+            "mean": round(float(values.mean()), 3),
+            "max": round(float(values.max()), 3),
+        },
+        "rss_mb": {
+            "peak": round(max(rss_samples, default=0) / 2**20, 1),
+            "end": round(rss_samples[-1] / 2**20, 1) if rss_samples else 0.0,
+        },
+    }
+
+
+async def warm_up(base_url: str, videos: list, workers: int, question: str, timeout: float) -> None:
+    """Ask about every video repeatedly so each worker (most likely) has built every index."""
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        for _ in range(2 * workers):
+            await asyncio.gather(*(
+                client.post("/ask", json={"video_url": video, "question": question}) for video in videos
+            ))
+
+
+def server_env(args, workdir: str, llm_url: str) -> dict:
+    metrics_dir = os.path.join(workdir, "prometheus")
+    os.makedirs(metrics_dir, exist_ok=True)
+    return dict(
+        os.environ,
+        GROQ_BASE_URL=llm_url,
+        GROQ_API_KEY="loadtest",
+        LOADTEST_TRANSCRIPT_LATENCY=str(args.transcript_latency),
+        LOADTEST_REAL_EMBEDDINGS="true" if args.real_embeddings else "false",
+        ANSWER_CACHE_ENABLED="true" if args.answer_cache else "false",
+        PROMETHEUS_MULTIPROC_DIR=metrics_dir,
+        CORPUS_INDEX_DIR=os.path.join(workdir, "corpus"),
+        INDEX_CACHE_DIR=os.path.join(workdir, "indexes"),
+        TRANSCRIPT_CACHE_PATH=os.path.join(workdir, "transcripts.sqlite3"),
+        EMBEDDING_CACHE_ENABLED="false",
+        # Every load-test client shares one IP
+        RATE_LIMIT_ENABLED="false",
+        LOG_LEVEL="WARNING",
+        LOG_FILE="",
+    )
+
+
+def run(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    llm_port = free_port()
+    stub = start_process(
+        ["-m", "benchmarks.stub_llm_server", "--port", str(llm_port), "--latency", str(args.llm_latency),
+         "--jitter", str(args.llm_jitter), "--error-rate", str(args.llm_error_rate)],
+        dict(os.environ), os.path.join(workdir, "stub.log"),
+    )
+    llm_url = f"http://127.0.0.1:{llm_port}"
+
+    rng = random.Random(0)
+    questions = synthetic_questions(500, seed=3)
+    videos = [video_id_for(args.minutes, i) for i in range(args.videos)]
+    cold_counter = iter(range(args.videos, 10**5))
+
+    def pick_request() -> dict:
+        if args.cold_fraction and rng.random() < args.cold_fraction:
+            video = video_id_for(args.minutes, next(cold_counter))
+        else:
+            video = rng.choice(videos)
+        return {"video_url": video, "question": rng.choice(questions)}
+
+    result = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "llm_latency": args.llm_latency,
+            "llm_jitter": args.llm_jitter,
+            "llm_error_rate": args.llm_error_rate,
+            "transcript_latency": args.transcript_latency,
+            "transcript_minutes": args.minutes,
+            "videos": args.videos,
+            "cold_fraction": args.cold_fraction,
+            "embeddings": "real" if args.real_embeddings else "fake",
+            "answer_cache": args.answer_cache,
+            "duration": args.duration,
+        },
+        "levels": [],
+    }
+    print(f"{'workers':>7} {'conc':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'err %':>6} {'lag ms':>7} {'lag p99':>8} {'rss MB':>7}")
+    try:
+        wait_until_ok(f"{llm_url}/stats", stub, timeout=30)
+        for workers in args.workers:
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server_dir = tempfile.mkdtemp(dir=workdir, prefix=f"workers-{workers}-")
+            server = start_process(
+                ["-m", "uvicorn", "benchmarks.loadtest_app:app", "--host", "127.0.0.1", "--port", str(port),
+                 "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+                server_env(args, server_dir, llm_url), os.path.join(server_dir, "server.log"),
+            )
+            try:
+                wait_until_ok(f"{base_url}/ready", server, timeout=args.startup_timeout)
+                asyncio.run(warm_up(base_url, videos, workers, questions[0], args.timeout))
+
+                for concurrency in args.concurrency:
+                    lag_before = scrape_lag(base_url)
+                    level = asyncio.run(drive(base_url, concurrency, args.duration, pick_request,
+                                              args.timeout, server.pid))
+                    level = {"workers": workers, "concurrency": concurrency, **level,
+                             "event_loop_lag": lag_summary(lag_before, scrape_lag(base_url))}
+                    result["levels"].append(level)
+                    latency, lag = level["latency_ms"], level["event_loop_lag"]
+                    print(
+                        f"{workers:>7} {concurrency:>5} {level['throughput_rps']:>8.1f} {latency['p50']:>8.1f} "
+                        f"{latency['p95']:>8.1f} {latency['p99']:>8.1f} {level['error_rate'] * 100:>6.2f} "
+                        f"{lag.get('mean_ms', 0):>7.2f} {lag.get('p99_le_ms', 0):>8.1f} {level['rss_mb']['peak']:>7.1f}"
+                    )
+            finally:
+                stop_process(server)
+    finally:
+        stop_process(stub)
+    print(f"Server logs in {workdir}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=20, help="seconds per concurrency level")
+    parser.add_argument("--minutes", type=float, default=30, help="synthetic transcript length")
+    parser.add_argument("--videos", type=int, default=10, help="distinct warm videos")
+    parser.add_argument("--cold-fraction", type=float, default=0.0,
+                        help="fraction of requests for never-seen videos")
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--transcript-latency", type=float, default=0.3)
+    parser.add_argument("--real-embeddings", action="store_true",
+                        help="use the configured FastEmbed model (must already be downloaded)")
+    parser.add_argument("--answer-cache", action="store_true", help="enable the semantic answer cache")
+    parser.add_argument("--timeout", type=float, default=120, help="client timeout per request")
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    result = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
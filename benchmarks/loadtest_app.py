@@ -0,0 +1,30 @@
+"""
+The API wired to local stand-ins, for load tests under uvicorn.
+
+Transcripts come from FakeTranscriptService and, unless
+LOADTEST_REAL_EMBEDDINGS is set, embeddings from FakeEmbeddings. The LLM
+path is left untouched: point GROQ_BASE_URL at benchmarks.stub_llm_server
+so answers go through the real Groq client over HTTP.
+
+Environment:
+    LOADTEST_TRANSCRIPT_LATENCY   seconds per simulated transcript fetch (default 0.3)
+    LOADTEST_REAL_EMBEDDINGS      "true" to use the configured FastEmbed model
+
+Usage:
+    GROQ_BASE_URL=http://127.0.0.1:8100 GROQ_API_KEY=stub \\
+        uvicorn benchmarks.loadtest_app:app --workers 2
+"""
+import os
+
+from app.api import deps
+from app.main import app
+from app.services.vectorstore_service import VectorStoreService
+from benchmarks.fakes import FakeEmbeddings, FakeTranscriptService
+
+deps.get_transcript_service.set(
+    FakeTranscriptService(latency=float(os.getenv("LOADTEST_TRANSCRIPT_LATENCY", "0.3")))
+)
+if os.getenv("LOADTEST_REAL_EMBEDDINGS", "false").lower() != "true":
+    deps.get_vectorstore_service.set(VectorStoreService(embedding_model=FakeEmbeddings()))
+
+__all__ = ["app"]
@@ -0,0 +1,134 @@
+"""
+Local Groq/OpenAI-compatible chat completions server for load tests.
+
+Answers POST /openai/v1/chat/completions (Groq's path) and
+/v1/chat/completions after a configurable latency, streamed or not, and
+can inject 429/503 responses to exercise retry and backpressure paths.
+
+Point the app at it with GROQ_BASE_URL=http://127.0.0.1:<port>.
+
+Usage:
+    python -m benchmarks.stub_llm_server --port 8100 --latency 0.8 --jitter 0.2 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+ANSWER = (
+    "Based on the video, the speaker explains the main idea step by step, "
+    "gives an example and summarizes the key takeaways at the end."
+)
+
+
+def create_app(latency: float = 0.8, jitter: float = 0.0, error_rate: float = 0.0, tokens: int = 40) -> FastAPI:
+    """
+    Build the stub server.
+
+    Args:
+        latency: Mean seconds until the full answer is produced
+        jitter: Uniform +/- seconds added to each call's latency
+        error_rate: Fraction of calls answered with 429 or 503
+        tokens: Chunks a streamed answer is split into
+    """
+    app = FastAPI(title="Stub chat completions")
+    stats = {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def completion(model: str, prompt_chars: int) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": ANSWER},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(ANSWER) // 4,
+                "total_tokens": (prompt_chars + len(ANSWER)) // 4,
+            },
+        }
+
+    def chunk(completion_id: str, model: str, delta: dict, finish_reason=None) -> str:
+        body = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "stub")
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in body.get("messages", []))
+        stats["requests"] += 1
+
+        if error_rate and random.random() < error_rate:
+            stats["errors"] += 1
+            status = random.choice((429, 503))
+            return JSONResponse(
+                {"error": {"message": "stub overloaded", "type": "rate_limit_exceeded"}},
+                status_code=status,
+                headers={"Retry-After": "1"},
+            )
+
+        delay = max(0.0, latency + random.uniform(-jitter, jitter))
+        if not body.get("stream"):
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                stats["in_flight"] -= 1
+            return JSONResponse(completion(model, prompt_chars))
+
+        async def events():
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+            words = ANSWER.split()
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            try:
+                yield chunk(completion_id, model, {"role": "assistant", "content": ""})
+                for i in range(tokens):
+                    await asyncio.sleep(delay / tokens)
+                    yield chunk(completion_id, model, {"content": words[i % len(words)] + " "})
+                yield chunk(completion_id, model, {}, finish_reason="stop")
+                yield "data: [DONE]\n\n"
+            finally:
+                stats["in_flight"] -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app.add_api_route("/openai/v1/chat/completions", chat_completions, methods=["POST"])
+    app.add_api_route("/v1/chat/completions", chat_completions, methods=["POST"])
+    app.add_api_route("/stats", lambda: dict(stats), methods=["GET"])
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.8)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--tokens", type=int, default=40)
+    args = parser.parse_args()
+    app = create_app(args.latency, args.jitter, args.error_rate, args.tokens)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Unit tests for rate limiting and admission control.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.core.config import settings
+from app.main import app
+from app.services.admission import COLD, WARM, AdmissionController
+from app.utils.limiter import ConcurrencyLimiter, OverloadedError
+from app.utils.rate_limit import InMemoryRateLimitBackend, RateLimitedError, TokenBucketRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fake_request(host="10.0.0.1", api_key=None):
+    headers = {settings.RATE_LIMIT_KEY_HEADER: api_key} if api_key else {}
+    return SimpleNamespace(headers=headers, client=SimpleNamespace(host=host))
+
+
+class TestTokenBucket:
+    """Test the token bucket arithmetic."""
+
+    def test_burst_then_refill(self):
+        """A full bucket allows a burst, then refills at the configured rate."""
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(rate=2, burst=3, backend=InMemoryRateLimitBackend(clock=clock))
+        for _ in range(3):
+            limiter.check("client")
+        with pytest.raises(RateLimitedError) as info:
+            limiter.check("client")
+        assert info.value.retry_after == pytest.approx(0.5)
+
+        clock.now = 0.5
+        limiter.check("client")
+
+    def test_clients_have_separate_buckets(self):
+        """One client using up its budget does not affect another."""
+        limiter = TokenBucketRateLimiter(rate=1, burst=1)
+        limiter.check("a")
+        limiter.check("b")
+        with pytest.raises(RateLimitedError):
+            limiter.check("a")
+
+    def test_cost_above_burst_is_capped(self):
+        """An expensive request is possible with a full bucket."""
+        limiter = TokenBucketRateLimiter(rate=1, burst=5)
+        limiter.check("client", cost=50)
+        with pytest.raises(RateLimitedError):
+            limiter.check("client")
+
+    def test_backend_is_bounded(self):
+        """Least recently used buckets are dropped beyond max_keys."""
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        for key in ("a", "b", "c"):
+            backend.take(key, 1, rate=1, burst=1)
+        assert len(backend) == 2
+
+
+class TestAdmissionController:
+    """Test cost classes and the global work queue."""
+
+    def test_cold_videos_cost_more(self, monkeypatch):
+        """Cold videos pay the extra fetch-and-embed cost; warm ones do not."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_WARM_COST", 1.0)
+        monkeypatch.setattr(settings, "RATE_LIMIT_COLD_COST", 10.0)
+        assert AdmissionController.cost(WARM) == 1.0
+        assert AdmissionController.cost(WARM, questions=4) == 4.0
+        assert AdmissionController.cost(COLD) == 11.0
+
+    def test_api_key_takes_precedence_over_ip(self, monkeypatch):
+        """Clients sending a known API key share one bucket across IPs, without storing the key."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_API_KEYS", frozenset({"secret"}))
+        first = AdmissionController.client_key(fake_request("10.0.0.1", api_key="secret"))
+        second = AdmissionController.client_key(fake_request("10.0.0.2", api_key="secret"))
+        assert first == second
+        assert "secret" not in first
+        assert AdmissionController.client_key(fake_request("10.0.0.1")) == "ip:10.0.0.1"
+
+    def test_unknown_api_key_falls_back_to_ip(self, monkeypatch):
+        """Invented keys do not buy a fresh bucket."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_API_KEYS", frozenset({"secret"}))
+        request = fake_request("10.0.0.1", api_key="made-up")
+        assert AdmissionController.client_key(request) == "ip:10.0.0.1"
+
+    def test_cold_requests_exhaust_budget_first(self, monkeypatch):
+        """The same budget admits many warm questions but few cold videos."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+        monkeypatch.setattr(settings, "RATE_LIMIT_RATE", 0.0)
+        monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 20.0)
+        monkeypatch.setattr(settings, "RATE_LIMIT_WARM_COST", 1.0)
+        monkeypatch.setattr(settings, "RATE_LIMIT_COLD_COST", 9.0)
+
+        async def admitted(controller, indexed):
+            count = 0
+            while True:
+                try:
+                    async with controller.admit(fake_request(), indexed=indexed):
+                        count += 1
+                except RateLimitedError:
+                    return count
+
+        assert asyncio.run(admitted(AdmissionController(), indexed=True)) == 20
+        assert asyncio.run(admitted(AdmissionController(), indexed=False)) == 2
+
+    def test_rejects_when_work_queue_full(self, monkeypatch):
+        """With every slot taken and no queue, new requests are turned away."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+        controller = AdmissionController(limiter=ConcurrencyLimiter("test-ask", 1, 0, 1.0))
+
+        async def main():
+            async with controller.admit(fake_request(), indexed=True):
+                with pytest.raises(OverloadedError):
+                    async with controller.admit(fake_request(), indexed=True):
+                        pass
+            return controller.limiter.in_flight
+
+        assert asyncio.run(main()) == 0
+
+
+class TestAskAdmission:
+    """Test how /ask and /ingest report rejected requests."""
+
+    @pytest.fixture
+    def client(self):
+        vectorstore_service = SimpleNamespace(index_version=lambda video_id: None)
+        app.dependency_overrides.update({
+            deps.get_rag_pipeline: lambda: None,
+            deps.get_vectorstore_service: lambda: vectorstore_service,
+            deps.get_llm_service: lambda: None,
+            deps.get_answer_cache: lambda: None,
+            deps.get_ingest_service: lambda: None,
+        })
+        try:
+            yield TestClient(app)
+        finally:
+            app.dependency_overrides.clear()
+
+    def ask(self, client, controller):
+        app.dependency_overrides[deps.get_admission_controller] = lambda: controller
+        return client.post("/ask", json={"video_url": "dQw4w9WgXcQ", "question": "What is this about?"})
+
+    def test_rate_limited_request_gets_429(self, client, monkeypatch):
+        """A client over budget gets 429 with a Retry-After header."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+        controller = AdmissionController()
+        controller.rate_limiter = TokenBucketRateLimiter(rate=0.5, burst=1)
+        controller.rate_limiter.check("ip:testclient")
+
+        response = self.ask(client, controller)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_overloaded_request_gets_503(self, client, monkeypatch):
+        """A full work queue gives 503 with a Retry-After header."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+        limiter = ConcurrencyLimiter("test-ask", 0, 0, 1.0)
+        response = self.ask(client, AdmissionController(limiter=limiter))
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_ingest_is_charged_to_the_client(self, client, monkeypatch):
+        """Ingestion jobs spend the same budget as cold questions."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+        controller = AdmissionController()
+        controller.rate_limiter = TokenBucketRateLimiter(rate=0.5, burst=1)
+        controller.rate_limiter.check("ip:testclient")
+        app.dependency_overrides[deps.get_admission_controller] = lambda: controller
+
+        response = client.post("/ingest", json={"video_urls": ["dQw4w9WgXcQ"]})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+
+
+class TestDeleteVideoAdmission:
+    """Test that deleting a video needs an admin key and is charged."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_API_KEYS", frozenset({"admin-secret"}))
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+        removed = []
+        controller = AdmissionController()
+        controller.rate_limiter = TokenBucketRateLimiter(rate=0.01, burst=settings.RATE_LIMIT_COLD_COST)
+        app.dependency_overrides.update({
+            deps.get_vectorstore_service: lambda: SimpleNamespace(remove_video=lambda v: removed.append(v) or True),
+            deps.get_transcript_service: lambda: SimpleNamespace(invalidate=lambda v: None),
+            deps.get_answer_cache: lambda: None,
+            deps.get_session_service: lambda: SimpleNamespace(close_video=lambda v: 0),
+            deps.get_admission_controller: lambda: controller,
+        })
+        try:
+            yield TestClient(app), removed
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_requires_admin_key(self, client):
+        """Anonymous or wrongly keyed clients cannot delete anything."""
+        client, removed = client
+        assert client.delete("/videos/dQw4w9WgXcQ").status_code == 403
+        assert client.delete("/videos/dQw4w9WgXcQ", headers={"X-Admin-Key": "guess"}).status_code == 403
+        assert removed == []
+
+    def test_admin_delete_is_charged(self, client):
+        """An admin's deletes spend the same budget as cold videos."""
+        client, removed = client
+        headers = {"X-Admin-Key": "admin-secret"}
+        assert client.delete("/videos/dQw4w9WgXcQ", headers=headers).status_code == 200
+        assert client.delete("/videos/dQw4w9WgXcQ", headers=headers).status_code == 429
+        assert removed == ["dQw4w9WgXcQ"]
@@ -0,0 +1,50 @@
+"""
+Unit tests for the semantic answer cache.
+"""
+import time
+
+import numpy as np
+
+from app.services.answer_cache import SemanticAnswerCache
+
+
+def vec(*values):
+    return np.array(values, dtype=np.float32)
+
+
+class TestSemanticAnswerCache:
+    """Test nearest-neighbour lookup, expiry and invalidation."""
+
+    def test_returns_answer_above_threshold(self):
+        cache = SemanticAnswerCache(threshold=0.9, ttl=60, max_per_video=10, max_videos=10)
+        cache.store("vid", "v1", vec(1, 0, 0), "It is about cats.")
+
+        assert cache.lookup("vid", "v1", vec(0.99, 0.05, 0)) == "It is about cats."
+        assert cache.lookup("vid", "v1", vec(0, 1, 0)) is None
+        assert cache.lookup("other", "v1", vec(1, 0, 0)) is None
+        assert cache.stats()["hits"] == 1
+
+    def test_version_change_invalidates(self):
+        cache = SemanticAnswerCache(threshold=0.9, ttl=60, max_per_video=10, max_videos=10)
+        cache.store("vid", "v1", vec(1, 0), "old answer")
+        assert cache.lookup("vid", "v2", vec(1, 0)) is None
+        assert cache.lookup("vid", "v1", vec(1, 0)) is None
+
+    def test_entries_expire(self):
+        cache = SemanticAnswerCache(threshold=0.9, ttl=0.05, max_per_video=10, max_videos=10)
+        cache.store("vid", "v1", vec(1, 0), "answer")
+        time.sleep(0.1)
+        assert cache.lookup("vid", "v1", vec(1, 0)) is None
+
+    def test_size_limits(self):
+        cache = SemanticAnswerCache(threshold=0.9, ttl=60, max_per_video=2, max_videos=2)
+        cache.store("a", "v", vec(1, 0, 0), "first")
+        cache.store("a", "v", vec(0, 1, 0), "second")
+        cache.store("a", "v", vec(0, 0, 1), "third")
+        assert cache.lookup("a", "v", vec(1, 0, 0)) is None
+        assert cache.lookup("a", "v", vec(0, 0, 1)) == "third"
+
+        cache.store("b", "v", vec(1, 0, 0), "b")
+        cache.store("c", "v", vec(1, 0, 0), "c")
+        assert cache.stats()["videos"] == 2
+        assert cache.lookup("a", "v", vec(0, 0, 1)) is None
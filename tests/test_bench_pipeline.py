@@ -0,0 +1,53 @@
+"""
+Smoke test for the offline pipeline benchmark and its stand-ins.
+"""
+import argparse
+
+from app.core.config import settings
+from app.main import app
+from benchmarks import bench_pipeline
+from benchmarks.fakes import FakeEmbeddings, FakeTranscriptService, video_id_for
+
+
+class TestFakes:
+    """Test the local stand-ins used by the benchmarks."""
+
+    def test_transcript_length_follows_video_id(self):
+        service = FakeTranscriptService()
+        short = service.fetch_segments(video_id_for(1))
+        long = service.fetch_segments(video_id_for(10))
+
+        assert len(long) == 10 * len(short)
+        assert service.fetch_segments(video_id_for(1)).text == short.text
+
+    def test_embeddings_are_normalized_and_deterministic(self):
+        embeddings = FakeEmbeddings(dim=16)
+        vectors = embeddings.embed_array(["gradients and loss", "tokenizers"])
+
+        assert vectors.shape == (2, 16)
+        assert abs(float((vectors[0] ** 2).sum()) - 1) < 1e-5
+        assert (FakeEmbeddings(dim=16).embed_query("tokenizers") == vectors[1]).all()
+
+
+class TestBenchPipeline:
+    """Test that the benchmark runs end to end without network access."""
+
+    def test_run_reports_stages_and_percentiles(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(app, "dependency_overrides", {})
+        monkeypatch.setattr(bench_pipeline.tempfile, "tempdir", str(tmp_path))
+        before = {name: getattr(settings, name) for name in ("CORPUS_INDEX_DIR", "INDEX_CACHE_DIR", "EMBEDDING_CACHE_ENABLED")}
+        args = argparse.Namespace(
+            minutes=[1], queries=2, scenarios=["warm", "cold"], ask_minutes=2, concurrency=[2],
+            requests=4, cold_requests=2, llm_latency=0.0, transcript_latency=0.0,
+            embed_seconds_per_text=0.0, real_embeddings=False, answer_cache=False,
+        )
+
+        result = bench_pipeline.run(args)
+
+        assert {"chunking", "embedding", "index_build"} <= set(result["stages"][0]["ingest_stages"])
+        assert "retrieval" in result["stages"][0]["question_stages"]
+        assert [row["scenario"] for row in result["ask"]] == ["warm", "cold"]
+        assert all(row["errors"] == 0 and row["latency_ms"]["p95"] > 0 for row in result["ask"])
+        # The work directory is removed and the settings restored
+        assert list(tmp_path.iterdir()) == []
+        assert {name: getattr(settings, name) for name in before} == before
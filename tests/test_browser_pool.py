@@ -0,0 +1,93 @@
+"""
+Unit tests for the warm Chrome driver pool.
+"""
+import pytest
+
+from app.services.browser_pool import ChromeDriverPool, BrowserPoolTimeout
+
+
+class FakeDriver:
+    """Stands in for a webdriver.Chrome instance."""
+
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return "about:blank"
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakePool(ChromeDriverPool):
+    """Pool that creates fake drivers instead of launching Chrome."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.created = []
+
+    def _create_driver(self):
+        driver = FakeDriver()
+        self.created.append(driver)
+        return driver
+
+
+class TestChromeDriverPool:
+    """Test reuse, recycling and bounded acquisition."""
+
+    def test_reuses_drivers(self):
+        pool = FakePool(size=2, max_uses=10, acquire_timeout=1, warm=0)
+        for _ in range(5):
+            with pool.driver():
+                pass
+        assert len(pool.created) == 1
+
+    def test_recycles_after_max_uses(self):
+        pool = FakePool(size=1, max_uses=2, acquire_timeout=1, warm=0)
+        for _ in range(4):
+            with pool.driver():
+                pass
+        assert len(pool.created) == 2
+        assert pool.created[0].quit_called
+
+    def test_replaces_crashed_driver(self):
+        pool = FakePool(size=1, max_uses=10, acquire_timeout=1, warm=0)
+        with pool.driver() as driver:
+            pass
+        driver.alive = False
+        with pool.driver() as replacement:
+            assert replacement is not driver
+        assert driver.quit_called
+
+    def test_discards_driver_when_block_raises(self):
+        pool = FakePool(size=1, max_uses=10, acquire_timeout=1, warm=0)
+        with pytest.raises(ValueError):
+            with pool.driver():
+                raise ValueError("scrape failed")
+        with pool.driver():
+            pass
+        assert len(pool.created) == 2
+
+    def test_acquire_times_out_when_exhausted(self):
+        pool = FakePool(size=1, max_uses=10, acquire_timeout=0.05, warm=0)
+        with pool.driver():
+            with pytest.raises(BrowserPoolTimeout):
+                with pool.driver():
+                    pass
+
+    def test_start_prewarms(self):
+        pool = FakePool(size=3, max_uses=10, acquire_timeout=1, warm=2)
+        pool.start()
+        assert len(pool.created) == 2
+        pool.close()
+        assert all(d.quit_called for d in pool.created)
@@ -0,0 +1,82 @@
+"""
+Unit tests for the in-process and transcript caches.
+"""
+import os
+import time
+
+from app.utils.cache import LRUCache
+from app.services.transcript_cache import TranscriptCache
+from app.services.transcript_segments import TranscriptSegments
+
+
+def segments(text):
+    return TranscriptSegments.from_items([{"text": text, "start": 0.0, "duration": 1.0}])
+
+
+class TestLRUCache:
+    """Test the size-bounded LRU cache."""
+
+    def test_evicts_least_recently_used_by_size(self):
+        """Eviction is driven by total size, oldest access first."""
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", "a", size=4)
+        cache.put("b", "b", size=4)
+        assert cache.get("a") == "a"
+        cache.put("c", "c", size=4)
+
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 8
+
+    def test_rejects_oversized_values(self):
+        """A value larger than the budget is not stored."""
+        cache = LRUCache(max_bytes=10)
+        assert cache.put("big", "x", size=11) is False
+        assert cache.get("big") is None
+        assert cache.stats()["misses"] == 1
+
+    def test_entry_cap_protects_small_entries(self):
+        """An entry above the per-entry cap does not flush smaller ones."""
+        cache = LRUCache(max_bytes=100, max_entry_bytes=30)
+        for i in range(5):
+            cache.put(i, i, size=10)
+        assert cache.put("lecture", "x", size=60) is False
+        assert len(cache) == 5
+
+
+class TestTranscriptCache:
+    """Test the two-level transcript cache."""
+
+    def make_cache(self, tmp_path, **kwargs):
+        options = dict(ttl=60, negative_ttl=60, max_bytes=10_000, memory_bytes=10_000)
+        options.update(kwargs)
+        return TranscriptCache(path=str(tmp_path / "t.sqlite3"), **options)
+
+    def test_persists_across_instances(self, tmp_path):
+        """Transcripts survive a new cache instance via SQLite."""
+        self.make_cache(tmp_path).put("vid:en", segments("hello world"))
+        entry = self.make_cache(tmp_path).get("vid:en")
+        assert entry.ok and entry.text == "hello world"
+
+    def test_negative_entries_expire(self, tmp_path):
+        """Failures are cached for the negative TTL only."""
+        cache = self.make_cache(tmp_path, negative_ttl=0.05)
+        cache.put_failure("vid:en", "Transcript unavailable")
+        entry = cache.get("vid:en")
+        assert not entry.ok and entry.error == "Transcript unavailable"
+        time.sleep(0.1)
+        assert cache.get("vid:en") is None
+
+    def test_evicts_over_byte_budget(self, tmp_path):
+        """The disk store drops least recently accessed rows over budget."""
+        cache = self.make_cache(tmp_path, max_bytes=250, memory_bytes=1)
+        cache.put("a:en", segments(os.urandom(60).hex()))
+        cache.put("b:en", segments(os.urandom(60).hex()))
+        time.sleep(0.01)
+        assert cache.get("a:en") is not None
+        cache.put("c:en", segments(os.urandom(60).hex()))
+
+        assert cache.get("b:en") is None
+        assert cache.get("a:en") is not None
+        assert cache.get("c:en") is not None
@@ -0,0 +1,90 @@
+"""
+Unit tests for timed transcript segments and the segment-aligned chunker.
+"""
+import numpy as np
+import pytest
+
+from app.services.chunking import SegmentChunker
+from app.services.transcript_segments import TranscriptSegments
+
+
+def make_segments(count, words_per_segment=5):
+    return TranscriptSegments.from_items([
+        {"text": " ".join(f"w{i}_{j}" for j in range(words_per_segment)), "start": 2.0 * i, "duration": 2.0}
+        for i in range(count)
+    ])
+
+
+class TestTranscriptSegments:
+    """Test building and serializing segments."""
+
+    def test_spans_map_back_to_segment_text(self):
+        segments = TranscriptSegments.from_items([
+            {"text": "hello  there", "start": 0.0, "duration": 1.5},
+            {"text": "", "start": 1.5, "duration": 0.5},
+            {"text": "general kenobi", "start": 2.0, "duration": 1.0},
+        ])
+        assert segments.text == "hello there general kenobi"
+        assert len(segments) == 2
+        assert segments.span_text(1, 2) == "general kenobi"
+        assert segments.span_times(0, 2) == (0.0, 3.0)
+
+    def test_bytes_roundtrip(self):
+        segments = make_segments(10)
+        assert TranscriptSegments.from_bytes(segments.to_bytes()) == segments
+
+    def test_from_scraped_text_parses_timestamps(self):
+        segments = TranscriptSegments.from_text("00:00 intro\n01:05 main part\nno timestamp\n1:00:00.5 outro")
+        assert segments.span_text(0, 4) == "intro main part no timestamp outro"
+        np.testing.assert_allclose(segments.starts[[0, 1, 3]], [0.0, 65.0, 3600.5])
+        assert np.isnan(segments.starts[2])
+        assert segments.span_times(0, 1) == (0.0, 65.0)
+
+
+class TestSegmentChunker:
+    """Test segment-aligned chunking."""
+
+    def test_chunks_respect_size_and_boundaries(self):
+        segments = make_segments(200)
+        chunks = SegmentChunker(chunk_size=100, chunk_overlap=30).split(segments)
+        boundaries = {segments.span_text(i, i + 1) for i in range(len(segments))}
+
+        assert all(len(chunk.page_content) <= 100 for chunk in chunks)
+        for chunk in chunks:
+            # Every chunk is a run of whole segments
+            assert chunk.page_content.split(" ")[0].endswith("_0")
+            assert any(chunk.page_content.endswith(b) for b in boundaries)
+        assert chunks[-1].page_content.endswith(segments.span_text(199, 200))
+
+    def test_chunks_overlap_and_carry_timestamps(self):
+        segments = make_segments(50)
+        chunks = SegmentChunker(chunk_size=100, chunk_overlap=30).split(segments)
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.metadata["start"] < previous.metadata["end"]
+            assert current.metadata["start"] > previous.metadata["start"]
+        assert chunks[0].metadata["start"] == 0.0
+        assert chunks[-1].metadata["end"] == 100.0
+
+    def test_oversized_segment_is_split(self):
+        segments = TranscriptSegments.from_items([
+            {"text": "x" * 50, "start": 0.0, "duration": 1.0},
+            {"text": "y" * 500, "start": 1.0, "duration": 1.0},
+            {"text": "z" * 50, "start": 2.0, "duration": 1.0},
+        ])
+        chunks = SegmentChunker(chunk_size=100, chunk_overlap=20).split(segments)
+        assert chunks[0].page_content[0] == "x" and chunks[-1].page_content[0] == "z"
+        middle = chunks[1:-1]
+        assert len(middle) > 1
+        assert all(set(c.page_content) == {"y"} and len(c.page_content) <= 100 for c in middle)
+        assert all(c.metadata["start"] == 1.0 for c in middle)
+        assert segments.text[middle[1].metadata["start_index"]:].startswith(middle[1].page_content)
+
+    def test_text_without_line_breaks_is_split(self):
+        """Scraped text that is one long line still yields chunks within chunk_size."""
+        chunks = SegmentChunker(chunk_size=1000, chunk_overlap=200).split(TranscriptSegments.from_text("word " * 5000))
+        assert len(chunks) > 1
+        assert all(len(chunk.page_content) <= 1000 for chunk in chunks)
+
+    def test_rejects_overlap_not_smaller_than_size(self):
+        with pytest.raises(ValueError):
+            SegmentChunker(chunk_size=100, chunk_overlap=100)
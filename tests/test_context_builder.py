@@ -0,0 +1,66 @@
+"""
+Unit tests for token-budgeted context assembly.
+"""
+from langchain_core.documents import Document
+
+from app.services.chunking import SegmentChunker
+from app.services.context_builder import ContextBuilder, count_tokens
+from app.services.transcript_segments import TranscriptSegments
+
+TEXT = " ".join(f"word{i:03d}" for i in range(200))
+
+
+def chunk(start, length):
+    return Document(page_content=TEXT[start:start + length], metadata={"start_index": start})
+
+
+class TestContextBuilder:
+    """Test merging, redundancy filtering and the token budget."""
+
+    def test_overlapping_chunks_are_merged_once(self):
+        builder = ContextBuilder(token_budget=10_000, min_novelty=0.1)
+        merged = builder.build([chunk(80, 100), chunk(0, 100), chunk(180, 20)])
+
+        assert len(merged) == 1
+        assert merged[0].page_content == TEXT[0:200]
+        assert merged[0].metadata["start_index"] == 0
+
+    def test_adjacent_chunks_join_across_separator(self):
+        builder = ContextBuilder(token_budget=10_000, min_novelty=0.1)
+        merged = builder.build([chunk(0, 7), chunk(8, 7)])
+        assert [doc.page_content for doc in merged] == ["word000 word001"]
+
+    def test_disjoint_chunks_keep_transcript_order(self):
+        builder = ContextBuilder(token_budget=10_000, min_novelty=0.1)
+        merged = builder.build([chunk(400, 50), chunk(0, 50)])
+        assert [doc.metadata["start_index"] for doc in merged] == [0, 400]
+
+    def test_redundant_chunk_is_dropped(self):
+        builder = ContextBuilder(token_budget=10_000, min_novelty=0.5)
+        # Second chunk is 90% covered by the first, third is a duplicate without offsets
+        docs = [chunk(0, 100), chunk(10, 100), Document(page_content="x"), Document(page_content="x")]
+        merged = builder.build(docs)
+        assert [doc.page_content for doc in merged] == [TEXT[0:100], "x"]
+
+    def test_budget_keeps_most_relevant(self):
+        first, second, third = chunk(800, 200), chunk(0, 200), chunk(400, 200)
+        budget = count_tokens(first.page_content) + count_tokens(second.page_content)
+        merged = ContextBuilder(token_budget=budget, min_novelty=0.1).build([first, second, third])
+        assert [doc.metadata["start_index"] for doc in merged] == [0, 800]
+
+    def test_top_document_cut_to_budget(self):
+        merged = ContextBuilder(token_budget=10, min_novelty=0.1).build([chunk(0, 200), chunk(400, 20)])
+        assert [doc.page_content for doc in merged] == [TEXT[0:40]]
+
+    def test_merges_segment_chunks_with_timestamps(self):
+        segments = TranscriptSegments.from_items([
+            {"text": f"segment number {i}", "start": 2.0 * i, "duration": 2.0} for i in range(50)
+        ])
+        chunks = SegmentChunker(chunk_size=120, chunk_overlap=40).split(segments)
+        merged = ContextBuilder(token_budget=10_000, min_novelty=0.1).build([chunks[2], chunks[1], chunks[3]])
+
+        assert len(merged) == 1
+        start, end = chunks[1].metadata["start_index"], chunks[3].metadata["start_index"] + len(chunks[3].page_content)
+        assert merged[0].page_content == segments.text[start:end]
+        assert merged[0].metadata["start"] == chunks[1].metadata["start"]
+        assert merged[0].metadata["end"] == chunks[3].metadata["end"]
@@ -0,0 +1,158 @@
+"""
+Unit tests for the shared cross-video corpus index.
+"""
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+
+from app.services.corpus_index import CorpusIndex, CorpusVideo
+from app.services.vectorstore_service import VectorStoreService
+from app.utils.cache import LRUCache
+from tests.test_vectorstore_service import make_embeddings
+
+
+def add(corpus, video_id, count, seed, version=None):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, 8)).astype(np.float32)
+    documents = [Document(page_content=f"{video_id}-{i}", metadata={"start": float(i)}) for i in range(count)]
+    corpus.add_video(video_id, documents, vectors, version=version)
+    return vectors
+
+
+def texts(results):
+    return [[doc.page_content for doc in docs] for docs in results]
+
+
+class TestCorpusIndex:
+    """Test filtered search, replacement, removal and persistence."""
+
+    def test_filtered_search_stays_within_video(self, tmp_path):
+        corpus = CorpusIndex(path=str(tmp_path / "corpus"), quantization="none")
+        a = add(corpus, "aaaaaaaaaaa", 5, seed=0)
+        add(corpus, "bbbbbbbbbbb", 7, seed=1)
+
+        hits = corpus.search(a[2:3], k=3, video_ids=["bbbbbbbbbbb"])[0]
+        assert len(hits) == 3
+        assert all(doc.metadata["video_id"] == "bbbbbbbbbbb" for doc in hits)
+        assert texts(CorpusVideo(corpus, "aaaaaaaaaaa").search(a[2:3], k=1)) == [["aaaaaaaaaaa-2"]]
+        assert texts(corpus.search(a[2:3], k=1)) == [["aaaaaaaaaaa-2"]]
+
+    def test_replace_and_remove_keep_other_videos_consistent(self, tmp_path):
+        corpus = CorpusIndex(path=str(tmp_path / "corpus"), quantization="fp16")
+        add(corpus, "aaaaaaaaaaa", 5, seed=0, version="v1")
+        b = add(corpus, "bbbbbbbbbbb", 4, seed=1)
+        c = add(corpus, "ccccccccccc", 3, seed=2)
+
+        add(corpus, "aaaaaaaaaaa", 2, seed=3, version="v2")
+        assert corpus.version("aaaaaaaaaaa") == "v2"
+        assert sorted(texts(corpus.search(c[:1], k=9, video_ids=["aaaaaaaaaaa"]))[0]) == ["aaaaaaaaaaa-0", "aaaaaaaaaaa-1"]
+
+        assert corpus.remove_video("bbbbbbbbbbb")
+        assert not corpus.remove_video("bbbbbbbbbbb")
+        assert corpus.search(b[:1], k=2, video_ids=["bbbbbbbbbbb"]) == [[]]
+        assert texts(corpus.search(c, k=1, video_ids=["ccccccccccc"])) == \
+            [["ccccccccccc-0"], ["ccccccccccc-1"], ["ccccccccccc-2"]]
+        assert corpus.stats()["videos"] == 2
+
+    def test_multi_video_filter(self, tmp_path):
+        corpus = CorpusIndex(path=str(tmp_path / "corpus"), quantization="none")
+        add(corpus, "aaaaaaaaaaa", 4, seed=0)
+        b = add(corpus, "bbbbbbbbbbb", 4, seed=1)
+        add(corpus, "ccccccccccc", 4, seed=2)
+
+        hits = corpus.search(b[:1], k=8, video_ids=["aaaaaaaaaaa", "bbbbbbbbbbb"])[0]
+        assert {doc.metadata["video_id"] for doc in hits} == {"aaaaaaaaaaa", "bbbbbbbbbbb"}
+
+    def test_videos_are_saved_as_they_are_added(self, tmp_path):
+        """A new process sees every added video without an explicit save."""
+        path = str(tmp_path / "corpus")
+        corpus = CorpusIndex(path=path, quantization="none")
+        a = add(corpus, "aaaaaaaaaaa", 5, seed=0, version="v1")
+
+        loaded = CorpusIndex(path=path, quantization="none")
+        assert loaded.load()
+        assert loaded.version("aaaaaaaaaaa") == "v1"
+        assert texts(loaded.search(a[4:5], k=1, video_ids=["aaaaaaaaaaa"])) == [["aaaaaaaaaaa-4"]]
+
+    def test_workers_see_each_others_changes(self, tmp_path):
+        """Videos added or removed by another process sharing the directory are picked up."""
+        path = str(tmp_path / "corpus")
+        first = CorpusIndex(path=path, quantization="none")
+        second = CorpusIndex(path=path, quantization="none")
+        add(first, "aaaaaaaaaaa", 3, seed=0)
+        b = add(second, "bbbbbbbbbbb", 3, seed=1)
+
+        assert sorted(first.video_ids()) == sorted(second.video_ids()) == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        assert texts(first.search(b[1:2], k=1)) == [["bbbbbbbbbbb-1"]]
+        assert second.remove_video("aaaaaaaaaaa")
+        assert not first.contains("aaaaaaaaaaa")
+
+    def test_resident_segments_fit_the_budget(self, tmp_path):
+        """Segments beyond the byte budget leave memory but are read back on demand."""
+        corpus = CorpusIndex(path=str(tmp_path / "corpus"), quantization="none", max_bytes=3000)
+        a = add(corpus, "aaaaaaaaaaa", 4, seed=0)
+        for n, video_id in enumerate(["bbbbbbbbbbb", "ccccccccccc", "ddddddddddd"]):
+            add(corpus, video_id, 4, seed=n + 1)
+
+        assert corpus.nbytes() <= 3000
+        assert "aaaaaaaaaaa" not in corpus.segments
+        assert texts(corpus.search(a[:1], k=1, video_ids=["aaaaaaaaaaa"])) == [["aaaaaaaaaaa-0"]]
+
+    def test_cross_video_search_leaves_segment_cache_alone(self, tmp_path):
+        """Searching across videos uses the shared index and does not load or evict segments."""
+        corpus = CorpusIndex(path=str(tmp_path / "corpus"), quantization="none", max_bytes=3000)
+        a = add(corpus, "aaaaaaaaaaa", 4, seed=0)
+        for n, video_id in enumerate(["bbbbbbbbbbb", "ccccccccccc", "ddddddddddd"]):
+            add(corpus, video_id, 4, seed=n + 1)
+        resident = [v for v in corpus.video_ids() if v in corpus.segments]
+        stats = corpus.segments.stats()
+
+        assert texts(corpus.search(a[1:2], k=1)) == [["aaaaaaaaaaa-1"]]
+        hits = corpus.search(a[1:2], k=8, video_ids=["aaaaaaaaaaa", "ccccccccccc"])[0]
+        assert {doc.metadata["video_id"] for doc in hits} == {"aaaaaaaaaaa", "ccccccccccc"}
+        assert [v for v in corpus.video_ids() if v in corpus.segments] == resident
+        assert corpus.segments.stats() == stats
+
+    def test_pinned_handle_keeps_its_segment(self, tmp_path, monkeypatch):
+        """A handle pinned to a segment searches it without file checks, even after re-indexing."""
+        corpus = CorpusIndex(path=str(tmp_path / "corpus"), quantization="none", max_bytes=3000)
+        a = add(corpus, "aaaaaaaaaaa", 4, seed=0, version="v1")
+        handle = CorpusVideo(corpus, "aaaaaaaaaaa", corpus.segment("aaaaaaaaaaa"))
+        add(corpus, "aaaaaaaaaaa", 2, seed=5, version="v2")
+        corpus.segments.clear()
+
+        monkeypatch.setattr("app.services.corpus_index.os.stat", None)
+        assert handle.version == "v1"
+        assert texts(handle.search(a[3:4], k=1)) == [["aaaaaaaaaaa-3"]]
+
+    def test_segments_follow_index_type(self, tmp_path):
+        """Each video's segment is built with the configured index type."""
+        corpus = CorpusIndex(path=str(tmp_path / "corpus"), index_type="hnsw", quantization="none")
+        a = add(corpus, "aaaaaaaaaaa", 20, seed=0)
+
+        assert isinstance(corpus.segments.get("aaaaaaaaaaa").index, faiss.IndexHNSWFlat)
+        assert texts(corpus.search(a[7:8], k=1)) == [["aaaaaaaaaaa-7"]]
+        assert CorpusIndex(path=str(tmp_path / "corpus"), quantization="none").video_ids() == []
+
+
+class TestVectorStoreServiceCorpus:
+    """Test that the service builds into and queries the corpus."""
+
+    def test_create_load_and_remove(self, tmp_path):
+        service = VectorStoreService.__new__(VectorStoreService)
+        service.embedding_model = make_embeddings()
+        service.corpus = CorpusIndex(path=str(tmp_path / "corpus"), quantization="none")
+        service.text_splitter = None
+        service.index_cache = None
+        service.versions = {}
+        service.resident = LRUCache(max_bytes=1024)
+
+        documents = [Document(page_content=text) for text in ["a", "bb", "ccc"]]
+        service.split_transcript = lambda text: documents
+        handle = service.create_vectorstore("a bb ccc", video_id="aaaaaaaaaaa")
+
+        assert service.load_vectorstore("aaaaaaaaaaa") == handle
+        assert service.index_version("aaaaaaaaaaa") is not None
+        assert [d.page_content for d in service.retrieve_documents(handle, "xx", k=1)] == ["bb"]
+        assert service.remove_video("aaaaaaaaaaa")
+        assert service.load_vectorstore("aaaaaaaaaaa") is None
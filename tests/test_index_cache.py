@@ -0,0 +1,44 @@
+"""
+Unit tests for the disk-backed FAISS index cache.
+"""
+import hashlib
+
+from langchain_core.embeddings import Embeddings
+from langchain_community.vectorstores import FAISS
+from app.services.index_cache import IndexCache
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic offline embeddings for tests."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255.0 for b in digest[:16]]
+
+
+class TestIndexCache:
+    """Test saving and loading cached indexes."""
+
+    def test_roundtrip(self, tmp_path):
+        """A saved index loads back with the same documents."""
+        cache = IndexCache(cache_dir=str(tmp_path), embedding_model="m", chunk_size=100, chunk_overlap=10)
+        embeddings = HashEmbeddings()
+        store = FAISS.from_texts(["alpha", "beta", "gamma"], embeddings)
+
+        assert cache.load("dQw4w9WgXcQ", embeddings) is None
+        cache.save("dQw4w9WgXcQ", store)
+
+        loaded = cache.load("dQw4w9WgXcQ", embeddings)
+        assert loaded is not None
+        assert loaded.index.ntotal == 3
+        assert loaded.similarity_search("beta", k=1)[0].page_content == "beta"
+        assert cache.read_meta("dQw4w9WgXcQ")["num_vectors"] == 3
+
+    def test_key_depends_on_chunking(self, tmp_path):
+        """Changing chunk parameters changes the cache key."""
+        a = IndexCache(cache_dir=str(tmp_path), embedding_model="m", chunk_size=100, chunk_overlap=10)
+        b = IndexCache(cache_dir=str(tmp_path), embedding_model="m", chunk_size=100, chunk_overlap=20)
+        assert a.key("dQw4w9WgXcQ") != b.key("dQw4w9WgXcQ")
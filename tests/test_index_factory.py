@@ -0,0 +1,65 @@
+"""
+Unit tests for index selection and quantization.
+"""
+import faiss
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.services.index_factory import build_index, choose_index_type, index_bytes, pq_subquantizers
+
+
+def make_vectors(count, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((count, dim)).astype(np.float32)
+
+
+def recall_at_k(index, vectors, queries, k=5):
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    _, found = index.search(queries, k)
+    return np.mean([len(set(t) & set(f)) / k for t, f in zip(truth, found)])
+
+
+class TestIndexFactory:
+    """Test index type selection, quantized storage and recall."""
+
+    def test_auto_picks_type_by_size(self, monkeypatch):
+        monkeypatch.setattr(settings, "INDEX_TYPE", "auto")
+        monkeypatch.setattr(settings, "INDEX_HNSW_MIN_VECTORS", 100)
+        monkeypatch.setattr(settings, "INDEX_IVF_MIN_VECTORS", 1000)
+        assert choose_index_type(99) == "flat"
+        assert choose_index_type(100) == "hnsw"
+        assert choose_index_type(5000) == "ivf"
+
+        monkeypatch.setattr(settings, "INDEX_TYPE", "flat")
+        assert choose_index_type(5000) == "flat"
+
+    @pytest.mark.parametrize("index_type,quantization,min_recall", [
+        ("flat", "none", 1.0),
+        ("flat", "fp16", 0.95),
+        ("flat", "int8", 0.8),
+        ("hnsw", "int8", 0.8),
+        ("ivf", "none", 0.5),
+    ])
+    def test_configurations_search(self, index_type, quantization, min_recall):
+        vectors = make_vectors(2000)
+        index = build_index(vectors, index_type=index_type, quantization=quantization)
+        assert index.ntotal == 2000
+        assert recall_at_k(index, vectors, vectors[:50]) >= min_recall
+
+    def test_quantization_shrinks_index(self):
+        vectors = make_vectors(1000)
+        flat = index_bytes(build_index(vectors, "flat", "none"))
+        assert flat == 1000 * 32 * 4
+        assert index_bytes(build_index(vectors, "flat", "fp16")) == flat // 2
+        assert index_bytes(build_index(vectors, "flat", "int8")) == flat // 4
+
+    def test_pq_falls_back_to_int8_for_small_sets(self):
+        index = faiss.downcast_index(build_index(make_vectors(300), "flat", "pq"))
+        assert isinstance(index, faiss.IndexScalarQuantizer)
+
+    def test_pq_subquantizers_divide_dimension(self):
+        assert pq_subquantizers(384, 48) == 48
+        assert pq_subquantizers(100, 48) == 25
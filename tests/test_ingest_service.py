@@ -0,0 +1,64 @@
+"""
+Unit tests for background batch ingestion.
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.ingest_service import IngestService, COMPLETED, FAILED
+from app.utils.limiter import OverloadedError
+
+
+class FakePipeline:
+    """Pipeline that tracks concurrency and fails for one video."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def get_vectorstore(self, video_url):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if video_url == "bad":
+            raise HTTPException(status_code=404, detail="Transcript unavailable")
+        return object()
+
+
+class TestIngestService:
+    """Test job progress reporting and bounded concurrency."""
+
+    def test_reports_per_video_progress(self):
+        pipeline = FakePipeline()
+
+        async def main():
+            service = IngestService(pipeline, max_concurrency=2, max_jobs=10)
+            job = service.submit(["a", "b", "bad", "c", "a"])
+            await job.task
+            return service.get(job.job_id)
+
+        job = asyncio.run(main())
+        assert len(job.videos) == 4
+        assert job.count(COMPLETED) == 3
+        assert job.count(FAILED) == 1
+        assert job.status == COMPLETED
+        failed = [v for v in job.videos if v.status == FAILED][0]
+        assert failed.video_url == "bad" and failed.error == "Transcript unavailable"
+        assert pipeline.peak <= 2
+
+    def test_rejects_jobs_beyond_backlog_limits(self):
+        """New jobs are turned away while too many jobs or videos are pending."""
+        async def main():
+            service = IngestService(FakePipeline(), max_active_jobs=1, max_pending_videos=3)
+            job = service.submit(["a", "b"])
+            with pytest.raises(OverloadedError):
+                service.submit(["c"])
+            await job.task
+            with pytest.raises(OverloadedError):
+                service.submit(["c", "d", "e", "f"])
+            return service.submit(["c", "d", "e"])
+
+        job = asyncio.run(main())
+        assert len(job.videos) == 3
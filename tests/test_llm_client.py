@@ -0,0 +1,227 @@
+"""
+Unit tests for the concurrency limiter and the resilient LLM client.
+"""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services.llm_client import ResilientChatModel, retry_delay, retry_reason
+from app.utils.limiter import ConcurrencyLimiter, OverloadedError
+
+
+class StatusError(Exception):
+    """Stand-in for a provider error carrying an HTTP status."""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+
+class FlakyModel:
+    """Fails with the queued errors before answering."""
+
+    def __init__(self, errors=(), chunks=("a", "b")):
+        self.errors = list(errors)
+        self.chunks = chunks
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "answer"
+
+    async def astream(self, prompt):
+        self.calls += 1
+        for i, chunk in enumerate(self.chunks):
+            if self.errors and i == len(self.chunks) - 1:
+                raise self.errors.pop(0)
+            yield chunk
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_DELAY", 0.0)
+
+
+def limiter(max_in_flight=1, max_waiting=1, wait_timeout=1.0):
+    return ConcurrencyLimiter("test", max_in_flight, max_waiting, wait_timeout)
+
+
+class TestConcurrencyLimiter:
+    """Test admission, queueing and rejection."""
+
+    def test_rejects_when_queue_full(self):
+        """Callers beyond in-flight plus queue capacity fail fast."""
+        async def main():
+            lim = limiter()
+            await lim.acquire()
+            waiter = asyncio.create_task(lim.acquire())
+            await asyncio.sleep(0)
+            with pytest.raises(OverloadedError):
+                await lim.acquire()
+            lim.release()
+            await waiter
+            lim.release()
+            return lim.in_flight, lim.waiting
+
+        assert asyncio.run(main()) == (0, 0)
+
+    def test_rejects_after_wait_timeout(self):
+        """A waiter that gets no slot in time is rejected with a retry hint."""
+        async def main():
+            lim = limiter(wait_timeout=0.01)
+            await lim.acquire()
+            with pytest.raises(OverloadedError) as info:
+                await lim.acquire()
+            return info.value.retry_after, lim.waiting
+
+        retry_after, waiting = asyncio.run(main())
+        assert retry_after >= 1.0
+        assert waiting == 0
+
+    def test_slots_are_handed_over_in_order(self):
+        """Released slots go to waiters first come, first served."""
+        order = []
+
+        async def worker(lim, n):
+            async with lim.slot():
+                order.append(n)
+                await asyncio.sleep(0.001)
+
+        async def main():
+            lim = limiter(max_waiting=10)
+            await asyncio.gather(*(worker(lim, n) for n in range(5)))
+            return lim.in_flight
+
+        assert asyncio.run(main()) == 0
+        assert order == [0, 1, 2, 3, 4]
+
+
+class TestRetryPolicy:
+    """Test which failures are retried and how long to wait."""
+
+    def test_classifies_errors(self):
+        """Rate limits, server errors and timeouts retry; client errors do not."""
+        assert retry_reason(StatusError(429)) == "429"
+        assert retry_reason(StatusError(503)) == "5xx"
+        assert retry_reason(asyncio.TimeoutError()) == "timeout"
+        assert retry_reason(StatusError(400)) is None
+        assert retry_reason(ValueError("bad prompt")) is None
+
+    def test_retry_after_sets_minimum_delay(self, monkeypatch):
+        """A Retry-After header is honoured up to the configured cap."""
+        monkeypatch.setattr(settings, "LLM_RETRY_MAX_DELAY", 8.0)
+        assert retry_delay(0, StatusError(429, retry_after="2")) == 2.0
+        assert retry_delay(0, StatusError(429, retry_after="60")) == 8.0
+
+
+class TestResilientChatModel:
+    """Test retries and timeouts around a chat model."""
+
+    def test_retries_rate_limited_call(self):
+        """A 429 followed by success returns the answer."""
+        model = FlakyModel(errors=[StatusError(429)])
+        client = ResilientChatModel(model, limiter=limiter(), max_retries=2)
+        assert asyncio.run(client.ainvoke("q")) == "answer"
+        assert model.calls == 2
+
+    def test_gives_up_after_max_retries(self):
+        """Persistent server errors are raised once retries run out."""
+        model = FlakyModel(errors=[StatusError(503)] * 5)
+        client = ResilientChatModel(model, limiter=limiter(), max_retries=2)
+        with pytest.raises(StatusError):
+            asyncio.run(client.ainvoke("q"))
+        assert model.calls == 3
+
+    def test_does_not_retry_client_errors(self):
+        """A 400 is raised straight away."""
+        model = FlakyModel(errors=[StatusError(400)])
+        client = ResilientChatModel(model, limiter=limiter(), max_retries=2)
+        with pytest.raises(StatusError):
+            asyncio.run(client.ainvoke("q"))
+        assert model.calls == 1
+
+    def test_times_out_slow_calls(self):
+        """Each attempt is bounded by the timeout."""
+        class SlowModel:
+            async def ainvoke(self, prompt):
+                await asyncio.sleep(1)
+
+        client = ResilientChatModel(SlowModel(), limiter=limiter(), timeout=0.01, max_retries=0)
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(client.ainvoke("q"))
+
+    def test_stream_not_retried_after_first_chunk(self):
+        """Chunks already sent cannot be taken back, so the error surfaces."""
+        model = FlakyModel(errors=[StatusError(503)], chunks=("a", "b", "c"))
+        client = ResilientChatModel(model, limiter=limiter(), max_retries=2)
+        received = []
+
+        async def main():
+            async for chunk in client.astream("q"):
+                received.append(chunk)
+
+        with pytest.raises(StatusError):
+            asyncio.run(main())
+        assert received == ["a", "b"]
+        assert model.calls == 1
+
+    def test_stream_first_chunk_timeout_is_retried(self):
+        """A stream that stays silent is abandoned and retried."""
+        class SilentModel:
+            calls = 0
+
+            async def astream(self, prompt):
+                SilentModel.calls += 1
+                await asyncio.sleep(1)
+                yield "late"
+
+        client = ResilientChatModel(
+            SilentModel(), limiter=limiter(), max_retries=1, first_chunk_timeout=0.01, stream_timeout=5,
+        )
+
+        async def main():
+            return [chunk async for chunk in client.astream("q")]
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(main())
+        assert SilentModel.calls == 2
+
+    def test_stream_total_timeout(self):
+        """A stream that keeps trickling chunks is cut off at the total timeout."""
+        class TricklingModel:
+            async def astream(self, prompt):
+                while True:
+                    yield "x"
+                    await asyncio.sleep(0.005)
+
+        client = ResilientChatModel(
+            TricklingModel(), limiter=limiter(), max_retries=2, first_chunk_timeout=1, stream_timeout=0.05,
+        )
+        received = []
+
+        async def main():
+            async for chunk in client.astream("q"):
+                received.append(chunk)
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(main())
+        assert received
+
+    def test_slow_reader_does_not_hold_slot(self):
+        """The slot is released once generation ends, even if chunks are unread."""
+        lim = limiter()
+        client = ResilientChatModel(FlakyModel(chunks=("a", "b", "c")), limiter=lim, max_retries=0)
+
+        async def main():
+            stream = client.astream("q")
+            first = await stream.__anext__()
+            await asyncio.sleep(0.01)
+            in_flight = lim.in_flight
+            rest = [chunk async for chunk in stream]
+            return first, in_flight, rest
+
+        assert asyncio.run(main()) == ("a", 0, ["b", "c"])
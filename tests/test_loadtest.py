@@ -0,0 +1,68 @@
+"""
+Unit tests for the load-test harness pieces: the stub LLM server and
+the event loop lag measurements.
+"""
+import asyncio
+import json
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import EVENT_LOOP_LAG, monitor_event_loop
+from benchmarks.loadtest import lag_summary, rss_bytes
+from benchmarks.stub_llm_server import create_app
+
+
+class TestStubLLMServer:
+    """Test that the stub speaks the chat completions protocol."""
+
+    def test_completion(self):
+        client = TestClient(create_app(latency=0))
+        response = client.post("/openai/v1/chat/completions", json={
+            "model": "m", "messages": [{"role": "user", "content": "hi"}],
+        })
+
+        assert response.status_code == 200
+        assert response.json()["choices"][0]["message"]["content"]
+
+    def test_stream_ends_with_done(self):
+        client = TestClient(create_app(latency=0, tokens=3))
+        response = client.post("/v1/chat/completions", json={"model": "m", "messages": [], "stream": True})
+        events = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+
+        assert events[-1] == "[DONE]"
+        assert json.loads(events[-2])["choices"][0]["finish_reason"] == "stop"
+        assert sum(bool(json.loads(e)["choices"][0]["delta"].get("content")) for e in events[:-1]) == 3
+
+    def test_injected_errors(self):
+        client = TestClient(create_app(latency=0, error_rate=1.0))
+        response = client.post("/openai/v1/chat/completions", json={"model": "m", "messages": []})
+        assert response.status_code in (429, 503)
+        assert response.headers["Retry-After"] == "1"
+
+
+class TestEventLoopLag:
+    """Test the lag probe and its summary."""
+
+    def test_blocking_call_shows_up_as_lag(self):
+        async def scenario():
+            before = EVENT_LOOP_LAG._sum.get()
+            task = asyncio.create_task(monitor_event_loop(0.01))
+            await asyncio.sleep(0.02)
+            time.sleep(0.1)  # block the loop
+            await asyncio.sleep(0.03)
+            task.cancel()
+            return EVENT_LOOP_LAG._sum.get() - before
+
+        assert asyncio.run(scenario()) >= 0.05
+
+    def test_summary_uses_bucket_deltas(self):
+        before = {"sum": 1.0, "count": 10, "buckets": {0.001: 10, 0.1: 10, float("inf"): 10}}
+        after = {"sum": 1.5, "count": 110, "buckets": {0.001: 108, 0.1: 110, float("inf"): 110}}
+
+        summary = lag_summary(before, after)
+        assert summary == {"probes": 100, "mean_ms": 5.0, "p99_le_ms": 100.0, "max_le_ms": 100.0}
+
+    def test_rss_of_current_process(self):
+        assert rss_bytes(os.getpid()) > 0
@@ -0,0 +1,105 @@
+"""
+Unit tests for the queue-based, sampled logging setup.
+"""
+import json
+import logging
+import queue
+
+from prometheus_client import REGISTRY
+
+from app.core.logging_config import DroppingQueueHandler, JsonFormatter, RateLimitFilter, SamplingFilter
+
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",), lineno=10, **extra):
+    record = logging.LogRecord("test", level, "/app/x.py", lineno, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def dropped_count(reason):
+    return REGISTRY.get_sample_value("log_records_dropped_total", {"reason": reason}) or 0.0
+
+
+class CountingArg:
+    """Argument that records how often it was formatted."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self):
+        self.calls += 1
+        return "arg"
+
+
+class TestJsonFormatter:
+    """Test the structured output format."""
+
+    def test_fields_and_extra(self):
+        line = JsonFormatter().format(make_record(video_id="abc", stage="retrieve"))
+        entry = json.loads(line)
+
+        assert entry["level"] == "INFO"
+        assert entry["message"] == "hello world"
+        assert entry["video_id"] == "abc"
+        assert entry["stage"] == "retrieve"
+        assert "args" not in entry
+
+
+class TestFilters:
+    """Test DEBUG sampling and per-call-site rate limiting."""
+
+    def test_sampling_only_drops_debug(self):
+        sampler = SamplingFilter(rate=0.0)
+        assert not sampler.filter(make_record(level=logging.DEBUG))
+        assert sampler.filter(make_record(level=logging.INFO))
+        assert SamplingFilter(rate=1.0).filter(make_record(level=logging.DEBUG))
+
+    def test_rate_limit_is_per_call_site(self):
+        limiter = RateLimitFilter(per_second=3)
+        before = dropped_count("rate_limited")
+        allowed = [limiter.filter(make_record(level=logging.DEBUG, lineno=1)) for _ in range(10)]
+
+        assert allowed.count(True) == 3
+        assert dropped_count("rate_limited") - before == 7
+        assert limiter.filter(make_record(level=logging.DEBUG, lineno=2))
+        assert limiter.filter(make_record(level=logging.ERROR, lineno=1))
+
+    def test_rate_limit_only_applies_to_debug(self):
+        """Per-request INFO lines are never rate limited."""
+        limiter = RateLimitFilter(per_second=1)
+        assert all(limiter.filter(make_record(lineno=1)) for _ in range(10))
+
+    def test_rate_limit_disabled(self):
+        limiter = RateLimitFilter(per_second=0)
+        assert all(limiter.filter(make_record(level=logging.DEBUG)) for _ in range(100))
+
+
+class TestDroppingQueueHandler:
+    """Test that logging never blocks and defers formatting."""
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+        before = dropped_count("queue_full")
+        for _ in range(5):
+            handler.handle(make_record())
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+        assert dropped_count("queue_full") - before == 3
+
+    def test_records_are_formatted_by_the_listener(self):
+        handler = DroppingQueueHandler(queue.Queue())
+        arg = CountingArg()
+        handler.handle(make_record(args=(arg,)))
+
+        assert arg.calls == 0
+        record = handler.queue.get_nowait()
+        assert record.getMessage() == "hello arg"
+
+    def test_filtered_records_are_never_formatted(self):
+        log = logging.getLogger("tests.logging.lazy")
+        log.setLevel(logging.INFO)
+        arg = CountingArg()
+        log.debug("value=%s", arg)
+
+        assert arg.calls == 0
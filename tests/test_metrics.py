@@ -0,0 +1,48 @@
+"""
+Unit tests for Prometheus instrumentation.
+"""
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import record_transcript_fetch, stage_timer
+from app.main import app
+
+client = TestClient(app)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestStageMetrics:
+    """Test stage timers and counters."""
+
+    def test_stage_timer_observes_once(self):
+        before = sample("rag_stage_duration_seconds_count", stage="chunking")
+        with stage_timer("chunking"):
+            pass
+        assert sample("rag_stage_duration_seconds_count", stage="chunking") == before + 1
+
+    def test_transcript_fetch_outcomes(self):
+        before = sample("rag_transcript_fetches_total", source="selenium", outcome="failure")
+        record_transcript_fetch("selenium", False)
+        assert sample("rag_transcript_fetches_total", source="selenium", outcome="failure") == before + 1
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics endpoint and request middleware."""
+
+    def test_exposes_prometheus_text(self):
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "rag_stage_duration_seconds_bucket" in response.text
+        assert 'http_request_duration_seconds_count{method="GET",path="/health",status="200"}' in response.text
+
+    def test_unknown_paths_share_one_label(self):
+        before = sample("http_request_duration_seconds_count", path="other", method="GET", status="404")
+        client.get("/no/such/route")
+        assert sample("http_request_duration_seconds_count", path="other", method="GET", status="404") == before + 1
+        assert sample("http_requests_in_flight", path="other") == 0
@@ -0,0 +1,62 @@
+"""
+Unit tests for the RAG pipeline's video resolution.
+"""
+import asyncio
+import threading
+import time
+
+from app.services.rag_pipeline import RAGPipeline
+from app.services.transcript_segments import TranscriptSegments
+
+
+class FakeTranscriptService:
+    """Blocking transcript fetch that counts calls."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def fetch_segments(self, video_url):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return TranscriptSegments.from_items([{"text": "transcript for " + video_url, "start": 0.0, "duration": 1.0}])
+
+
+class FakeVectorStoreService:
+    """Vector store service that 'builds' a string instead of an index."""
+
+    def load_vectorstore(self, video_id):
+        return None
+
+    def create_vectorstore(self, segments, video_id=None):
+        return f"index({segments.text})"
+
+
+class TestRAGPipeline:
+    """Test that resolution coalesces and stays off the event loop."""
+
+    def test_concurrent_requests_fetch_once_without_blocking_loop(self):
+        transcripts = FakeTranscriptService()
+        pipeline = RAGPipeline(transcripts, FakeVectorStoreService())
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            results = await asyncio.gather(
+                *(pipeline.get_vectorstore("dQw4w9WgXcQ") for _ in range(5))
+            )
+            task.cancel()
+            return results
+
+        results = asyncio.run(main())
+        assert results == ["index(transcript for dQw4w9WgXcQ)"] * 5
+        assert transcripts.calls == 1
+        assert ticks >= 10
@@ -4,6 +4,8 @@ Unit tests for API routes.
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.api import deps
+from app.utils.cache import LRUCache
 
 client = TestClient(app)
 
@@ -27,6 +29,42 @@ class TestHealthEndpoints:
         assert data["status"] == "healthy"
 
 
+class TestReadyEndpoint:
+    """Test readiness reporting and lazy service construction."""
+
+    def test_not_ready_before_warm_up(self):
+        """Readiness is reported separately from health."""
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+        assert client.get("/health").status_code == 200
+
+    def test_importing_app_builds_no_services(self):
+        """Services are only constructed when a route needs them."""
+        assert deps.get_vectorstore_service.peek() is None
+        assert deps.get_llm_service.peek() is None
+
+    def test_services_can_be_overridden(self):
+        """Routes take their services from dependency providers."""
+
+        class FakeVectorStoreService:
+            resident = LRUCache(max_bytes=1024)
+            corpus = None
+
+        class FakeTranscriptService:
+            cache = None
+
+        app.dependency_overrides[deps.get_vectorstore_service] = FakeVectorStoreService
+        app.dependency_overrides[deps.get_transcript_service] = FakeTranscriptService
+        app.dependency_overrides[deps.get_answer_cache] = lambda: None
+        try:
+            response = client.get("/cache/stats")
+        finally:
+            app.dependency_overrides.clear()
+        assert response.status_code == 200
+        assert response.json()["vectorstores"]["entries"] == 0
+
+
 class TestAskEndpoint:
     """Test the ask question endpoint."""
     
@@ -0,0 +1,197 @@
+"""
+Unit tests for conversation sessions.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+
+from app.api import deps
+from app.core.config import settings
+from app.main import app
+from app.services.admission import AdmissionController
+from app.services.llm_service import LLMService
+from app.services.rag_pipeline import RAGPipeline
+from app.services.session_service import SessionService
+from app.services.vectorstore_service import VectorStoreService
+from benchmarks.fakes import FakeEmbeddings, FakeTranscriptService, video_id_for
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingPipeline:
+    """Pipeline stand-in that counts index resolutions and retrievals."""
+
+    def __init__(self):
+        self.resolved = 0
+        self.retrieved = 0
+        self.vectorstore_service = SimpleNamespace(
+            embedding_model=SimpleNamespace(embed_query=lambda text: [0.0]),
+            retrieve_documents=self._retrieve,
+            index_version=lambda video_id: "v1",
+        )
+
+    async def get_vectorstore(self, video_url):
+        self.resolved += 1
+        return "index"
+
+    def _retrieve(self, vectorstore, question, query_vector=None):
+        self.retrieved += 1
+        return [f"chunk for {question}"]
+
+
+class RecordingChatModel:
+    """Chat model stand-in that keeps every prompt it receives."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(str(prompt))
+        return AIMessage(content=f"answer {len(self.prompts)}")
+
+
+class TestSessionService:
+    """Test session lifetime and the per-session caches."""
+
+    def test_session_resolves_index_once(self):
+        """Questions within a session reuse the index loaded at creation."""
+        pipeline = CountingPipeline()
+        service = SessionService(pipeline)
+
+        async def main():
+            session = await service.create("dQw4w9WgXcQ")
+            for question in ("first", "second"):
+                await service.retrieve(service.get(session.session_id), question)
+            return session
+
+        session = asyncio.run(main())
+        assert pipeline.resolved == 1
+        assert pipeline.retrieved == 2
+        assert session.version == "v1"
+
+    def test_repeated_question_uses_chunk_cache(self):
+        """The same question (ignoring case and spacing) is not searched twice."""
+        pipeline = CountingPipeline()
+        service = SessionService(pipeline)
+
+        async def main():
+            session = await service.create("dQw4w9WgXcQ")
+            first = await service.retrieve(session, "What is RAG?")
+            second = await service.retrieve(session, "  what is  rag? ")
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert first == second
+        assert pipeline.retrieved == 1
+
+    def test_history_keeps_recent_turns(self):
+        """Only the last ``max_turns`` turns are kept."""
+        service = SessionService(CountingPipeline(), max_turns=2)
+        session = asyncio.run(service.create("dQw4w9WgXcQ"))
+        for n in range(3):
+            service.record_turn(session, f"q{n}", f"a{n}")
+        assert [turn.question for turn in service.history(session)] == ["q1", "q2"]
+
+    def test_idle_sessions_expire(self):
+        """A session unused for longer than the idle timeout is dropped."""
+        clock = FakeClock()
+        service = SessionService(CountingPipeline(), idle_timeout=60, clock=clock)
+        session = asyncio.run(service.create("dQw4w9WgXcQ"))
+
+        clock.now = 59
+        assert service.get(session.session_id) is session
+        clock.now = 120
+        assert service.get(session.session_id) is None
+
+    def test_oldest_sessions_dropped_beyond_capacity(self):
+        """At most ``max_sessions`` sessions are held."""
+        service = SessionService(CountingPipeline(), max_sessions=2)
+        sessions = [asyncio.run(service.create("dQw4w9WgXcQ")) for _ in range(3)]
+        assert service.get(sessions[0].session_id) is None
+        assert service.get(sessions[2].session_id) is not None
+
+    def test_reindexed_video_skips_answer_cache(self):
+        """A session pinned to an outdated index gets no answer-cache version."""
+        pipeline = CountingPipeline()
+        service = SessionService(pipeline)
+        session = asyncio.run(service.create("dQw4w9WgXcQ"))
+        assert service.answer_version(session) == "v1"
+
+        pipeline.vectorstore_service.index_version = lambda video_id: "v2"
+        assert service.answer_version(session) is None
+
+    def test_close_video_ends_its_sessions(self):
+        """Removing a video ends the sessions pinned to its index."""
+        service = SessionService(CountingPipeline())
+        session = asyncio.run(service.create("dQw4w9WgXcQ"))
+        assert service.close_video("dQw4w9WgXcQ") == 1
+        assert service.get(session.session_id) is None
+
+
+class TestSessionRoutes:
+    """Test the session endpoints end to end with local stand-ins."""
+
+    @pytest.fixture
+    def setup(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "CORPUS_INDEX_DIR", str(tmp_path / "corpus"))
+        monkeypatch.setattr(settings, "INDEX_CACHE_DIR", str(tmp_path / "indexes"))
+        monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+        monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+
+        transcript_service = FakeTranscriptService(latency=0.0)
+        fetch_segments = transcript_service.fetch_segments
+        fetches = []
+        transcript_service.fetch_segments = lambda url: fetches.append(url) or fetch_segments(url)
+
+        vectorstore_service = VectorStoreService(embedding_model=FakeEmbeddings(dim=32))
+        pipeline = RAGPipeline(transcript_service, vectorstore_service)
+        chat_model = RecordingChatModel()
+        llm_service = LLMService(llm=chat_model)
+        session_service = SessionService(pipeline)
+        admission = AdmissionController()
+        app.dependency_overrides.update({
+            deps.get_vectorstore_service: lambda: vectorstore_service,
+            deps.get_llm_service: lambda: llm_service,
+            deps.get_answer_cache: lambda: None,
+            deps.get_session_service: lambda: session_service,
+            deps.get_admission_controller: lambda: admission,
+        })
+        try:
+            yield TestClient(app), fetches, chat_model
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_follow_up_uses_pinned_index_and_history(self, setup):
+        """Follow-ups skip transcript resolution and see earlier turns."""
+        client, fetches, chat_model = setup
+        response = client.post("/sessions", json={"video_url": video_id_for(1)})
+        assert response.status_code == 201
+        session_id = response.json()["session_id"]
+
+        first = client.post(f"/sessions/{session_id}/ask", json={"question": "What is a gradient?"})
+        second = client.post(f"/sessions/{session_id}/ask", json={"question": "Why does it matter?"})
+
+        assert first.status_code == second.status_code == 200
+        assert len(fetches) == 1
+        assert "Conversation so far" not in chat_model.prompts[0]
+        assert "User: What is a gradient?" in chat_model.prompts[1]
+        turns = client.get(f"/sessions/{session_id}").json()["turns"]
+        assert [turn["question"] for turn in turns] == ["What is a gradient?", "Why does it matter?"]
+
+    def test_ended_session_returns_404(self, setup):
+        """Asking in a deleted session tells the client to start a new one."""
+        client, _, _ = setup
+        session_id = client.post("/sessions", json={"video_url": video_id_for(1)}).json()["session_id"]
+
+        assert client.delete(f"/sessions/{session_id}").status_code == 204
+        response = client.post(f"/sessions/{session_id}/ask", json={"question": "Still there?"})
+        assert response.status_code == 404
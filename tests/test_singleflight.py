@@ -0,0 +1,63 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent calls per key."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Only the leader runs the work; followers get its result."""
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "index"
+
+        async def main():
+            flight = SingleFlight()
+            results = await asyncio.gather(*(flight.do("vid", work) for _ in range(10)))
+            return results, flight.in_flight()
+
+        results, in_flight = asyncio.run(main())
+        assert results == ["index"] * 10
+        assert len(calls) == 1
+        assert in_flight == 0
+
+    def test_errors_reach_all_waiters(self):
+        """An exception in the shared work is raised to every caller."""
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("no transcript")
+
+        async def main():
+            flight = SingleFlight()
+            return await asyncio.gather(*(flight.do("vid", work) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_cancelled_leader_does_not_strand_followers(self):
+        """Followers still get the result when the leader is cancelled."""
+        async def work():
+            await asyncio.sleep(0.05)
+            return "index"
+
+        async def main():
+            flight = SingleFlight()
+            leader = asyncio.ensure_future(flight.do("vid", work))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("vid", work))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(main()) == "index"
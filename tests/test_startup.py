@@ -0,0 +1,21 @@
+"""
+Tests that importing the app stays cheap.
+"""
+import os
+import subprocess
+import sys
+
+from benchmarks.bench_startup import DEFERRED_MODULES
+
+
+class TestStartupImports:
+    """Heavy dependencies load on their code path, not with the app."""
+
+    def test_importing_app_skips_deferred_modules(self):
+        env = {k: v for k, v in os.environ.items() if k != "GROQ_API_KEY"}
+        result = subprocess.run(
+            [sys.executable, "-c", f"import sys, app.main; print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])"],
+            capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,120 @@
+"""
+Unit tests for embedding and vector store construction.
+"""
+import numpy as np
+from langchain_core.documents import Document
+
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embeddings import FastEmbedEmbeddings
+from app.services.vectorstore_service import VectorStoreService, build_faiss
+
+
+class FakeTextEmbedding:
+    """Mimics fastembed.TextEmbedding.embed, yielding one vector per text."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts, batch_size=256, parallel=None):
+        self.calls.append((len(texts), batch_size, parallel))
+        for text in texts:
+            vector = np.zeros(8, dtype=np.float32)
+            vector[len(text) % 8] = 1.0
+            yield vector
+
+
+def make_embeddings(**kwargs):
+    embeddings = FastEmbedEmbeddings.__new__(FastEmbedEmbeddings)
+    embeddings.model_name = "fake"
+    embeddings.model = FakeTextEmbedding()
+    embeddings.batch_size = kwargs.get("batch_size", 16)
+    embeddings.parallel = kwargs.get("parallel", 0)
+    embeddings.parallel_min_docs = kwargs.get("parallel_min_docs", 100)
+    embeddings.cache = kwargs.get("cache")
+    return embeddings
+
+
+class TestFastEmbedEmbeddings:
+    """Test the batched NumPy embedding path."""
+
+    def test_embed_array_is_contiguous_float32(self):
+        embeddings = make_embeddings()
+        vectors = embeddings.embed_array(["a", "bb", "ccc"])
+        assert vectors.shape == (3, 8)
+        assert vectors.dtype == np.float32
+        assert vectors.flags["C_CONTIGUOUS"]
+
+    def test_parallel_only_for_large_inputs(self):
+        embeddings = make_embeddings(parallel_min_docs=3)
+        embeddings.embed_array(["a", "b"])
+        embeddings.embed_array(["a", "b", "c"])
+        assert embeddings.model.calls == [(2, 16, None), (3, 16, 0)]
+
+
+class TestEmbeddingCache:
+    """Test the content-addressed embedding cache."""
+
+    def test_only_unseen_chunks_hit_the_model(self, tmp_path):
+        cache = EmbeddingCache("fake", cache_dir=str(tmp_path), dtype="float32")
+        embeddings = make_embeddings(cache=cache)
+        first = embeddings.embed_array(["a", "bb", "a"])
+        second = embeddings.embed_array(["bb", "ccc", "a"])
+
+        assert embeddings.model.calls[0][0] == 2  # "a" deduplicated
+        assert embeddings.model.calls[1][0] == 1  # only "ccc" is new
+        np.testing.assert_array_equal(first[1], second[0])
+        np.testing.assert_array_equal(first[0], second[2])
+
+    def test_persists_across_instances(self, tmp_path):
+        vectors = np.arange(8, dtype=np.float32).reshape(2, 4)
+        EmbeddingCache("fake", cache_dir=str(tmp_path)).store(["x", "y"], vectors)
+
+        found, missing = EmbeddingCache("fake", cache_dir=str(tmp_path)).lookup(["y", "z", "x"])
+        assert missing == [1]
+        np.testing.assert_allclose(found[0], vectors[1])
+        np.testing.assert_allclose(found[2], vectors[0])
+
+    def test_partial_row_is_dropped_before_appending(self, tmp_path):
+        """Rows stored after a cut-off append are read back at the right offset."""
+        cache = EmbeddingCache("fake", cache_dir=str(tmp_path), dtype="float32")
+        cache.store(["x"], np.ones((1, 4), dtype=np.float32))
+        with open(cache.vectors_path, "ab") as f:
+            f.write(b"\0" * 6)
+
+        vectors = np.arange(8, dtype=np.float32).reshape(2, 4)
+        cache.store(["y", "z"], vectors)
+
+        found, missing = EmbeddingCache("fake", cache_dir=str(tmp_path), dtype="float32").lookup(["x", "y", "z"])
+        assert missing == []
+        np.testing.assert_allclose(found[0], np.ones(4))
+        np.testing.assert_allclose(found[1], vectors[0])
+        np.testing.assert_allclose(found[2], vectors[1])
+
+    def test_keys_depend_on_model(self, tmp_path):
+        a = EmbeddingCache("model-a", cache_dir=str(tmp_path))
+        b = EmbeddingCache("model-b", cache_dir=str(tmp_path))
+        assert a.key("same text") != b.key("same text")
+
+
+class TestBuildFaiss:
+    """Test building a FAISS store from a precomputed matrix."""
+
+    def test_search_returns_matching_document(self):
+        embeddings = make_embeddings()
+        documents = [Document(page_content=text) for text in ["a", "bb", "ccc"]]
+        store = build_faiss(documents, embeddings.embed_array([d.page_content for d in documents]), embeddings)
+        assert store.index.ntotal == 3
+        assert store.similarity_search("xx", k=1)[0].page_content == "bb"
+
+    def test_batch_retrieval_matches_single_queries(self):
+        embeddings = make_embeddings()
+        documents = [Document(page_content=text) for text in ["a", "bb", "ccc", "dddd"]]
+        store = build_faiss(documents, embeddings.embed_array([d.page_content for d in documents]), embeddings)
+        service = VectorStoreService.__new__(VectorStoreService)
+        service.embedding_model = embeddings
+
+        queries = ["xx", "yyyy", "z"]
+        batched = service.retrieve_documents_batch(store, queries, k=2)
+        single = [service.retrieve_documents(store, q, k=2) for q in queries]
+        assert [[d.page_content for d in docs] for docs in batched] == \
+            [[d.page_content for d in docs] for docs in single]